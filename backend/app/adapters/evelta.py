@@ -3,6 +3,9 @@ evelta_adapter = {
     "base_url": "https://evelta.com",
     "search_path": "/search-results-page?q={query}",
     "wait_after_ms": 0,  # we will use explicit waits in service
+    "cache_ttl_hours": 168,
+    # The BigCommerce index also lists category, brand and page sitemaps
+    "crawl": {"type": "sitemap", "sitemap": "/xmlsitemap.php", "product_sitemaps": "type=products"},
     "selectors": {
         # Searchanise injected results - updated based on live DOM inspection
         "list_item": "li.snize-product",
@@ -3,6 +3,8 @@ robocraze_adapter = {
     "base_url": "https://robocraze.com",
     "search_path": "/search?q={query}&options%5Bprefix%5D=last&type=product",
     "wait_after_ms": 500,  # allow lazy bits to settle
+    "cache_ttl_hours": 96,
+    "crawl": {"type": "shopify"},
     "selectors": {
         # Product cards in search results
         "list_item": "li.product, div.product-item.enablecustomlayoutcard, div.product-grid-item",
@@ -10,6 +12,8 @@ robocraze_adapter = {
         "title": "a.card-title[data-product-title], a.card-title span.text, a.full-unstyled-link",
         # Prices appear as sale/regular blocks or numeric attrs
         "price": "span.price-item--sale, span.price-item--regular, div.price-item.price-item--sale, div.price-item.price-item--regular, span[data-last]",
+        # Compare-at (MRP) price is struck through when on sale
+        "mrp": "s.price-item--regular",
         # Availability inferred from add-to-cart button text/attribute
         "availability": "button[data-btn-addToCart]",
         # Link to product page
@@ -1,27 +1,20 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlmodel import Session, select
+from sqlmodel import Session
 
-from ..db.session import get_session
+from ..db.session import get_engine
 from ..models.user import User, UserRole
+from ..services.workloads import db_workload
 from .security import decode_token
+from .user_cache import auth_cache
 
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session),
-) -> User:
-    """Get the current authenticated user from JWT token."""
-    if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    token = credentials.credentials
+def _verified_user_id(token: str) -> int:
+    """Check the JWT and return its user id, caching the result."""
     payload = decode_token(token)
     
     if payload is None:
@@ -47,13 +40,46 @@ def get_current_user(
             detail="Invalid token payload",
         )
     
-    user = session.get(User, user_id)
-    if user is None:
+    auth_cache.put_token(token, user_id, payload.get("exp"))
+    return user_id
+
+
+def _load_user(user_id: int) -> Optional[User]:
+    with Session(get_engine()) as session:
+        return session.get(User, user_id)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> User:
+    """Get the current authenticated user from JWT token.
+
+    Repeat calls within ``AUTH_CACHE_TTL_SECONDS`` are served from
+    ``auth_cache`` without touching the database. A miss loads the user on
+    the db workload, never on AnyIO's shared threadpool.
+    """
+    if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token = credentials.credentials
+    user_id = auth_cache.user_id_for(token)
+    if user_id is None:
+        user_id = _verified_user_id(token)
+
+    user = auth_cache.user(user_id)
+    if user is None:
+        user = await db_workload.run(_load_user, user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        auth_cache.put_user(user)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -63,7 +89,7 @@ def get_current_user(
     return user
 
 
-def get_current_admin(user: User = Depends(get_current_user)) -> User:
+async def get_current_admin(user: User = Depends(get_current_user)) -> User:
     """Get the current user only if they are an admin."""
     if user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -0,0 +1,135 @@
+"""Password hashing off the request threads.
+
+bcrypt is deliberately slow, so hashes are computed on a small dedicated
+process pool: a burst of logins uses those cores and nothing else, instead
+of tying up the threadpool that serves every sync endpoint. The number of
+hashes waiting is bounded; past it callers get ``PasswordPoolBusy`` at once
+rather than queueing. ``LoginLimiter`` caps concurrent logins per account
+and per client address on top of that.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from ..services.workloads import WorkloadBusy
+from .security import hash_password, verify_password
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+LOGIN_MAX_PER_ACCOUNT = int(os.getenv("LOGIN_MAX_PER_ACCOUNT", "2"))
+LOGIN_MAX_PER_IP = int(os.getenv("LOGIN_MAX_PER_IP", "8"))
+
+
+class PasswordPoolBusy(WorkloadBusy):
+    """Too many hashes are already waiting for the pool."""
+
+    def __init__(self):
+        super().__init__("password")
+
+
+class PasswordHasher:
+    """Bounded front for a process pool running bcrypt."""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs Playwright and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.pending += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        with self._slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), verify_password, password, hashed)
+
+    async def hash(self, password: str) -> str:
+        with self._slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), hash_password, password)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Same shape as ``Workload.metrics``; the process pool hides which jobs started."""
+        with self._lock:
+            active = min(self.pending, self.workers)
+            return {
+                "name": "password",
+                "workers": self.workers,
+                "queued": self.pending - active,
+                "active": active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "max_queue": self.max_pending,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LoginLimiter:
+    """Concurrent login attempts per account and per client address."""
+
+    def __init__(self, per_account: int = LOGIN_MAX_PER_ACCOUNT, per_ip: int = LOGIN_MAX_PER_IP):
+        self.per_account = per_account
+        self.per_ip = per_ip
+        self._accounts: Counter = Counter()
+        self._ips: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def attempt(self, account: str, ip: str) -> Iterator[bool]:
+        """Yields False, without counting the attempt, when either limit is reached."""
+        account = account.strip().lower()
+        with self._lock:
+            allowed = self._accounts[account] < self.per_account and self._ips[ip] < self.per_ip
+            if allowed:
+                self._accounts[account] += 1
+                self._ips[ip] += 1
+        try:
+            yield allowed
+        finally:
+            if allowed:
+                with self._lock:
+                    self._accounts[account] -= 1
+                    self._ips[ip] -= 1
+                    if not self._accounts[account]:
+                        del self._accounts[account]
+                    if not self._ips[ip]:
+                        del self._ips[ip]
+
+
+password_hasher = PasswordHasher()
+login_limiter = LoginLimiter()
@@ -0,0 +1,165 @@
+"""Short-lived cache of verified tokens and the users they belong to.
+
+Lets ``get_current_user`` skip both the JWT check and the user lookup on
+repeat requests: hits are served from memory. Entries live
+``AUTH_CACHE_TTL_SECONDS`` at most. Admin changes evict the user at once in
+the process that made them and raise the minimum ``User.version`` that may
+be cached, so a request that read the row just before the change cannot
+put the stale copy back. Other worker processes pick the change up from
+``auth_cache_sync_loop``. Every ``AUTH_CACHE_SYNC_SECONDS`` it makes one
+query for the versions of the users they hold and drops any that moved.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from ..db.session import get_engine
+from ..models.user import User
+from ..services.workloads import db_workload
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "1024"))
+AUTH_CACHE_SYNC_SECONDS = float(os.getenv("AUTH_CACHE_SYNC_SECONDS", "5"))
+SYNC_CHUNK = 500  # user ids per version query
+
+
+def _copy(user: User) -> User:
+    return User(**user.model_dump())  # detached, and private to its holder
+
+
+class AuthCache:
+    """LRU of token -> user id and user id -> detached ``User`` copy."""
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL_SECONDS, max_entries: int = AUTH_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._claims: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._users: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        # user id -> (expires_at, version); a floor only has to outlive the
+        # requests that read the row before the change, so it expires with the TTL
+        self._min_version: "OrderedDict[int, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, entries: OrderedDict, key):
+        entry = entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del entries[key]
+            self.misses += 1
+            return None
+        entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def _put(self, entries: OrderedDict, key, expires_at: float, value) -> None:
+        entries[key] = (expires_at, value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def user_id_for(self, token: str) -> Optional[int]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            return self._get(self._claims, token)
+
+    def put_token(self, token: str, user_id: int, token_expires_at: Optional[float]) -> None:
+        """Remember a verified token, never past its own ``exp``."""
+        if self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._put(self._claims, token, expires_at, user_id)
+
+    def user(self, user_id: int) -> Optional[User]:
+        """A copy of the cached user, so no request can change another's."""
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            user = self._get(self._users, user_id)
+        return _copy(user) if user is not None else None
+
+    def _floor(self, user_id: int, now: float) -> int:
+        entry = self._min_version.get(user_id)
+        return entry[1] if entry is not None and entry[0] > now else 0
+
+    def put_user(self, user: User) -> None:
+        if self.ttl <= 0:
+            return
+        snapshot = _copy(user)  # not bound to the request's session
+        now = time.time()
+        with self._lock:
+            if user.version < self._floor(user.id, now):
+                return
+            self._put(self._users, user.id, now + self.ttl, snapshot)
+
+    def invalidate_user(self, user_id: int, min_version: int) -> None:
+        """Evict a user; copies older than ``min_version`` are not cached again within the TTL."""
+        now = time.time()
+        with self._lock:
+            self._users.pop(user_id, None)
+            floor = max(min_version, self._floor(user_id, now))
+            self._min_version[user_id] = (now + self.ttl, floor)
+            self._min_version.move_to_end(user_id)
+            # Same TTL for every floor, so the oldest ones are at the front
+            while self._min_version and (
+                next(iter(self._min_version.values()))[0] <= now or len(self._min_version) > self.max_entries
+            ):
+                self._min_version.popitem(last=False)
+
+    def cached_versions(self) -> Dict[int, int]:
+        with self._lock:
+            return {user_id: user.version for user_id, (_, user) in self._users.items()}
+
+    def sync(self, session: Session) -> int:
+        """Drop cached users whose row changed or is gone; returns how many."""
+        cached = self.cached_versions()
+        ids = list(cached)
+        current: Dict[int, int] = {}
+        for i in range(0, len(ids), SYNC_CHUNK):
+            stmt = select(User.id, User.version).where(User.id.in_(ids[i:i + SYNC_CHUNK]))
+            current.update(session.exec(stmt).all())
+        dropped = 0
+        for user_id, version in cached.items():
+            if current.get(user_id) != version:
+                self.invalidate_user(user_id, current.get(user_id, version + 1))
+                dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+            self._users.clear()
+            self._min_version.clear()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+auth_cache = AuthCache()
+
+
+def _sync_auth_cache() -> int:
+    with Session(get_engine()) as session:
+        return auth_cache.sync(session)
+
+
+async def auth_cache_sync_loop(interval: float = AUTH_CACHE_SYNC_SECONDS) -> None:
+    """Apply other workers' user changes to this process's cache."""
+    while True:
+        await asyncio.sleep(interval)
+        if not len(auth_cache):
+            continue
+        try:
+            await db_workload.run(_sync_auth_cache)
+        except Exception as exc:
+            print(f"Auth cache sync failed: {exc}")
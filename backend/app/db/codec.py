@@ -0,0 +1,63 @@
+"""Compact storage codec for item payload columns.
+
+Encoded blobs start with a format version byte, so the encoding can change
+later without a rewrite:
+
+- ``0x01``: zlib-compressed compact JSON
+
+On Postgres, ``ItemsPayload`` columns store the decoded list as JSONB
+instead, so payloads can be GIN-indexed and queried in SQL.
+"""
+import json
+import zlib
+from typing import Any, List, Optional, Union
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+FORMAT_JSON_ZLIB = 0x01
+COMPRESS_LEVEL = 6
+
+
+def encode_items(items: List[Any]) -> bytes:
+    """Encode a list of JSON-compatible items into a versioned blob."""
+    raw = json.dumps(items, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return bytes([FORMAT_JSON_ZLIB]) + zlib.compress(raw, COMPRESS_LEVEL)
+
+
+def decode_items(blob: bytes) -> List[Any]:
+    """Decode a blob written by ``encode_items``."""
+    version, payload = blob[0], zlib.decompress(blob[1:])
+    if version == FORMAT_JSON_ZLIB:
+        return json.loads(payload)
+    raise ValueError(f"Unknown item payload format: {version}")
+
+
+class ItemsPayload(TypeDecorator):
+    """Item payload column: an ``encode_items`` blob, or JSONB on Postgres.
+
+    Writes always take ``encode_items`` bytes. Postgres reads return the
+    list itself, which ``load_items`` passes through.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == "postgresql" and isinstance(value, (bytes, bytearray, memoryview)):
+            return decode_items(bytes(value))
+        return value
+
+
+def load_items(items_blob: Union[bytes, List[Any], None], items_json: Optional[str]) -> List[Any]:
+    """Read items from a row, preferring the blob over the legacy JSON text."""
+    if isinstance(items_blob, list):
+        return items_blob
+    if items_blob:
+        return decode_items(items_blob)
+    return json.loads(items_json) if items_json else []
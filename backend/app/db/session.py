@@ -1,13 +1,29 @@
 import os
 from functools import lru_cache
-from typing import Iterator
+from typing import AsyncIterator
 
 from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..services.workloads import WorkloadBusy, db_workload
 
 
 load_dotenv()
 
+# Postgres connection pool (per engine; the sync and async engines each get one)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite pragmas applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
 
 @lru_cache
 def get_database_url() -> str:
@@ -17,9 +33,55 @@ def get_database_url() -> str:
     return db_url
 
 
+# Async drivers for the synchronous URLs DATABASE_URL normally holds
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+@lru_cache
+def get_async_database_url() -> str:
+    url = get_database_url()
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings for ``url``'s backend; SQLite keeps SQLAlchemy's defaults."""
+    options = {"echo": False, "pool_pre_ping": True}
+    if url.startswith("postgresql"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """WAL lets readers run alongside the single writer; busy_timeout waits out
+    the writer lock instead of failing with "database is locked"."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, fsyncs only at checkpoints
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def configure_engine(engine: Engine) -> Engine:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
 @lru_cache
 def get_engine():
-    return create_engine(get_database_url(), echo=False, pool_pre_ping=True)
+    url = get_database_url()
+    return configure_engine(create_engine(url, **engine_options(url)))
 
 
 def init_db() -> None:
@@ -27,8 +89,36 @@ def init_db() -> None:
     SQLModel.metadata.create_all(engine)
 
 
-def get_session() -> Iterator[Session]:
-    engine = get_engine()
-    with Session(engine) as session:
+async def get_session() -> AsyncIterator[Session]:
+    """Sync session for ``@runs_on(db_workload)`` endpoints.
+
+    An async dependency, so FastAPI does not run it on AnyIO's shared
+    threadpool. Creating the session does no I/O, and closing it (a
+    rollback and returning the connection) runs on the db workload too.
+    """
+    session = Session(get_engine())
+    try:
         yield session
+    finally:
+        try:
+            await db_workload.run(session.close)
+        except WorkloadBusy:
+            session.close()  # never leak the connection
+
 
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    url = get_async_database_url()
+    engine = create_async_engine(url, **engine_options(url))
+    configure_engine(engine.sync_engine)
+    return engine
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """Session for ``async def`` handlers; queries run without blocking the event loop.
+
+    Reuse synchronous helpers with ``await session.run_sync(fn, *args)``,
+    which calls ``fn(sync_session, *args)`` on the same connection.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -1,14 +1,30 @@
+import asyncio
 import os
-from fastapi import FastAPI
+from typing import List
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlmodel import Session
 
-from .db.session import init_db, get_engine
+from .auth.password_pool import password_hasher
+from .auth.user_cache import auth_cache_sync_loop
+from .db.session import init_db, get_async_engine, get_engine
 from .db.seed_users import seed_initial_users
-from .routers import marketplaces, auth, users, history, recommendations, refresh, po
+from .routers import marketplaces, auth, users, history, recommendations, refresh, po, cache, catalog, runtime
+from .services.cache_maintenance import cache_maintenance_loop
+from .services.catalog import load_token_stats
+from .services.catalog_crawler import CRAWL_ENABLED, catalog_crawl_loop
+from .services.loop_monitor import LOOP_MONITOR_ENABLED, LoopMonitorMiddleware, loop_monitor
+from .services.product_index import ensure_product_index
+from .services.search_log import search_log
+from .services.suggestions import build_suggestion_index
+from .services.workloads import WORKLOADS, WorkloadBusy
 
 app = FastAPI(title="Estim API", version="0.2.0")
 
+_background_tasks: List[asyncio.Task] = []
+
 allowed_origins_env = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173,http://localhost:5174,http://127.0.0.1:5174")
 allowed_origins = [o.strip() for o in allowed_origins_env.split(",") if o.strip()]
 
@@ -19,6 +35,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopMonitorMiddleware)
+
+
+@app.exception_handler(WorkloadBusy)
+async def workload_busy(request: Request, exc: WorkloadBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server is busy ({exc.workload}), please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.on_event("startup")
@@ -26,8 +53,42 @@ def on_startup() -> None:
     init_db()
     # Seed initial users
     engine = get_engine()
+    ensure_product_index(engine)
     with Session(engine) as session:
         seed_initial_users(session)
+        # Pre-warm the in-memory search cache with popular queries
+        warmed = marketplaces.warm_search_cache(session)
+        print(f"Warmed search cache with {warmed} queries")
+        indexed = marketplaces.build_query_index(session)
+        print(f"Indexed {indexed} cached queries for near-match lookup")
+        titles = load_token_stats(session)
+        print(f"Loaded ranking statistics for {titles} catalog titles")
+        suggestions = build_suggestion_index(session)
+        print(f"Indexed {suggestions} logged queries for suggestions")
+
+
+@app.on_event("startup")
+async def start_background_jobs() -> None:
+    _background_tasks.append(asyncio.create_task(cache_maintenance_loop()))
+    _background_tasks.append(asyncio.create_task(search_log.run()))
+    _background_tasks.append(asyncio.create_task(auth_cache_sync_loop()))
+    if CRAWL_ENABLED:
+        _background_tasks.append(asyncio.create_task(catalog_crawl_loop()))
+    if LOOP_MONITOR_ENABLED:
+        _background_tasks.append(asyncio.create_task(loop_monitor.run()))
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs() -> None:
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    await search_log.drain()
+    await get_async_engine().dispose()
+    password_hasher.shutdown()
+    for workload in WORKLOADS:
+        workload.shutdown()
 
 
 @app.get("/health")
@@ -43,3 +104,6 @@ app.include_router(history.router)
 app.include_router(recommendations.router)
 app.include_router(refresh.router)
 app.include_router(po.router)
+app.include_router(cache.router)
+app.include_router(catalog.router)
+app.include_router(runtime.router)
@@ -1,6 +1,7 @@
 from .user import User, UserRole
-from .search import SearchResult, UserSearchHistory, SearchQueryLog
+from .search import SearchResult, UserSearchHistory, SearchQueryLog, QueryStats, QueryStatsUser
 from .purchase_order import PurchaseOrder
+from .catalog import Product, PriceObservation, PriceDaily, CrawlState
 
 __all__ = [
     "User", 
@@ -8,5 +9,11 @@ __all__ = [
     "SearchResult", 
     "UserSearchHistory", 
     "SearchQueryLog",
+    "QueryStats",
+    "QueryStatsUser",
     "PurchaseOrder",
+    "Product",
+    "PriceObservation",
+    "PriceDaily",
+    "CrawlState",
 ]
@@ -0,0 +1,76 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class Product(SQLModel, table=True):
+    """One vendor listing, keyed by its canonical product URL."""
+    __table_args__ = (Index("ix_product_sku_latest_price", "sku", "latest_price"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    canonical_url: str = Field(index=True, unique=True, nullable=False)
+    source: str = Field(index=True)
+    title: str
+    sku: str = Field(default="", index=True)
+    image_url: str = ""
+    availability: str = ""
+    latest_price_text: str = ""
+    latest_price: Optional[float] = Field(default=None, index=True)
+    currency: str = "INR"
+    mrp: Optional[float] = None
+    tax_inclusive: Optional[bool] = None
+    first_seen_at: datetime = Field(default_factory=datetime.utcnow)
+    last_seen_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class PriceObservation(SQLModel, table=True):
+    """A price change seen for a product during a scrape or item refresh.
+
+    Only changes are stored: a product's price holds from one observation
+    until the next.
+    """
+    __table_args__ = (Index("ix_priceobservation_product_observed", "product_id", "observed_at"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    product_id: int = Field(foreign_key="product.id")
+    price: Optional[float] = None
+    price_text: str = ""
+    availability: str = ""
+    observed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PriceDaily(SQLModel, table=True):
+    """Daily rollup of a product's price once raw observations age out."""
+    product_id: int = Field(foreign_key="product.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    last_price: Optional[float] = None
+    last_availability: str = ""
+    changes: int = 0
+
+
+class CrawlState(SQLModel, table=True):
+    """Progress of the offline catalog crawl for one vendor.
+
+    ``cursor`` is the checkpoint inside the current run (a Shopify page number
+    or the last sitemap URL done); it is cleared when a run completes.
+    ``high_water`` is the newest ``updated_at``/``lastmod`` covered by the last
+    completed run, so the next run only fetches products changed after it.
+    Pages that failed to fetch are kept in ``failed_urls`` and retried
+    whatever their ``lastmod``.
+    """
+    source: str = Field(primary_key=True)
+    cursor: str = ""
+    high_water: Optional[datetime] = None
+    run_high_water: Optional[datetime] = None
+    run_started_at: Optional[datetime] = None
+    last_completed_at: Optional[datetime] = None
+    products_recorded: int = 0
+    failed_urls: str = ""  # sitemap pages whose fetch failed, one per line; retried next run
+    last_error: str = ""
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -1,11 +1,20 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
+from ..db.codec import ItemsPayload
+
 
 class PurchaseOrder(SQLModel, table=True):
     """Purchase Order model for storing PO history and drafts."""
     __tablename__ = "purchase_orders"
+    __table_args__ = (
+        Index(
+            "ix_purchase_orders_items_blob", "items_blob",
+            postgresql_using="gin", postgresql_ops={"items_blob": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
@@ -26,8 +35,9 @@ class PurchaseOrder(SQLModel, table=True):
     # Shipping address
     shipping_address: str = ""
     
-    # Items (stored as JSON string)
+    # Items (legacy JSON string; new rows use items_blob, see db.codec)
     items_json: str = "[]"
+    items_blob: Optional[bytes] = Field(default=None, sa_type=ItemsPayload)
     
     # Financial
     gst_rate: float = 18.0
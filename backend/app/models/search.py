@@ -1,26 +1,48 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
+from ..db.codec import ItemsPayload
+
 
 class SearchResult(SQLModel, table=True):
-    """Cached search results with 7-day expiration."""
+    """Cached search results; expiry is set by ``services.cache_policy``."""
+    __table_args__ = (
+        # Postgres only: JSONB containment lookups such as items from one vendor
+        Index(
+            "ix_searchresult_items_blob", "items_blob",
+            postgresql_using="gin", postgresql_ops={"items_blob": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     query_normalized: str = Field(index=True)  # lowercase, trimmed
-    items_json: str  # JSON serialized list of items
+    items_json: str = ""  # legacy JSON text, rows written before items_blob
+    items_blob: Optional[bytes] = Field(default=None, sa_type=ItemsPayload)  # see db.codec
     fetched_at: datetime = Field(default_factory=datetime.utcnow)
-    expires_at: datetime  # created_at + 7 days
+    expires_at: datetime  # see services.cache_policy.compute_expiry
     note: Optional[str] = None
+    items_count: int = 0  # len(items), so listings never decode the payload
+    missing_sources: Optional[str] = None  # comma-separated vendors to top up on next hit
+    # Pre-serialized cache-hit response (see services.result_cache.render_cached_response)
+    response_body: Optional[bytes] = None
+    response_encoding: Optional[str] = None  # "gzip" or None
+    response_etag: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
 class UserSearchHistory(SQLModel, table=True):
     """Links users to their search history."""
+    # Serves the per-user newest-first listing; also covers lookups by user_id alone
+    __table_args__ = (Index("ix_usersearchhistory_user_searched_at", "user_id", "searched_at"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
     search_result_id: int = Field(foreign_key="searchresult.id", index=True)
+    query_text: Optional[str] = None  # as typed; the result row only has the canonical key
     searched_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -31,3 +53,32 @@ class SearchQueryLog(SQLModel, table=True):
     query_text: str = Field(index=True)  # Original query text
     search_result_id: Optional[int] = Field(foreign_key="searchresult.id")
     searched_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class QueryStats(SQLModel, table=True):
+    """Per canonical query popularity, upserted on every logged search.
+
+    ``hotness`` is a forward-decayed count (log2 of the sum of
+    2^(t/half-life) over searches, see ``services.query_stats``); ordering by
+    it ranks by time-decayed popularity at any moment, so it can be indexed.
+    """
+    __table_args__ = (
+        Index("ix_querystats_hotness", "hotness"),
+        Index("ix_querystats_total_count", "total_count"),
+    )
+
+    query_normalized: str = Field(primary_key=True)  # ordered by key, so prefix LIKE uses the pk index
+    display_text: str  # most recent spelling a user typed
+    total_count: int = 0
+    distinct_users: int = 0
+    hotness: float = 0.0
+    last_searched_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    latest_result_id: Optional[int] = Field(default=None, foreign_key="searchresult.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class QueryStatsUser(SQLModel, table=True):
+    """Users who searched a canonical query, for ``QueryStats.distinct_users``."""
+    query_normalized: str = Field(primary_key=True)
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
@@ -17,5 +17,6 @@ class User(SQLModel, table=True):
     hashed_password: str = Field(nullable=False)
     is_active: bool = Field(default=True, nullable=False)
     role: UserRole = Field(default=UserRole.NORMAL, nullable=False)
+    version: int = Field(default=0, nullable=False)  # bumped on every admin change, see auth.user_cache
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
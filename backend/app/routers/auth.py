@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, or_
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlmodel import select, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..auth.dependencies import get_current_user
-from ..auth.security import create_access_token, verify_password
-from ..db.session import get_session
+from ..auth.password_pool import login_limiter, password_hasher
+from ..auth.security import create_access_token, needs_rehash
+from ..db.session import get_async_session
 from ..models.user import User
 from ..schemas.auth import LoginRequest, TokenResponse, UserResponse
 
@@ -11,28 +13,49 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, session: Session = Depends(get_session)) -> TokenResponse:
+async def login(
+    payload: LoginRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+) -> TokenResponse:
     """Authenticate user with username or email and password."""
-    # Find user by username or email
-    stmt = select(User).where(
-        or_(
-            User.username == payload.username_or_email,
-            User.email == payload.username_or_email,
-        )
-    )
-    user = session.exec(stmt).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-        )
-    
-    if not verify_password(payload.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
+    client_ip = request.client.host if request.client else ""
+    with login_limiter.attempt(payload.username_or_email, client_ip) as allowed:
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts in progress",
+                headers={"Retry-After": "1"},
+            )
+
+        # Find user by username or email
+        stmt = select(User).where(
+            or_(
+                User.username == payload.username_or_email,
+                User.email == payload.username_or_email,
+            )
         )
+        user = (await session.exec(stmt)).first()
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials",
+            )
+        
+        # A full hashing queue raises PasswordPoolBusy, answered with 503 (see main)
+        valid = await password_hasher.verify(payload.password, user.hashed_password)
+        if valid and needs_rehash(user.hashed_password):
+            # Cost factor changed since this hash was made: upgrade it now
+            user.hashed_password = await password_hasher.hash(payload.password)
+            session.add(user)
+            await session.commit()
+
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials",
+            )
     
     if not user.is_active:
         raise HTTPException(
@@ -46,7 +69,7 @@ def login(payload: LoginRequest, session: Session = Depends(get_session)) -> Tok
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(user: User = Depends(get_current_user)) -> UserResponse:
+async def get_me(user: User = Depends(get_current_user)) -> UserResponse:
     """Get current authenticated user info."""
     return UserResponse(
         id=user.id,
@@ -0,0 +1,122 @@
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from ..adapters import ALL_ADAPTERS
+from ..auth.dependencies import get_current_admin
+from ..db.session import get_session
+from ..models.user import User
+from ..services.cache_maintenance import cache_stats, invalidate_results, run_cache_maintenance
+from ..services.query_stats import backfill_query_stats, decayed_count, popular_queries
+from ..services.workloads import db_workload, runs_on
+
+router = APIRouter(prefix="/api/admin/cache", tags=["cache"])
+
+
+class CacheStatsResponse(BaseModel):
+    rows: int
+    expired_rows: int
+    distinct_queries: int
+    memory_entries: int
+    memory_hits: int
+    memory_misses: int
+    refresh_failures: int  # background re-scrapes of stale hits that raised, this worker only
+
+
+class InvalidateRequest(BaseModel):
+    pattern: Optional[str] = None  # words or globs like "esp32*", each matched against a key token
+    vendor: Optional[str] = None
+
+
+class InvalidateResponse(BaseModel):
+    invalidated: int
+
+
+class QueryStatsResponse(BaseModel):
+    query: str
+    display_text: str
+    total_count: int
+    distinct_users: int
+    recent_score: float  # searches weighted by half-lives since, see services.query_stats
+    last_searched_at: str
+    latest_result_id: Optional[int] = None
+
+
+@router.get("/stats", response_model=CacheStatsResponse)
+@runs_on(db_workload)
+def get_cache_stats(
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> CacheStatsResponse:
+    """Search cache row counts, in-memory hit rates and refresh failures. Admin only."""
+    return CacheStatsResponse(**cache_stats(session))
+
+
+@router.post("/invalidate", response_model=InvalidateResponse)
+@runs_on(db_workload)
+def invalidate_cache(
+    payload: InvalidateRequest,
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> InvalidateResponse:
+    """Invalidate cached searches by query pattern and/or vendor. Admin only."""
+    if not payload.pattern and not payload.vendor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide a pattern, a vendor, or both",
+        )
+    if payload.vendor and payload.vendor not in ALL_ADAPTERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported marketplace",
+        )
+    count = invalidate_results(session, pattern=payload.pattern, vendor=payload.vendor)
+    return InvalidateResponse(invalidated=count)
+
+
+@router.post("/maintenance")
+@runs_on(db_workload)
+def run_maintenance(
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> Dict[str, int]:
+    """Dedupe, purge and compact the search cache now. Admin only."""
+    return run_cache_maintenance(session)
+
+
+@router.get("/queries", response_model=List[QueryStatsResponse])
+@runs_on(db_workload)
+def get_query_stats(
+    order: Literal["hot", "count", "recent"] = "hot",
+    prefix: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> List[QueryStatsResponse]:
+    """Most popular searched queries. Admin only."""
+    now = datetime.utcnow()
+    return [
+        QueryStatsResponse(
+            query=stats.query_normalized,
+            display_text=stats.display_text,
+            total_count=stats.total_count,
+            distinct_users=stats.distinct_users,
+            recent_score=round(decayed_count(stats, now), 3),
+            last_searched_at=stats.last_searched_at.isoformat(),
+            latest_result_id=stats.latest_result_id,
+        )
+        for stats in popular_queries(session, limit=limit, prefix=prefix, order=order)
+    ]
+
+
+@router.post("/queries/backfill")
+@runs_on(db_workload)
+def rebuild_query_stats(
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> Dict[str, int]:
+    """Rebuild query popularity from the full search log. Admin only."""
+    return {"queries": backfill_query_stats(session)}
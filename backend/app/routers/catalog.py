@@ -0,0 +1,204 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from ..adapters import ALL_ADAPTERS
+from ..auth.dependencies import get_current_admin, get_current_user
+from ..db.session import get_session
+from ..models.catalog import Product
+from ..models.user import User
+from ..services.catalog import cheapest_offers, lowest_observed_price
+from ..services.catalog_crawler import crawl_task, is_crawling, load_state
+from ..services.price_history import price_history
+from ..services.workloads import db_workload, runs_on
+
+router = APIRouter(prefix="/api/catalog", tags=["catalog"])
+
+
+class ProductResponse(BaseModel):
+    id: int
+    title: str
+    url: str
+    source: str
+    sku: str
+    image_url: str
+    availability: str
+    price_text: str
+    price: Optional[float] = None
+    last_seen_at: str
+    lowest_price: Optional[float] = None
+
+
+class PricePoint(BaseModel):
+    at: str
+    price: Optional[float] = None
+    price_text: str
+    availability: str
+
+
+class PriceDay(BaseModel):
+    day: str
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    last_price: Optional[float] = None
+    changes: int
+
+
+class PriceHistoryResponse(BaseModel):
+    product_id: int
+    start: str
+    end: str
+    opening_price: Optional[float] = None
+    daily: List[PriceDay]  # rolled-up days, older than the raw retention window
+    points: List[PricePoint]  # individual price changes
+
+
+class CrawlStatusResponse(BaseModel):
+    source: str
+    running: bool
+    cursor: str
+    high_water: Optional[str] = None
+    last_completed_at: Optional[str] = None
+    products_recorded: int
+    last_error: str
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _product_response(product: Product, lowest_price: Optional[float] = None) -> ProductResponse:
+    return ProductResponse(
+        id=product.id,
+        title=product.title,
+        url=product.canonical_url,
+        source=product.source,
+        sku=product.sku,
+        image_url=product.image_url,
+        availability=product.availability,
+        price_text=product.latest_price_text,
+        price=product.latest_price,
+        last_seen_at=product.last_seen_at.isoformat(),
+        lowest_price=lowest_price,
+    )
+
+
+@router.get("/offers", response_model=List[ProductResponse])
+@runs_on(db_workload)
+def get_offers(
+    sku: str = Query(..., min_length=1, description="SKU to compare across vendors"),
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> List[ProductResponse]:
+    """Current offers for a SKU, cheapest vendor first."""
+    return [_product_response(p) for p in cheapest_offers(session, sku.strip())]
+
+
+@router.get("/products/{product_id}", response_model=ProductResponse)
+@runs_on(db_workload)
+def get_product(
+    product_id: int,
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> ProductResponse:
+    """A catalog product with its lowest recorded price."""
+    product = session.get(Product, product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found",
+        )
+    return _product_response(product, lowest_observed_price(session, product_id))
+
+
+@router.get("/products/{product_id}/history", response_model=PriceHistoryResponse)
+@runs_on(db_workload)
+def get_price_history(
+    product_id: int,
+    start: Optional[datetime] = Query(None, description="Defaults to 90 days before end"),
+    end: Optional[datetime] = Query(None, description="Defaults to now"),
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> PriceHistoryResponse:
+    """Price changes for a product over a time range."""
+    if not session.get(Product, product_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found",
+        )
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=90)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end",
+        )
+    history = price_history(session, product_id, start, end)
+    return PriceHistoryResponse(
+        product_id=product_id,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        opening_price=history.opening_price,
+        daily=[
+            PriceDay(
+                day=d.day.isoformat(),
+                min_price=d.min_price,
+                max_price=d.max_price,
+                last_price=d.last_price,
+                changes=d.changes,
+            )
+            for d in history.daily
+        ],
+        points=[
+            PricePoint(
+                at=p.observed_at.isoformat(),
+                price=p.price,
+                price_text=p.price_text,
+                availability=p.availability,
+            )
+            for p in history.points
+        ],
+    )
+
+
+@router.get("/crawl", response_model=List[CrawlStatusResponse])
+@runs_on(db_workload)
+def get_crawl_status(
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> List[CrawlStatusResponse]:
+    """Offline catalog crawl progress per vendor. Admin only."""
+    statuses = []
+    for source, adapter in ALL_ADAPTERS.items():
+        if "crawl" not in adapter:
+            continue
+        state = load_state(session, source)
+        statuses.append(CrawlStatusResponse(
+            source=source,
+            running=is_crawling(source),
+            cursor=state.cursor,
+            high_water=_iso(state.high_water),
+            last_completed_at=_iso(state.last_completed_at),
+            products_recorded=state.products_recorded,
+            last_error=state.last_error,
+        ))
+    return statuses
+
+
+@router.post("/crawl/{source}", status_code=status.HTTP_202_ACCEPTED)
+async def start_crawl(
+    source: str,
+    admin: User = Depends(get_current_admin),
+) -> dict:
+    """Start (or resume) a catalog crawl for one vendor in the background. Admin only."""
+    if "crawl" not in ALL_ADAPTERS.get(source, {}):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Marketplace has no catalog crawl configured",
+        )
+    already_running = is_crawling(source)
+    crawl_task(source)
+    return {"source": source, "started": not already_running}
@@ -1,14 +1,18 @@
-import json
-from typing import List
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import Session, and_, func, or_, select
 
 from ..auth.dependencies import get_current_user
+from ..db.codec import load_items
 from ..db.session import get_session
-from ..models.search import SearchResult, UserSearchHistory
+from ..models.search import QueryStats, SearchResult, UserSearchHistory
 from ..models.user import User
+from ..services.search_log import search_log
+from ..services.workloads import db_workload, runs_on
 
 router = APIRouter(prefix="/api/history", tags=["history"])
 
@@ -21,6 +25,11 @@ class HistoryItemResponse(BaseModel):
     note: str | None = None
 
 
+class HistoryPageResponse(BaseModel):
+    items: List[HistoryItemResponse]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
+
 class HistoryDetailResponse(BaseModel):
     id: int
     query: str
@@ -29,36 +38,89 @@ class HistoryDetailResponse(BaseModel):
     note: str | None = None
 
 
-@router.get("", response_model=List[HistoryItemResponse])
+def encode_cursor(searched_at: datetime, history_id: int) -> str:
+    raw = f"{searched_at.isoformat()}|{history_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        searched_at, history_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(searched_at), int(history_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _typed_query():
+    """What the user typed, for display and to re-run the search.
+
+    Rows logged before ``query_text`` existed fall back to the latest
+    spelling of the same canonical query, then to the key itself.
+    """
+    return func.coalesce(
+        UserSearchHistory.query_text, QueryStats.display_text, SearchResult.query_normalized
+    )
+
+
+@router.get("", response_model=HistoryPageResponse)
+@runs_on(db_workload)
 def get_history(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
     user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
-) -> List[HistoryItemResponse]:
-    """Get current user's search history."""
+) -> HistoryPageResponse:
+    """Get current user's search history, newest first, one page at a time."""
+    # This user's latest searches may still be queued; write them so they show up.
+    # If that fails they stay queued, and the page shows what is committed.
+    try:
+        search_log.flush_user(user.id)
+    except Exception as exc:
+        print(f"Search log flush for history failed: {exc}")
+    # Only the listing columns: the item payloads are never loaded here
     stmt = (
-        select(UserSearchHistory, SearchResult)
+        select(
+            UserSearchHistory.id,
+            UserSearchHistory.searched_at,
+            _typed_query(),
+            SearchResult.items_count,
+            SearchResult.note,
+        )
         .join(SearchResult, UserSearchHistory.search_result_id == SearchResult.id)
+        .outerjoin(QueryStats, QueryStats.query_normalized == SearchResult.query_normalized)
         .where(UserSearchHistory.user_id == user.id)
-        .order_by(UserSearchHistory.searched_at.desc())
-        .limit(50)
     )
-    results = session.exec(stmt).all()
-    
-    history = []
-    for ush, sr in results:
-        items = json.loads(sr.items_json) if sr.items_json else []
-        history.append(HistoryItemResponse(
-            id=ush.id,
-            query=sr.query_normalized,
-            items_count=len(items),
-            searched_at=ush.searched_at.isoformat(),
-            note=sr.note,
+    if cursor:
+        # Keyset: continue strictly after the last row of the previous page
+        searched_at, history_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            UserSearchHistory.searched_at < searched_at,
+            and_(UserSearchHistory.searched_at == searched_at, UserSearchHistory.id < history_id),
         ))
-    
-    return history
+    stmt = stmt.order_by(UserSearchHistory.searched_at.desc(), UserSearchHistory.id.desc()).limit(limit + 1)
+    rows = session.exec(stmt).all()
+
+    page = rows[:limit]
+    history = [
+        HistoryItemResponse(
+            id=history_id,
+            query=query,
+            items_count=items_count,
+            searched_at=searched_at.isoformat(),
+            note=note,
+        )
+        for history_id, searched_at, query, items_count, note in page
+    ]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(rows) > limit else None
+    return HistoryPageResponse(items=history, next_cursor=next_cursor)
 
 
 @router.get("/{history_id}", response_model=HistoryDetailResponse)
+@runs_on(db_workload)
 def get_history_detail(
     history_id: int,
     user: User = Depends(get_current_user),
@@ -66,8 +128,9 @@ def get_history_detail(
 ) -> HistoryDetailResponse:
     """Get a specific history item with full results."""
     stmt = (
-        select(UserSearchHistory, SearchResult)
+        select(UserSearchHistory, SearchResult, _typed_query())
         .join(SearchResult, UserSearchHistory.search_result_id == SearchResult.id)
+        .outerjoin(QueryStats, QueryStats.query_normalized == SearchResult.query_normalized)
         .where(UserSearchHistory.id == history_id, UserSearchHistory.user_id == user.id)
     )
     result = session.exec(stmt).first()
@@ -78,12 +141,12 @@ def get_history_detail(
             detail="History item not found",
         )
     
-    ush, sr = result
-    items = json.loads(sr.items_json) if sr.items_json else []
+    ush, sr, query = result
+    items = load_items(sr.items_blob, sr.items_json)
     
     return HistoryDetailResponse(
         id=ush.id,
-        query=sr.query_normalized,
+        query=query,
         items=items,
         searched_at=ush.searched_at.isoformat(),
         note=sr.note,
@@ -91,6 +154,7 @@ def get_history_detail(
 
 
 @router.delete("/{history_id}", status_code=status.HTTP_204_NO_CONTENT)
+@runs_on(db_workload)
 def delete_history_item(
     history_id: int,
     user: User = Depends(get_current_user),
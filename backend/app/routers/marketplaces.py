@@ -1,16 +1,17 @@
 import asyncio
-import json
-import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..adapters import ALL_ADAPTERS
 from ..auth.dependencies import get_current_user
-from ..db.session import get_session
-from ..models.search import SearchResult, UserSearchHistory, SearchQueryLog
+from ..db.codec import encode_items
+from ..db.session import get_async_engine, get_async_session, get_session
+from ..models.search import SearchResult
 from ..models.user import User
 from ..schemas.marketplace import (
     MarketplaceName,
@@ -18,12 +19,40 @@ from ..schemas.marketplace import (
     MarketplaceSearchResponse,
     MultiMarketplaceQuery,
 )
+from ..services.cache_policy import (
+    compute_expiry,
+    format_sources,
+    is_stale,
+    is_vendor_failure,
+    parse_sources,
+    stale_cutoff,
+)
+from ..services.catalog import product_item, record_items
+from ..services.fuzzy_index import FUZZY_MATCH_ENABLED, FUZZY_THRESHOLD, query_index
+from ..services.matching import group_items
 from ..services.playwright import PlaywrightService
+from ..services.product_index import search_local
+from ..services.query_canon import canonicalize_query
+from ..services.query_stats import popular_queries
+from ..services.ranking import token_stats, top_k
+from ..services.search_log import LoggedSearch, search_log
+from ..services.suggestions import suggestion_index
+from ..services.result_cache import (
+    CachedSearch,
+    accepts_encoding,
+    decoded_body,
+    encoding_etag,
+    etag_matches,
+    render_cached_response,
+    result_cache,
+)
+from ..services.workloads import cpu_workload, db_workload, runs_on
 
 router = APIRouter(prefix="/api/marketplaces", tags=["marketplaces"])
 
 _service: Optional[PlaywrightService] = None
-CACHE_DAYS = 7
+# Background refreshes in flight, keyed by normalized query (one per key)
+_refreshing: Dict[str, asyncio.Task] = {}
 
 
 def get_playwright_service() -> PlaywrightService:
@@ -34,8 +63,8 @@ def get_playwright_service() -> PlaywrightService:
 
 
 def normalize_query(query: str) -> str:
-    """Normalize query for cache lookup."""
-    return query.lower().strip()
+    """Normalize query for cache lookup (see services.query_canon)."""
+    return canonicalize_query(query)
 
 
 def filter_blog_urls(items: List[Dict]) -> List[Dict]:
@@ -50,63 +79,266 @@ def filter_blog_urls(items: List[Dict]) -> List[Dict]:
     return filtered
 
 
-def get_cached_result(session: Session, query: str) -> Optional[SearchResult]:
-    """Get cached result if not expired."""
+def get_cached_result(session: Session, query: str, allow_stale: bool = False) -> Optional[SearchResult]:
+    """Get cached result if not expired.
+
+    With ``allow_stale`` an entry that expired within the grace window is
+    returned too; check ``is_stale(sr.expires_at)`` to tell them apart.
+    """
     normalized = normalize_query(query)
-    stmt = select(SearchResult).where(
-        SearchResult.query_normalized == normalized,
-        SearchResult.expires_at > datetime.utcnow(),
+    cutoff = stale_cutoff() if allow_stale else datetime.utcnow()
+    stmt = (
+        select(SearchResult)
+        .where(
+            SearchResult.query_normalized == normalized,
+            SearchResult.expires_at > cutoff,
+        )
+        .order_by(SearchResult.expires_at.desc())
     )
     return session.exec(stmt).first()
 
 
+def load_cached_search(session: Session, query: str) -> Optional[CachedSearch]:
+    """Look up a cached search, in memory first and then in the database.
+
+    Stale entries within the grace window are returned too.
+    """
+    key = normalize_query(query)
+    entry = result_cache.get(key)
+    if entry is not None and entry.expires_at > stale_cutoff():
+        return entry
+    sr = get_cached_result(session, query, allow_stale=True)
+    if sr is None:
+        result_cache.invalidate(key)
+        return None
+    entry = CachedSearch.from_row(sr)
+    result_cache.put(key, entry)
+    return entry
+
+
+def warm_search_cache(session: Session, limit: int = 50) -> int:
+    """Load the currently most popular queries into the in-memory cache."""
+    warmed = 0
+    for stats in popular_queries(session, limit=limit, order="hot"):
+        if load_cached_search(session, stats.query_normalized) is not None:
+            warmed += 1
+    return warmed
+
+
+def build_query_index(session: Session) -> int:
+    """Index every servable cache key for near-match lookup."""
+    stmt = select(SearchResult.query_normalized).where(SearchResult.expires_at > stale_cutoff()).distinct()
+    for key in session.exec(stmt).all():
+        query_index.add(key)
+    return len(query_index)
+
+
+def find_near_match(session: Session, query: str) -> Optional[Tuple[str, CachedSearch]]:
+    """(key, entry) of a fresh, complete cache entry for a near-identical query."""
+    match = query_index.best_match(normalize_query(query), FUZZY_THRESHOLD)
+    if match is None:
+        return None
+    key, _score = match
+    entry = load_cached_search(session, key)
+    if entry is None:
+        query_index.discard(key)
+        return None
+    if is_stale(entry.expires_at) or entry.missing_sources:
+        return None
+    return key, entry
+
+
 def save_search_result(
     session: Session,
     query: str,
     items: List[Dict],
     note: Optional[str],
+    missing_sources: Optional[List[str]] = None,
 ) -> SearchResult:
     """Save search result to cache."""
     normalized = normalize_query(query)
     now = datetime.utcnow()
+    missing_sources = missing_sources or []
+    body, encoding, etag = render_cached_response(items, now, note)
     
     sr = SearchResult(
         query_normalized=normalized,
-        items_json=json.dumps(items),
+        items_blob=encode_items(items),
         fetched_at=now,
-        expires_at=now + timedelta(days=CACHE_DAYS),
+        expires_at=compute_expiry(now, items, missing_sources, now=now),
         note=note,
+        items_count=len(items),
+        missing_sources=format_sources(missing_sources),
+        response_body=body,
+        response_encoding=encoding,
+        response_etag=etag,
     )
     session.add(sr)
     session.commit()
     session.refresh(sr)
+    result_cache.invalidate(normalized)
+    query_index.add(normalized)
+    suggestion_index.set_expiry(normalized, sr.expires_at)
     return sr
 
 
-def log_user_search(
+def update_search_result(
     session: Session,
-    user: User,
+    sr: SearchResult,
+    items: List[Dict],
+    note: Optional[str],
+    missing_sources: List[str],
+    fetched_at: Optional[datetime] = None,
+) -> SearchResult:
+    """Update a cache entry in place after a top-up or background refresh.
+
+    Leave ``fetched_at`` unset for a top-up: items kept from the original
+    scrape still age from the original fetch.
+    """
+    now = datetime.utcnow()
+    if fetched_at is not None:
+        sr.fetched_at = fetched_at
+    sr.items_blob = encode_items(items)
+    sr.items_json = ""
+    sr.items_count = len(items)
+    sr.note = note
+    sr.missing_sources = format_sources(missing_sources)
+    sr.expires_at = compute_expiry(sr.fetched_at, items, missing_sources, now=now)
+    sr.response_body, sr.response_encoding, sr.response_etag = render_cached_response(
+        items, sr.fetched_at, note
+    )
+    sr.updated_at = now
+    session.add(sr)
+    session.commit()
+    session.refresh(sr)
+    result_cache.invalidate(sr.query_normalized)
+    suggestion_index.set_expiry(sr.query_normalized, sr.expires_at)
+    return sr
+
+
+def cached_search_response(request: Request, entry: CachedSearch) -> Response:
+    """Send a cache hit's pre-serialized body as-is, honouring ETag and gzip."""
+    encoding = entry.body_encoding
+    if encoding and not accepts_encoding(request.headers.get("accept-encoding", ""), encoding):
+        encoding = None
+    headers = {"ETag": encoding_etag(entry.etag, encoding), "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    body = entry.body if encoding else decoded_body(entry.body, entry.body_encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def run_vendor_searches(
+    playwright: PlaywrightService,
+    query: str,
+    limit: int,
+    keys: List[MarketplaceName],
+) -> List[Tuple[str, Dict]]:
+    """Search the given marketplaces concurrently; failures become error results."""
+    async def run_search(key: MarketplaceName):
+        adapter = ALL_ADAPTERS[key]
+        try:
+            return key, await playwright.search(adapter, query, limit=limit, source_key=key)
+        except Exception as exc:
+            return key, {"items": [], "note": f"{adapter['name']} failed: {exc}", "failed": True}
+
+    return await asyncio.gather(*(run_search(key) for key in keys))
+
+
+def merge_vendor_results(results: List[Tuple[str, Dict]]) -> Tuple[List[Dict], List[str], List[str]]:
+    """Combine per-vendor results into (items, notes, failed vendor keys)."""
+    items = []
+    notes = []
+    failed = []
+    for key, res in results:
+        if is_vendor_failure(res):
+            failed.append(key)
+        if not res:
+            continue
+        items.extend(res.get("items", []))
+        if res.get("note"):
+            notes.append(f"{key}: {res['note']}")
+
+    # Filter blog URLs
+    return filter_blog_urls(items), notes, failed
+
+
+def rank_items(query: str, items: List[Dict], limit: int) -> List[Dict]:
+    """Top ``limit`` items by title relevance blended with price, grouped across vendors."""
+    return group_items(top_k(query, [items], limit, token_stats))
+
+
+async def _refresh_in_background(
+    playwright: PlaywrightService,
     query: str,
-    search_result: SearchResult,
+    limit: int,
+    result_id: Optional[int],
 ) -> None:
-    """Log the search for user history and recommendations."""
-    # Create user search history entry
-    ush = UserSearchHistory(
-        user_id=user.id,
-        search_result_id=search_result.id,
-        searched_at=datetime.utcnow(),
-    )
-    session.add(ush)
-    
-    # Create search query log for recommendations
-    sql = SearchQueryLog(
-        user_id=user.id,
-        query_text=query.strip(),
-        search_result_id=search_result.id,
-        searched_at=datetime.utcnow(),
+    """Re-scrape every vendor and rewrite a stale cache row.
+
+    With no ``result_id`` (a near-match was served) a new row is saved.
+    """
+    keys = list(ALL_ADAPTERS.keys())
+    try:
+        results = await run_vendor_searches(playwright, query, limit, keys)
+        items, notes, failed = merge_vendor_results(results)
+        note = "; ".join(notes) if notes else "Aggregated results"
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+            await session.run_sync(record_items, items)
+            items = await cpu_workload.run(rank_items, query, items, limit * len(keys))
+            sr = await session.get(SearchResult, result_id) if result_id is not None else None
+            if sr is None:
+                await session.run_sync(save_search_result, query, items, note, failed)
+            else:
+                await session.run_sync(
+                    update_search_result, sr, items, note, failed, fetched_at=datetime.utcnow()
+                )
+    except Exception as exc:
+        result_cache.record_refresh_failure()
+        print(f"Background refresh failed for '{query}': {exc}")
+
+
+def schedule_refresh(
+    playwright: PlaywrightService,
+    query: str,
+    limit: int,
+    result_id: Optional[int],
+) -> None:
+    """Start a background scrape for ``query`` unless one is already running."""
+    key = normalize_query(query)
+    if key in _refreshing:
+        return
+    task = asyncio.create_task(_refresh_in_background(playwright, query, limit, result_id))
+    _refreshing[key] = task
+    task.add_done_callback(lambda _t: _refreshing.pop(key, None))
+
+
+def local_search_response(
+    session: Session, query: str, limit: int, note: str, sources: Optional[List[str]] = None
+) -> MarketplaceSearchResponse:
+    """Answer from the local product index without scraping."""
+    sources = [key for key in (sources or ALL_ADAPTERS) if key in ALL_ADAPTERS]
+    products = search_local(session, query, limit=limit, sources=sources)
+    items = group_items([product_item(p) for p in products])
+    fetched_at = max((p.last_seen_at for p in products), default=datetime.utcnow())
+    return MarketplaceSearchResponse(
+        items=items,
+        fetched_at=fetched_at.isoformat(),
+        note=note,
+        from_cache=True,
+        local=True,
     )
-    session.add(sql)
-    session.commit()
+
+
+def log_user_search(user: User, query: str, search_result_id: int) -> None:
+    """Log the search for user history and recommendations.
+
+    Rows are written behind the response; suggestions update right away.
+    """
+    search_log.submit(LoggedSearch(user_id=user.id, query=query, search_result_id=search_result_id))
+    suggestion_index.record(query)
 
 
 @router.post("/search", response_model=MarketplaceSearchResponse)
@@ -114,7 +346,6 @@ async def search_marketplace(
     payload: MarketplaceQuery,
     user: User = Depends(get_current_user),
     playwright: PlaywrightService = Depends(get_playwright_service),
-    session: Session = Depends(get_session),
 ) -> MarketplaceSearchResponse:
     if payload.marketplace not in ALL_ADAPTERS:
         raise HTTPException(status_code=400, detail="Unsupported marketplace")
@@ -134,13 +365,35 @@ async def search_marketplace(
     )
 
 
+@router.post("/search_local", response_model=MarketplaceSearchResponse)
+@runs_on(db_workload)
+def search_local_catalog(
+    payload: MultiMarketplaceQuery,
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> MarketplaceSearchResponse:
+    """Instant answer from previously scraped products; call alongside search_all."""
+    return local_search_response(
+        session,
+        payload.query,
+        payload.limit * len(ALL_ADAPTERS),
+        "Saved catalog results; live prices are loading",
+        payload.marketplaces,
+    )
+
+
 @router.post("/search_all", response_model=MarketplaceSearchResponse)
 async def search_all_marketplaces(
     payload: MultiMarketplaceQuery,
+    request: Request,
     user: User = Depends(get_current_user),
     playwright: PlaywrightService = Depends(get_playwright_service),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> MarketplaceSearchResponse:
+    if not normalize_query(payload.query):
+        # Nothing left to key the cache on (e.g. "#")
+        raise HTTPException(status_code=400, detail="Query has no searchable text")
+
     # Determine which marketplaces to search
     marketplace_keys: List[MarketplaceName] = (
         payload.marketplaces if payload.marketplaces else list(ALL_ADAPTERS.keys())
@@ -152,58 +405,87 @@ async def search_all_marketplaces(
     
     if use_cache:
         # Check cache first
-        cached = get_cached_result(session, payload.query)
+        cached = await session.run_sync(load_cached_search, payload.query)
         if cached:
-            items = json.loads(cached.items_json)
+            stale = is_stale(cached.expires_at)
+            refetch = [k for k in cached.missing_sources if k in ALL_ADAPTERS]
+            if not stale and not refetch:
+                # Fresh and complete: send the stored bytes without re-encoding
+                log_user_search(user, payload.query, cached.result_id)
+                return cached_search_response(request, cached)
+            items = cached.items
+            note = cached.note
+            if stale:
+                # Serve what we have now; a single background refresh rewrites the row
+                schedule_refresh(playwright, payload.query, payload.limit, cached.result_id)
+            else:
+                # Partial entry: only scrape the vendors missing from it
+                results = await run_vendor_searches(playwright, payload.query, payload.limit, refetch)
+                fresh_items, fresh_notes, failed = merge_vendor_results(results)
+                await session.run_sync(record_items, fresh_items)
+                kept_items = [i.model_dump(mode="json") for i in cached.items if i.source not in refetch]
+                kept_notes = [
+                    n for n in (cached.note or "").split("; ")
+                    if n and not any(n.startswith(f"{k}:") for k in refetch)
+                ]
+                items = await cpu_workload.run(
+                    rank_items, payload.query, kept_items + fresh_items, payload.limit * len(marketplace_keys)
+                )
+                notes = kept_notes + fresh_notes
+                note = "; ".join(notes) if notes else "Aggregated results"
+                sr = await session.get(SearchResult, cached.result_id)
+                if sr is not None:
+                    await session.run_sync(update_search_result, sr, items, note, failed)
             # Log this search for the user
-            log_user_search(session, user, payload.query, cached)
+            log_user_search(user, payload.query, cached.result_id)
             return MarketplaceSearchResponse(
                 items=items,
                 fetched_at=cached.fetched_at.isoformat(),
-                note=cached.note or "From cache",
+                note=note or "From cache",
                 from_cache=True,
+                stale=stale,
             )
 
-    async def run_search(key: MarketplaceName):
-        adapter = ALL_ADAPTERS[key]
-        try:
-            return key, await playwright.search(adapter, payload.query, limit=payload.limit, source_key=key)
-        except Exception as exc:
-            return key, {"items": [], "note": f"{adapter['name']} failed: {exc}"}
-
-    results = await asyncio.gather(*(run_search(key) for key in marketplace_keys))
+        if FUZZY_MATCH_ENABLED:
+            near = await session.run_sync(find_near_match, payload.query)
+            if near:
+                # Serve the close match now and cache the exact query in the background
+                matched_key, entry = near
+                schedule_refresh(playwright, payload.query, payload.limit, None)
+                log_user_search(user, payload.query, entry.result_id)
+                return MarketplaceSearchResponse(
+                    items=entry.items,
+                    fetched_at=entry.fetched_at.isoformat(),
+                    note=entry.note or "From cache",
+                    from_cache=True,
+                    matched_query=matched_key,
+                )
 
-    items = []
-    notes = []
-    for key, res in results:
-        if not res:
-            continue
-        items.extend(res.get("items", []))
-        if res.get("note"):
-            notes.append(f"{key}: {res['note']}")
-
-    # Filter blog URLs
-    items = filter_blog_urls(items)
-
-    def price_value(item: Dict) -> float:
-        txt = (item.get("price_text") or "").replace(",", "")
-        match = re.search(r"(\d+(?:\.\d+)?)", txt)
-        try:
-            return float(match.group(1)) if match else float("inf")
-        except Exception:
-            return float("inf")
-
-    items.sort(key=price_value)
-    items = items[: payload.limit * len(marketplace_keys)]
+    results = await run_vendor_searches(playwright, payload.query, payload.limit, marketplace_keys)
+    items, notes, failed = merge_vendor_results(results)
+    if not items and len(failed) == len(marketplace_keys):
+        # Every vendor is down: fall back to recent catalog data, don't cache the outage
+        return await session.run_sync(
+            local_search_response,
+            payload.query,
+            payload.limit * len(marketplace_keys),
+            "All marketplaces failed; showing saved catalog results",
+            marketplace_keys,
+        )
+    await session.run_sync(record_items, items)
+    items = await cpu_workload.run(rank_items, payload.query, items, payload.limit * len(marketplace_keys))
     
     fetched_at = datetime.utcnow().isoformat()
     note = "; ".join(notes) if notes else "Aggregated results"
     
+    # Vendors that failed or were not selected get topped up by the next full search
+    missing = failed + [k for k in ALL_ADAPTERS if k not in marketplace_keys]
+    
     # Save to cache
-    sr = save_search_result(session, payload.query, items, note)
+    sr = await session.run_sync(save_search_result, payload.query, items, note, missing)
     
     # Log for user history
-    log_user_search(session, user, payload.query, sr)
+    log_user_search(user, payload.query, sr.id)
     
     return MarketplaceSearchResponse(
         items=items,
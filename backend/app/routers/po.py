@@ -1,5 +1,4 @@
 import os
-import json
 import tempfile
 import base64
 from typing import List, Optional
@@ -9,12 +8,15 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import Response
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 import pdfkit
 
-from ..db.session import get_session
+from ..db.codec import encode_items, load_items
+from ..db.session import get_async_session
 from ..auth.dependencies import get_current_user, get_admin_user
 from ..models import PurchaseOrder, User
+from ..services.workloads import WorkloadBusy, cpu_workload
 
 router = APIRouter(prefix="/api/po", tags=["purchase_order"])
 
@@ -264,37 +266,40 @@ def generate_po_html(data: PurchaseOrderRequest) -> str:
     return html
 
 
+PDF_OPTIONS = {
+    'page-size': 'A4',
+    'margin-top': '15mm',
+    'margin-right': '15mm',
+    'margin-bottom': '15mm',
+    'margin-left': '15mm',
+    'encoding': 'UTF-8',
+    'enable-local-file-access': None,
+    'print-media-type': None,
+}
+
+
+def render_po_pdf(data: PurchaseOrderRequest) -> bytes:
+    """Render the PO to PDF bytes with wkhtmltopdf (blocking)."""
+    html_content = generate_po_html(data)
+    
+    # Create temp file for PDF
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
+        pdf_path = pdf_file.name
+    
+    try:
+        pdfkit.from_string(html_content, pdf_path, options=PDF_OPTIONS)
+        with open(pdf_path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(pdf_path)
+
+
 @router.post("/generate")
 async def generate_purchase_order(data: PurchaseOrderRequest):
     """Generate PDF using wkhtmltopdf."""
     try:
-        html_content = generate_po_html(data)
-        
-        # Create temp file for PDF
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
-            pdf_path = pdf_file.name
-        
-        # wkhtmltopdf options
-        options = {
-            'page-size': 'A4',
-            'margin-top': '15mm',
-            'margin-right': '15mm',
-            'margin-bottom': '15mm',
-            'margin-left': '15mm',
-            'encoding': 'UTF-8',
-            'enable-local-file-access': None,
-            'print-media-type': None,
-        }
-        
-        # Generate PDF
-        pdfkit.from_string(html_content, pdf_path, options=options)
-        
-        # Read the PDF
-        with open(pdf_path, "rb") as f:
-            pdf_content = f.read()
-        
-        # Clean up temp file
-        os.unlink(pdf_path)
+        # Rendering takes seconds; keep it off the event loop
+        pdf_content = await cpu_workload.run(render_po_pdf, data)
         
         # Return as downloadable file
         filename = f"PO_{data.po_number.replace('/', '_')}.pdf"
@@ -306,6 +311,8 @@ async def generate_purchase_order(data: PurchaseOrderRequest):
             }
         )
         
+    except WorkloadBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -341,7 +348,7 @@ class POListItem(BaseModel):
 async def save_purchase_order(
     data: POSaveRequest,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Save a PO as draft or completed."""
     try:
@@ -350,7 +357,7 @@ async def save_purchase_order(
         if data.id:
             stmt = stmt.where(PurchaseOrder.id != data.id)
         
-        existing_po = session.exec(stmt).first()
+        existing_po = (await session.exec(stmt)).first()
         if existing_po:
             raise HTTPException(status_code=400, detail=f"PO Number '{data.po_number}' already exists.")
 
@@ -361,7 +368,7 @@ async def save_purchase_order(
         
         if data.id:
             # Update existing PO
-            po = session.get(PurchaseOrder, data.id)
+            po = await session.get(PurchaseOrder, data.id)
             if not po:
                 raise HTTPException(status_code=404, detail="PO not found")
             
@@ -376,7 +383,8 @@ async def save_purchase_order(
             po.vendor_gstin = data.vendor.gstin
             po.vendor_pan = data.vendor.pan
             po.shipping_address = data.shipping_address
-            po.items_json = json.dumps([item.dict() for item in data.items])
+            po.items_blob = encode_items([item.dict() for item in data.items])
+            po.items_json = "[]"
             po.gst_rate = data.gst_rate
             po.sub_total = sub_total
             po.gst_amount = gst_amount
@@ -384,8 +392,8 @@ async def save_purchase_order(
             po.updated_at = datetime.utcnow()
             
             session.add(po)
-            session.commit()
-            session.refresh(po)
+            await session.commit()
+            await session.refresh(po)
             
             return {"id": po.id, "message": f"PO updated as {data.status}"}
             
@@ -403,7 +411,7 @@ async def save_purchase_order(
                 vendor_gstin=data.vendor.gstin,
                 vendor_pan=data.vendor.pan,
                 shipping_address=data.shipping_address,
-                items_json=json.dumps([item.dict() for item in data.items]),
+                items_blob=encode_items([item.dict() for item in data.items]),
                 gst_rate=data.gst_rate,
                 sub_total=sub_total,
                 gst_amount=gst_amount,
@@ -411,8 +419,8 @@ async def save_purchase_order(
             )
             
             session.add(po)
-            session.commit()
-            session.refresh(po)
+            await session.commit()
+            await session.refresh(po)
             
             return {"id": po.id, "message": f"PO saved as {data.status}"}
         
@@ -423,14 +431,14 @@ async def save_purchase_order(
 @router.get("/list")
 async def list_user_purchase_orders(
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Get list of user's POs."""
     stmt = select(PurchaseOrder).where(
         PurchaseOrder.user_id == user.id
     ).order_by(PurchaseOrder.created_at.desc())
     
-    pos = session.exec(stmt).all()
+    pos = (await session.exec(stmt)).all()
     
     return [
         POListItem(
@@ -449,11 +457,11 @@ async def list_user_purchase_orders(
 @router.get("/list/all")
 async def list_all_purchase_orders(
     user: User = Depends(get_admin_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Admin: Get list of all POs."""
     stmt = select(PurchaseOrder).order_by(PurchaseOrder.created_at.desc())
-    pos = session.exec(stmt).all()
+    pos = (await session.exec(stmt)).all()
     
     return [
         {
@@ -474,10 +482,10 @@ async def list_all_purchase_orders(
 async def get_purchase_order(
     po_id: int,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Get a specific PO."""
-    po = session.get(PurchaseOrder, po_id)
+    po = await session.get(PurchaseOrder, po_id)
     
     if not po:
         raise HTTPException(status_code=404, detail="PO not found")
@@ -500,7 +508,7 @@ async def get_purchase_order(
             "pan": po.vendor_pan,
         },
         "shipping_address": po.shipping_address,
-        "items": json.loads(po.items_json),
+        "items": await cpu_workload.run(load_items, po.items_blob, po.items_json),
         "gst_rate": po.gst_rate,
         "sub_total": po.sub_total,
         "gst_amount": po.gst_amount,
@@ -513,10 +521,10 @@ async def get_purchase_order(
 async def delete_purchase_order(
     po_id: int,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Delete a PO."""
-    po = session.get(PurchaseOrder, po_id)
+    po = await session.get(PurchaseOrder, po_id)
     
     if not po:
         raise HTTPException(status_code=404, detail="PO not found")
@@ -525,7 +533,7 @@ async def delete_purchase_order(
     if po.user_id != user.id and user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    session.delete(po)
-    session.commit()
+    await session.delete(po)
+    await session.commit()
     
     return {"message": "PO deleted"}
@@ -3,12 +3,13 @@ from typing import Optional
 from urllib.parse import urlparse
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..auth.dependencies import get_current_user
-from ..db.session import get_session
+from ..db.session import get_async_session
 from ..models.user import User
 from ..schemas.marketplace import RefreshItemRequest, RefreshItemResponse
+from ..services.catalog import record_items
 from ..services.playwright import PlaywrightService
 
 router = APIRouter(prefix="/api/items", tags=["items"])
@@ -28,6 +29,7 @@ async def refresh_item(
     payload: RefreshItemRequest,
     user: User = Depends(get_current_user),
     playwright: PlaywrightService = Depends(get_playwright_service),
+    session: AsyncSession = Depends(get_async_session),
 ) -> RefreshItemResponse:
     """Refresh a single item by fetching current data from its product page."""
     
@@ -45,6 +47,9 @@ async def refresh_item(
     if not item_data:
         raise HTTPException(status_code=404, detail="Could not extract item data from URL")
     
+    # Keep the product catalog current with the refreshed price
+    await session.run_sync(record_items, [{**item_data, "url": payload.url, "source": payload.source}])
+    
     return RefreshItemResponse(
         title=item_data.get("title", ""),
         price_text=item_data.get("price_text", ""),
@@ -53,5 +58,6 @@ async def refresh_item(
         source=payload.source,
         image_url=item_data.get("image_url", ""),
         sku=item_data.get("sku", ""),
+        price=item_data.get("price"),
         refreshed_at=datetime.utcnow().isoformat(),
     )
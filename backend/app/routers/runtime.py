@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from ..auth.dependencies import get_current_admin
+from ..auth.password_pool import password_hasher
+from ..models.user import User
+from ..services.loop_monitor import loop_monitor
+from ..services.workloads import WORKLOADS
+
+router = APIRouter(prefix="/api/admin/runtime", tags=["runtime"])
+
+
+class ExecutorStatsResponse(BaseModel):
+    name: str
+    workers: int
+    queued: int  # waiting for a worker
+    active: int
+    completed: int
+    rejected: int  # turned away with 503 because the queue was full
+    max_queue: int
+
+
+class SlowCallbackResponse(BaseModel):
+    at: str
+    route: str  # endpoint (or task) the loop was running when it stalled
+    path: Optional[str] = None
+    lag_ms: float
+    stack: List[str]  # innermost frame last
+
+
+class RouteStallsResponse(BaseModel):
+    stalls: int
+    total_lag_ms: float
+    max_lag_ms: float
+
+
+class LoopStatsResponse(BaseModel):
+    interval_ms: float
+    slow_callback_ms: float
+    current_lag_ms: float
+    p50_lag_ms: float
+    p99_lag_ms: float
+    max_lag_ms: float
+    slow_callbacks: List[SlowCallbackResponse]
+    routes: Dict[str, RouteStallsResponse]
+
+
+@router.get("/executors", response_model=List[ExecutorStatsResponse])
+async def get_executor_stats(admin: User = Depends(get_current_admin)) -> List[ExecutorStatsResponse]:
+    """Queue depth and throughput of each workload's executor."""
+    stats = [workload.metrics() for workload in WORKLOADS] + [password_hasher.metrics()]
+    return [ExecutorStatsResponse(**s) for s in stats]
+
+
+@router.get("/loop", response_model=LoopStatsResponse)
+async def get_loop_stats(admin: User = Depends(get_current_admin)) -> LoopStatsResponse:
+    """Event-loop lag over the last minute and the latest slow callbacks."""
+    return LoopStatsResponse(**loop_monitor.metrics())
@@ -1,18 +1,22 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
 
 from ..auth.dependencies import get_current_admin
-from ..auth.security import hash_password
+from ..auth.password_pool import password_hasher
+from ..auth.user_cache import auth_cache
 from ..db.session import get_session
 from ..models.user import User, UserRole
 from ..schemas.auth import UserCreateRequest, UserResponse, UserUpdateRequest
+from ..services.workloads import db_workload, runs_on
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
 @router.get("", response_model=List[UserResponse])
+@runs_on(db_workload)
 def list_users(
     admin: User = Depends(get_current_admin),
     session: Session = Depends(get_session),
@@ -32,13 +36,7 @@ def list_users(
     ]
 
 
-@router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
-    payload: UserCreateRequest,
-    admin: User = Depends(get_current_admin),
-    session: Session = Depends(get_session),
-) -> UserResponse:
-    """Create a new user. Admin only."""
+def _insert_user(session: Session, payload: UserCreateRequest, role: UserRole, hashed_password: str) -> User:
     # Check for existing username/email
     existing = session.exec(
         select(User).where(
@@ -52,25 +50,38 @@ def create_user(
             detail="Username or email already exists",
         )
     
-    # Validate role
-    try:
-        role = UserRole(payload.role)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid role. Must be 'admin' or 'normal'",
-        )
-    
     user = User(
         username=payload.username,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
         role=role,
         is_active=True,
     )
     session.add(user)
     session.commit()
     session.refresh(user)
+    return user
+
+
+@router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def create_user(
+    payload: UserCreateRequest,
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> UserResponse:
+    """Create a new user. Admin only."""
+    # Validate role
+    try:
+        role = UserRole(payload.role)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid role. Must be 'admin' or 'normal'",
+        )
+    
+    # Hash in the password pool, then only the queries go to the DB workload
+    hashed_password = await password_hasher.hash(payload.password)
+    user = await db_workload.run(_insert_user, session, payload, role, hashed_password)
     
     return UserResponse(
         id=user.id,
@@ -82,6 +93,7 @@ def create_user(
 
 
 @router.get("/{user_id}", response_model=UserResponse)
+@runs_on(db_workload)
 def get_user(
     user_id: int,
     admin: User = Depends(get_current_admin),
@@ -103,14 +115,9 @@ def get_user(
     )
 
 
-@router.put("/{user_id}", response_model=UserResponse)
-def update_user(
-    user_id: int,
-    payload: UserUpdateRequest,
-    admin: User = Depends(get_current_admin),
-    session: Session = Depends(get_session),
-) -> UserResponse:
-    """Update a user. Admin only."""
+def _apply_update(
+    session: Session, user_id: int, payload: UserUpdateRequest, hashed_password: Optional[str]
+) -> User:
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(
@@ -142,8 +149,8 @@ def update_user(
             )
         user.email = payload.email
     
-    if payload.password is not None:
-        user.hashed_password = hash_password(payload.password)
+    if hashed_password is not None:
+        user.hashed_password = hashed_password
     
     if payload.role is not None:
         try:
@@ -157,9 +164,27 @@ def update_user(
     if payload.is_active is not None:
         user.is_active = payload.is_active
     
+    user.version += 1
+    user.updated_at = datetime.utcnow()
     session.add(user)
     session.commit()
     session.refresh(user)
+    auth_cache.invalidate_user(user.id, user.version)
+    return user
+
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    payload: UserUpdateRequest,
+    admin: User = Depends(get_current_admin),
+    session: Session = Depends(get_session),
+) -> UserResponse:
+    """Update a user. Admin only."""
+    hashed_password = None
+    if payload.password is not None:
+        hashed_password = await password_hasher.hash(payload.password)
+    user = await db_workload.run(_apply_update, session, user_id, payload, hashed_password)
     
     return UserResponse(
         id=user.id,
@@ -171,6 +196,7 @@ def update_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@runs_on(db_workload)
 def delete_user(
     user_id: int,
     admin: User = Depends(get_current_admin),
@@ -191,5 +217,7 @@ def delete_user(
             detail="Cannot delete your own account",
         )
     
+    version = user.version
     session.delete(user)
     session.commit()
+    auth_cache.invalidate_user(user_id, version + 1)
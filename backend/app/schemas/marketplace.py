@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
@@ -18,6 +19,13 @@ class MultiMarketplaceQuery(BaseModel):
     marketplaces: Optional[List[MarketplaceName]] = Field(None, description="Subset of marketplaces; defaults to all")
 
 
+class ItemPrice(BaseModel):
+    amount: Decimal
+    currency: str = "INR"
+    mrp: Optional[Decimal] = None  # list price when the item is on sale
+    tax_inclusive: Optional[bool] = None  # None when the listing doesn't say
+
+
 class MarketplaceItem(BaseModel):
     title: str
     price_text: str
@@ -26,6 +34,9 @@ class MarketplaceItem(BaseModel):
     source: MarketplaceName
     image_url: str = ""
     sku: str = ""
+    price: Optional[ItemPrice] = None
+    group: Optional[int] = None  # same product as other items with this group id
+    best_in_group: bool = False
 
 
 class MarketplaceSearchResponse(BaseModel):
@@ -33,6 +44,9 @@ class MarketplaceSearchResponse(BaseModel):
     fetched_at: str
     note: Optional[str] = None
     from_cache: bool = False
+    stale: bool = False  # expired cache entry served while a refresh runs
+    matched_query: Optional[str] = None  # set when a near-identical cached query was served
+    local: bool = False  # answered from the local product index, not a live scrape
 
 
 class RefreshItemRequest(BaseModel):
@@ -47,4 +61,5 @@ class RefreshItemResponse(BaseModel):
     url: str
     source: MarketplaceName
     image_url: str = ""
+    price: Optional[ItemPrice] = None
     refreshed_at: str
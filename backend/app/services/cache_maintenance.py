@@ -0,0 +1,257 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional
+
+from sqlalchemy import text, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Session, delete, func, or_, select, update
+
+from ..db.codec import load_items
+from ..db.session import get_engine
+from ..models.search import QueryStats, SearchQueryLog, SearchResult, UserSearchHistory
+from .cache_policy import format_sources, parse_sources, stale_cutoff
+from .price_history import rollup_price_history
+from .query_canon import tokenize_query
+from .result_cache import result_cache
+from .search_log import search_log
+from .suggestions import suggestion_index
+
+MAINTENANCE_INTERVAL_MINUTES = float(os.getenv("CACHE_MAINTENANCE_INTERVAL_MINUTES", "60"))
+VACUUM_PAGES = int(os.getenv("CACHE_VACUUM_PAGES", "500"))
+BATCH_SIZE = 500
+
+
+# Stand-ins that carry wildcards through query canonicalization
+_WILDCARDS = {"*": "xxstarxx", "?": "xxanyxx"}
+
+
+def _like_pattern(pattern: str) -> str:
+    """Turn a shell-style pattern (``esp32*``) into a SQL LIKE pattern."""
+    escaped = pattern.lower().strip().replace("%", r"\%").replace("_", r"\_")
+    escaped = escaped.replace("*", "%").replace("?", "_")
+    return escaped if any(c in pattern for c in "*?") else f"%{escaped}%"
+
+
+def _pattern_tokens(pattern: str) -> List[str]:
+    """Canonical tokens of an admin pattern, wildcards kept.
+
+    Cache keys are canonical, token-sorted queries, so "ESP32* devkit" must
+    be canonicalized the same way and matched token by token.
+    """
+    for wildcard, stand_in in _WILDCARDS.items():
+        pattern = pattern.replace(wildcard, stand_in)
+    tokens = tokenize_query(pattern)
+    for wildcard, stand_in in _WILDCARDS.items():
+        tokens = [t.replace(stand_in, wildcard) for t in tokens]
+    return tokens
+
+
+def _token_clause(token: str):
+    """SQL prefilter: ``token`` matches one of the key's space-separated tokens."""
+    like = _like_pattern(token)
+    key = SearchResult.query_normalized
+    return or_(*(key.like(p, escape="\\") for p in (like, f"% {like}", f"{like} %", f"% {like} %")))
+
+
+def _key_matches(tokens: List[str], key: str) -> bool:
+    """Every pattern token matches a whole key token (wildcards) or part of one."""
+    words = key.split()
+    return all(
+        any(fnmatchcase(w, t) if any(c in t for c in "*?") else t in w for w in words)
+        for t in tokens
+    )
+
+
+def dedupe_search_results(session: Session) -> int:
+    """Drop superseded rows per query, repointing references at the kept row.
+
+    The kept row is the one ``get_cached_result`` serves: the latest
+    ``expires_at``. A later subset-marketplace search can insert a shorter-
+    lived partial row under the same key, and it must not replace the
+    complete one.
+    """
+    stmt = (
+        select(SearchResult.query_normalized)
+        .group_by(SearchResult.query_normalized)
+        .having(func.count(SearchResult.id) > 1)
+    )
+    removed = 0
+    for query_normalized in session.exec(stmt).all():
+        keep_id, *old_ids = session.exec(
+            select(SearchResult.id)
+            .where(SearchResult.query_normalized == query_normalized)
+            .order_by(SearchResult.expires_at.desc(), SearchResult.id.desc())
+        ).all()
+        session.exec(
+            update(UserSearchHistory)
+            .where(UserSearchHistory.search_result_id.in_(old_ids))
+            .values(search_result_id=keep_id)
+        )
+        session.exec(
+            update(SearchQueryLog)
+            .where(SearchQueryLog.search_result_id.in_(old_ids))
+            .values(search_result_id=keep_id)
+        )
+        session.exec(
+            update(QueryStats)
+            .where(QueryStats.latest_result_id.in_(old_ids))
+            .values(latest_result_id=keep_id)
+        )
+        session.exec(delete(SearchResult).where(SearchResult.id.in_(old_ids)))
+        session.commit()
+        # The LRU may hold one of the deleted ids
+        result_cache.invalidate(query_normalized)
+        removed += len(old_ids)
+    return removed
+
+
+def purge_expired_results(session: Session, now: Optional[datetime] = None) -> int:
+    """Delete rows past the stale grace window that no user history points at."""
+    referenced = select(UserSearchHistory.search_result_id)
+    removed = 0
+    while True:
+        rows = session.exec(
+            select(SearchResult.id, SearchResult.query_normalized)
+            .where(
+                SearchResult.expires_at < stale_cutoff(now),
+                SearchResult.id.not_in(referenced),
+            )
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return removed
+        ids = [row_id for row_id, _ in rows]
+        session.exec(
+            update(SearchQueryLog)
+            .where(SearchQueryLog.search_result_id.in_(ids))
+            .values(search_result_id=None)
+        )
+        session.exec(
+            update(QueryStats)
+            .where(QueryStats.latest_result_id.in_(ids))
+            .values(latest_result_id=None)
+        )
+        session.exec(delete(SearchResult).where(SearchResult.id.in_(ids)))
+        session.commit()
+        for _, query_normalized in rows:
+            result_cache.invalidate(query_normalized)
+        removed += len(ids)
+
+
+def enable_incremental_vacuum(session: Session) -> bool:
+    """Switch a SQLite file to incremental auto-vacuum (one-time full VACUUM)."""
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+            return True
+        conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        conn.execute(text("VACUUM"))
+    return True
+
+
+def compact_database(session: Session, pages: int = VACUUM_PAGES) -> int:
+    """Release up to ``pages`` free pages back to the OS; returns pages left free."""
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return 0
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"PRAGMA incremental_vacuum({int(pages)})"))
+        return conn.execute(text("PRAGMA freelist_count")).scalar() or 0
+
+
+def invalidate_results(
+    session: Session,
+    pattern: Optional[str] = None,
+    vendor: Optional[str] = None,
+) -> int:
+    """Invalidate cached searches by query pattern and/or vendor.
+
+    A pattern match expires the row outright. A vendor match marks that
+    vendor as missing so only its items are re-scraped on the next hit.
+    """
+    stmt = select(SearchResult).where(SearchResult.expires_at > stale_cutoff())
+    tokens = _pattern_tokens(pattern) if pattern else []
+    if pattern and not tokens:
+        return 0  # nothing searchable in it; never widen to every row
+    if tokens:
+        stmt = stmt.where(*(_token_clause(t) for t in tokens))
+
+    if vendor and session.get_bind().dialect.name == "postgresql":
+        # JSONB payloads: containment is answered from the GIN index
+        stmt = stmt.where(type_coerce(SearchResult.items_blob, JSONB).contains([{"source": vendor}]))
+
+    now = datetime.utcnow()
+    rows: List[SearchResult] = session.exec(stmt).all()
+    if tokens:
+        # LIKE's % can run across a space; keep only whole-token matches
+        rows = [sr for sr in rows if _key_matches(tokens, sr.query_normalized)]
+    if vendor:
+        # SQLite payloads are compressed, so the vendor filter runs here
+        rows = [
+            sr for sr in rows
+            if any(i.get("source") == vendor for i in load_items(sr.items_blob, sr.items_json))
+        ]
+    for sr in rows:
+        if vendor:
+            sr.missing_sources = format_sources(parse_sources(sr.missing_sources) + [vendor])
+        else:
+            sr.expires_at = stale_cutoff(now) - timedelta(seconds=1)
+        sr.updated_at = now
+        session.add(sr)
+        result_cache.invalidate(sr.query_normalized)
+        suggestion_index.set_expiry(sr.query_normalized, sr.expires_at)
+    session.commit()
+    return len(rows)
+
+
+def cache_stats(session: Session) -> Dict[str, int]:
+    now = datetime.utcnow()
+    total = session.exec(select(func.count(SearchResult.id))).one()
+    expired = session.exec(
+        select(func.count(SearchResult.id)).where(SearchResult.expires_at <= now)
+    ).one()
+    queries = session.exec(select(func.count(func.distinct(SearchResult.query_normalized)))).one()
+    return {
+        "rows": total,
+        "expired_rows": expired,
+        "distinct_queries": queries,
+        "memory_entries": len(result_cache),
+        "memory_hits": result_cache.hits,
+        "memory_misses": result_cache.misses,
+        "refresh_failures": result_cache.refresh_failures,
+    }
+
+
+def run_cache_maintenance(session: Session, vacuum_pages: int = VACUUM_PAGES) -> Dict[str, int]:
+    """Dedupe, purge and incrementally compact the search cache; roll up old prices."""
+    deduped = dedupe_search_results(session)
+    purged = purge_expired_results(session)
+    rolled_up = rollup_price_history(session)
+    free_pages = compact_database(session, vacuum_pages)
+    return {"deduped": deduped, "purged": purged, "prices_rolled_up": rolled_up, "free_pages": free_pages}
+
+
+def _maintenance_pass(first_run: bool) -> Dict[str, int]:
+    # Queued history must land before dedupe remaps the result ids it points at
+    search_log.flush()
+    with Session(get_engine()) as session:
+        if first_run:
+            enable_incremental_vacuum(session)
+        return run_cache_maintenance(session)
+
+
+async def cache_maintenance_loop() -> None:
+    """Run maintenance periodically off the event loop."""
+    first_run = True
+    while True:
+        try:
+            stats = await asyncio.to_thread(_maintenance_pass, first_run)
+            first_run = False
+            print(f"Cache maintenance: {stats}")
+        except Exception as exc:
+            print(f"Cache maintenance failed: {exc}")
+        await asyncio.sleep(MAINTENANCE_INTERVAL_MINUTES * 60)
@@ -0,0 +1,91 @@
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..adapters import ALL_ADAPTERS
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+# Fully successful results from every vendor
+DEFAULT_TTL_HOURS = _env_float("CACHE_TTL_HOURS", 7 * 24)
+# Results where at least one vendor failed or timed out
+PARTIAL_TTL_MINUTES = _env_float("CACHE_PARTIAL_TTL_MINUTES", 30)
+# Every vendor answered but nobody had a match
+NEGATIVE_TTL_HOURS = _env_float("CACHE_NEGATIVE_TTL_HOURS", 6)
+# How long after expiry an entry may still be served while it is refreshed
+STALE_GRACE_HOURS = _env_float("CACHE_STALE_GRACE_HOURS", 24)
+
+
+def vendor_ttl(key: str) -> timedelta:
+    """TTL for items from one vendor, based on how volatile its prices are.
+
+    Reads ``CACHE_TTL_<KEY>_HOURS`` first, then the adapter's ``cache_ttl_hours``.
+    """
+    adapter = ALL_ADAPTERS.get(key, {})
+    hours = adapter.get("cache_ttl_hours", DEFAULT_TTL_HOURS)
+    return timedelta(hours=_env_float(f"CACHE_TTL_{key.upper()}_HOURS", hours))
+
+
+def is_vendor_failure(result: Optional[Dict[str, Any]]) -> bool:
+    """True if a vendor search errored or timed out rather than finding nothing."""
+    if not result:
+        return True
+    if result.get("failed"):
+        return True
+    note = (result.get("note") or "").lower()
+    return not result.get("items") and ("timed out" in note or "failed" in note)
+
+
+def parse_sources(raw: Optional[str]) -> List[str]:
+    """Split a comma-separated ``missing_sources`` column value."""
+    if not raw:
+        return []
+    return [s for s in raw.split(",") if s]
+
+
+def format_sources(sources: Iterable[str]) -> Optional[str]:
+    """Inverse of ``parse_sources``; ``None`` when there is nothing to store."""
+    joined = ",".join(sorted(set(sources)))
+    return joined or None
+
+
+def compute_expiry(
+    fetched_at: datetime,
+    items: List[Dict],
+    missing_sources: Iterable[str],
+    now: Optional[datetime] = None,
+) -> datetime:
+    """Pick the expiry for a merged cache entry.
+
+    - any vendor failed: short partial TTL from now, so the gap is topped up soon
+    - no items at all: negative-cache TTL
+    - otherwise: the shortest TTL among the vendors that contributed items,
+      counted from when those items were fetched
+    """
+    now = now or datetime.utcnow()
+    if list(missing_sources):
+        return now + timedelta(minutes=PARTIAL_TTL_MINUTES)
+    if not items:
+        return now + timedelta(hours=NEGATIVE_TTL_HOURS)
+    sources = {item.get("source") for item in items if item.get("source")}
+    ttl = min((vendor_ttl(s) for s in sources), default=timedelta(hours=DEFAULT_TTL_HOURS))
+    return fetched_at + ttl
+
+
+def stale_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Entries expiring after this moment can still be served stale."""
+    now = now or datetime.utcnow()
+    return now - timedelta(hours=STALE_GRACE_HOURS)
+
+
+def is_stale(expires_at: datetime, now: Optional[datetime] = None) -> bool:
+    return expires_at <= (now or datetime.utcnow())
@@ -0,0 +1,187 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select
+
+from ..models.catalog import PriceDaily, PriceObservation, Product
+from .pricing import item_amount, parse_price
+from .ranking import token_stats
+
+# SQLite caps bound parameters per statement; stay well below it
+LOOKUP_CHUNK = 500
+UPSERT_CHUNK = 100  # rows per INSERT; each row binds 15 parameters
+
+
+def canonical_product_url(url: str) -> str:
+    """Product URL without query string, fragment or trailing slash.
+
+    Tracking parameters and Shopify ``?variant=`` suffixes would otherwise
+    split one listing into many products.
+    """
+    parts = urlsplit((url or "").strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, "", ""))
+
+
+def product_item(product: Product) -> Dict:
+    """A catalog product in the scraped item shape used by search responses."""
+    return {
+        "title": product.title,
+        "price_text": product.latest_price_text,
+        "availability": product.availability,
+        "url": product.canonical_url,
+        "source": product.source,
+        "image_url": product.image_url,
+        "sku": product.sku,
+        "price": product_price(product),
+    }
+
+
+def product_price(product: Product) -> Optional[Dict]:
+    """Structured price of a catalog product, in the scraped item shape."""
+    if product.latest_price is None:
+        return None
+    return {
+        "amount": f"{product.latest_price:.2f}",
+        "currency": product.currency,
+        "mrp": f"{product.mrp:.2f}" if product.mrp is not None else None,
+        "tax_inclusive": product.tax_inclusive,
+    }
+
+
+def _existing_products(session: Session, urls: List[str]) -> Dict[str, Tuple]:
+    """Stored fields that an item without them keeps, by canonical URL."""
+    existing: Dict[str, Tuple] = {}
+    for i in range(0, len(urls), LOOKUP_CHUNK):
+        chunk = urls[i:i + LOOKUP_CHUNK]
+        stmt = select(
+            Product.canonical_url, Product.sku, Product.image_url, Product.availability,
+            Product.latest_price_text, Product.currency,
+        ).where(Product.canonical_url.in_(chunk))
+        for url, *fields in session.exec(stmt).all():
+            existing[url] = tuple(fields)
+    return existing
+
+
+def _upsert_products(session: Session, rows: List[Dict]) -> Dict[str, Tuple[int, datetime]]:
+    """Insert or update products by canonical URL; returns id and first_seen_at.
+
+    A single ``INSERT ... ON CONFLICT DO UPDATE``, so a search, an item
+    refresh and the crawler can land the same listing at the same time.
+    """
+    insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    table = Product.__table__
+    stored: Dict[str, Tuple[int, datetime]] = {}
+    for i in range(0, len(rows), UPSERT_CHUNK):
+        stmt = insert(table).values(rows[i:i + UPSERT_CHUNK])
+        # source, first_seen_at and created_at stay as first recorded; a blank
+        # sku or image never overwrites a known one
+        updates = {
+            column: stmt.excluded[column]
+            for column in rows[0]
+            if column not in ("canonical_url", "source", "first_seen_at", "created_at")
+        }
+        for column in ("sku", "image_url"):
+            updates[column] = func.coalesce(func.nullif(stmt.excluded[column], ""), table.c[column])
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c.canonical_url], set_=updates).returning(
+            table.c.canonical_url, table.c.id, table.c.first_seen_at
+        )
+        for url, product_id, first_seen_at in session.execute(stmt):
+            stored[url] = (product_id, first_seen_at)
+    return stored
+
+
+def record_items(
+    session: Session,
+    items: Iterable[Dict],
+    observed_at: Optional[datetime] = None,
+) -> int:
+    """Upsert products and record price changes, in one transaction."""
+    observed_at = observed_at or datetime.utcnow()
+    by_url: Dict[str, Dict] = {}
+    for item in items:
+        if item.get("url") and item.get("title"):
+            by_url[canonical_product_url(item["url"])] = item
+    if not by_url:
+        return 0
+
+    existing = _existing_products(session, list(by_url))
+    rows: List[Dict] = []
+    changed: List[Dict] = []
+    for url, item in by_url.items():
+        sku, image_url, availability, price_text, currency = existing.get(url, ("", "", "", None, "INR"))
+        price_text_now = item.get("price_text", "")
+        price = item.get("price") or parse_price(price_text_now) or {}
+        amount = item_amount(item)
+        row = {
+            "canonical_url": url,
+            "source": item.get("source", ""),
+            "title": item["title"],
+            "sku": item.get("sku") or sku,
+            "image_url": item.get("image_url") or image_url,
+            "availability": item.get("availability", availability),
+            "latest_price_text": price_text_now,
+            "latest_price": float(amount) if amount is not None else None,
+            "currency": price.get("currency", currency),
+            "mrp": float(price["mrp"]) if price.get("mrp") else None,
+            "tax_inclusive": price.get("tax_inclusive"),
+            "first_seen_at": observed_at,
+            "last_seen_at": observed_at,
+            "created_at": observed_at,
+            "updated_at": observed_at,
+        }
+        rows.append(row)
+        # A listing we had not seen (price_text None) always gets an observation
+        if (row["latest_price_text"], row["availability"]) != (price_text, availability):
+            changed.append(row)
+    stored = _upsert_products(session, rows)
+
+    # Delta encoding: unchanged prices only bump last_seen_at
+    session.add_all(
+        PriceObservation(
+            product_id=stored[row["canonical_url"]][0],
+            price=row["latest_price"],
+            price_text=row["latest_price_text"],
+            availability=row["availability"],
+            observed_at=observed_at,
+        )
+        for row in changed
+    )
+    session.commit()
+    # Only count titles this call inserted, and only once they are committed
+    for row in rows:
+        if stored[row["canonical_url"]][1] == observed_at and row["canonical_url"] not in existing:
+            token_stats.add(row["title"])
+    return len(rows)
+
+
+def cheapest_offers(session: Session, sku: str, limit: int = 10) -> List[Product]:
+    """Current offers for a SKU across vendors, cheapest first."""
+    stmt = (
+        select(Product)
+        .where(Product.sku == sku, Product.latest_price.is_not(None))
+        .order_by(Product.latest_price)
+        .limit(limit)
+    )
+    return session.exec(stmt).all()
+
+
+def lowest_observed_price(session: Session, product_id: int) -> Optional[float]:
+    """Lowest price ever recorded for a product, including rolled-up history."""
+    raw = session.exec(
+        select(func.min(PriceObservation.price)).where(PriceObservation.product_id == product_id)
+    ).one()
+    daily = session.exec(
+        select(func.min(PriceDaily.min_price)).where(PriceDaily.product_id == product_id)
+    ).one()
+    prices = [p for p in (raw, daily) if p is not None]
+    return min(prices) if prices else None
+
+
+def load_token_stats(session: Session) -> int:
+    """Count title tokens over the whole catalog for relevance ranking."""
+    for title in session.exec(select(Product.title).execution_options(yield_per=1000)):
+        token_stats.add(title)
+    return len(token_stats)
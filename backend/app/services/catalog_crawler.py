@@ -0,0 +1,335 @@
+"""Offline crawl of each vendor's full catalog into the product table.
+
+Shopify stores are paged through ``/products.json``; other vendors are read
+from their product sitemap, fetching only pages whose ``lastmod`` moved and
+pulling the product out of the page's JSON-LD. Runs are paced, checkpoint
+into ``CrawlState`` after every batch so a restart resumes mid-run, and are
+incremental against the high-water mark of the last completed run.
+"""
+import asyncio
+import functools
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+import httpx
+from sqlmodel import Session
+
+from ..adapters import ALL_ADAPTERS
+from ..db.session import get_engine
+from ..models.catalog import CrawlState
+from .catalog import record_items
+from .pricing import with_structured_price
+
+CRAWL_ENABLED = os.getenv("CATALOG_CRAWL_ENABLED", "false").lower() in {"1", "true", "yes", "on"}
+CRAWL_INTERVAL_HOURS = float(os.getenv("CATALOG_CRAWL_INTERVAL_HOURS", "24"))
+CRAWL_DELAY_SECONDS = float(os.getenv("CATALOG_CRAWL_DELAY_SECONDS", "2"))
+SHOPIFY_PAGE_SIZE = 250  # products.json maximum
+CHECKPOINT_EVERY = 25  # sitemap product pages per checkpoint
+# Child sitemaps followed from an index unless the adapter names its own marker
+PRODUCT_SITEMAP_MARKER = "product"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+
+_JSON_LD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Crawls in flight, keyed by vendor (one per vendor)
+_crawling: Dict[str, asyncio.Task] = {}
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    """ISO date/datetime as naive UTC, matching how the app stores times."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_sitemap(xml: bytes) -> Tuple[List[str], List[Tuple[str, Optional[datetime]]]]:
+    """Child sitemaps and ``(url, lastmod)`` entries of a sitemap document."""
+    root = ET.fromstring(xml)
+    children: List[str] = []
+    entries: List[Tuple[str, Optional[datetime]]] = []
+    for node in root:
+        fields = {_local_name(child.tag): (child.text or "").strip() for child in node}
+        if not fields.get("loc"):
+            continue
+        if _local_name(node.tag) == "sitemap":
+            children.append(fields["loc"])
+        else:
+            entries.append((fields["loc"], parse_time(fields.get("lastmod"))))
+    return children, entries
+
+
+def _format_price(amount: str) -> str:
+    return f"₹{float(amount):,.2f}"
+
+
+def shopify_item(product: Dict, base_url: str, source: str) -> Optional[Dict]:
+    """A products.json entry in the scraped item shape."""
+    variants = product.get("variants") or []
+    priced = [v for v in variants if v.get("price")]
+    if not product.get("handle") or not priced:
+        return None
+    images = product.get("images") or []
+    cheapest = min(priced, key=lambda v: float(v["price"]))
+    item = {
+        "title": product.get("title", ""),
+        "price_text": _format_price(cheapest["price"]),
+        "availability": "In stock" if any(v.get("available") for v in variants) else "Out of stock",
+        "url": f"{base_url}/products/{product['handle']}",
+        "source": source,
+        "image_url": images[0].get("src", "") if images else "",
+        "sku": next((v["sku"] for v in variants if v.get("sku")), ""),
+    }
+    compare_at = cheapest.get("compare_at_price")
+    return with_structured_price(item, _format_price(compare_at) if compare_at else None)
+
+
+def _json_ld_products(html: str) -> Iterable[Dict]:
+    for block in _JSON_LD_RE.findall(html):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        nodes = data if isinstance(data, list) else data.get("@graph", [data])
+        for node in nodes:
+            if isinstance(node, dict) and node.get("@type") in ("Product", ["Product"]):
+                yield node
+
+
+def product_page_item(html: str, url: str, source: str) -> Optional[Dict]:
+    """Product from a page's JSON-LD markup, in the scraped item shape."""
+    for node in _json_ld_products(html):
+        offers = node.get("offers") or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        price = offers.get("price") or offers.get("lowPrice")
+        if price is None or not node.get("name"):
+            continue
+        image = node.get("image") or ""
+        if isinstance(image, list):
+            image = image[0] if image else ""
+        if isinstance(image, dict):
+            image = image.get("url", "")
+        availability = str(offers.get("availability", ""))
+        return with_structured_price({
+            "title": node["name"],
+            "price_text": _format_price(price),
+            "availability": "Out of stock" if "OutOfStock" in availability else "In stock",
+            "url": url,
+            "source": source,
+            "image_url": image,
+            "sku": str(node.get("sku") or node.get("mpn") or ""),
+        })
+    return None
+
+
+def load_state(session: Session, source: str) -> CrawlState:
+    return session.get(CrawlState, source) or CrawlState(source=source)
+
+
+def _read_state(source: str) -> CrawlState:
+    with Session(get_engine()) as session:
+        return load_state(session, source)
+
+
+def _checkpoint(source: str, items: List[Dict], **fields) -> None:
+    with Session(get_engine()) as session:
+        if items:
+            record_items(session, items)
+        state = load_state(session, source)
+        state.products_recorded += len(items)
+        for name, value in fields.items():
+            setattr(state, name, value)
+        state.updated_at = datetime.utcnow()
+        session.add(state)
+        session.commit()
+
+
+def _later(a: Optional[datetime], b: Optional[datetime]) -> Optional[datetime]:
+    return max(a, b) if a and b else a or b
+
+
+class CatalogCrawler:
+    """Paced, resumable crawler for one vendor at a time."""
+
+    def __init__(self, client: httpx.AsyncClient, delay: float = CRAWL_DELAY_SECONDS):
+        self.client = client
+        self.delay = delay
+
+    async def _get(self, url: str, **params) -> httpx.Response:
+        response = await self.client.get(url, params=params or None)
+        response.raise_for_status()
+        await asyncio.sleep(self.delay)
+        return response
+
+    async def crawl(self, source: str) -> int:
+        """Crawl one vendor, resuming any unfinished run; returns products recorded."""
+        adapter = ALL_ADAPTERS[source]
+        state = await asyncio.to_thread(_read_state, source)
+        since, cursor = state.high_water, state.cursor
+        if not cursor:
+            await asyncio.to_thread(
+                _checkpoint, source, [],
+                run_started_at=datetime.utcnow(), run_high_water=None, last_error="",
+            )
+        run_high = state.run_high_water if cursor else None
+
+        if adapter["crawl"]["type"] == "shopify":
+            recorded, run_high = await self._crawl_shopify(source, adapter, since, cursor, run_high)
+        else:
+            retry = set(state.failed_urls.split())
+            recorded, run_high = await self._crawl_sitemap(source, adapter, since, cursor, run_high, retry)
+
+        await asyncio.to_thread(
+            _checkpoint, source, [],
+            cursor="", high_water=_later(since, run_high), run_high_water=None,
+            last_completed_at=datetime.utcnow(),
+        )
+        return recorded
+
+    async def _crawl_shopify(
+        self, source: str, adapter: Dict, since: Optional[datetime], cursor: str, run_high: Optional[datetime],
+    ) -> Tuple[int, Optional[datetime]]:
+        base_url = adapter["base_url"]
+        page = int(cursor or 1)
+        recorded = 0
+        while True:
+            response = await self._get(f"{base_url}/products.json", limit=SHOPIFY_PAGE_SIZE, page=page)
+            # The public endpoint can't filter by updated_at, so every page is read
+            # and only changed products are written
+            products = response.json().get("products", [])
+            if not products:
+                return recorded, run_high
+            items = []
+            for product in products:
+                updated = parse_time(product.get("updated_at"))
+                run_high = _later(run_high, updated)
+                if since and updated and updated <= since:
+                    continue
+                item = shopify_item(product, base_url, source)
+                if item:
+                    items.append(item)
+            page += 1
+            await asyncio.to_thread(
+                _checkpoint, source, items, cursor=str(page), run_high_water=run_high,
+            )
+            recorded += len(items)
+
+    async def _sitemap_entries(self, url: str, marker: str) -> List[Tuple[str, Optional[datetime]]]:
+        """Entries of ``url`` and of the child sitemaps whose URL contains ``marker``.
+
+        Sitemap indexes also list category, brand and content sitemaps; only
+        product ones are worth a paced fetch per page.
+        """
+        pending, entries = [url], []
+        while pending:
+            children, found = parse_sitemap((await self._get(pending.pop())).content)
+            pending.extend(child for child in children if marker in child)
+            entries.extend(found)
+        return entries
+
+    async def _crawl_sitemap(
+        self, source: str, adapter: Dict, since: Optional[datetime], cursor: str, run_high: Optional[datetime],
+        retry: Set[str],
+    ) -> Tuple[int, Optional[datetime]]:
+        """Fetch changed product pages; ``retry`` holds pages that failed before.
+
+        A failed page neither advances the high-water mark nor drops out of
+        later incremental runs: it stays in ``CrawlState.failed_urls`` until a
+        fetch succeeds or the sitemap stops listing it.
+        """
+        sitemap_url = urljoin(adapter["base_url"], adapter["crawl"]["sitemap"])
+        marker = adapter["crawl"].get("product_sitemaps", PRODUCT_SITEMAP_MARKER)
+        entries = sorted(await self._sitemap_entries(sitemap_url, marker))
+        retry &= {url for url, _ in entries}
+        # Without lastmod we can't tell what changed, so those pages are only read on a full run
+        changed = [
+            (url, lastmod) for url, lastmod in entries
+            if url > cursor and (since is None or (lastmod and lastmod > since) or url in retry)
+        ]
+        recorded = 0
+        items: List[Dict] = []
+        for done, (url, lastmod) in enumerate(changed, 1):
+            try:
+                item = product_page_item((await self._get(url)).text, url, source)
+            except httpx.HTTPError as exc:
+                print(f"Catalog crawl {source}: {url} failed: {exc}")
+                retry.add(url)
+            else:
+                retry.discard(url)
+                if item:
+                    items.append(item)
+                run_high = _later(run_high, lastmod)
+            if done % CHECKPOINT_EVERY == 0 or done == len(changed):
+                await asyncio.to_thread(
+                    _checkpoint, source, items,
+                    cursor=url, run_high_water=run_high, failed_urls="\n".join(sorted(retry)),
+                )
+                recorded += len(items)
+                items = []
+        return recorded, run_high
+
+
+async def crawl_vendor(source: str) -> int:
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT}, timeout=30, follow_redirects=True,
+    ) as client:
+        try:
+            return await CatalogCrawler(client).crawl(source)
+        except Exception as exc:
+            # The cursor stays put, so the next run resumes from the last checkpoint
+            await asyncio.to_thread(_checkpoint, source, [], last_error=str(exc)[:500])
+            raise
+
+
+def _report_failure(source: str, task: asyncio.Task) -> None:
+    # Crawls started from the admin endpoint are never awaited; this retrieves the error
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Catalog crawl {source} failed: {task.exception()}")
+
+
+def crawl_task(source: str) -> asyncio.Task:
+    """The running crawl for ``source``, starting one if none is in flight."""
+    task = _crawling.get(source)
+    if task is None or task.done():
+        task = asyncio.create_task(crawl_vendor(source))
+        task.add_done_callback(functools.partial(_report_failure, source))
+        _crawling[source] = task
+    return task
+
+
+def is_crawling(source: str) -> bool:
+    task = _crawling.get(source)
+    return bool(task and not task.done())
+
+
+async def catalog_crawl_loop() -> None:
+    """Crawl every vendor in turn, then sleep until the next interval."""
+    while True:
+        for source, adapter in ALL_ADAPTERS.items():
+            if "crawl" not in adapter:
+                continue
+            try:
+                recorded = await crawl_task(source)
+                print(f"Catalog crawl {source}: recorded {recorded} products")
+            except Exception:
+                pass  # reported by the task's done-callback
+        await asyncio.sleep(CRAWL_INTERVAL_HOURS * 3600)
@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+FUZZY_MATCH_ENABLED = os.getenv("SEARCH_FUZZY_MATCH", "true").lower() in {"1", "true", "yes", "on"}
+FUZZY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.7"))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of each word, padded so word starts and ends count."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def compatible(a: str, b: str) -> bool:
+    """Guard against near matches that change meaning rather than spelling.
+
+    Both keys need the same number of words, and words with digits in them
+    (part numbers, values) must match exactly.
+    """
+    a_words, b_words = a.split(), b.split()
+    if len(a_words) != len(b_words):
+        return False
+    digits = lambda words: sorted(w for w in words if any(c.isdigit() for c in w))
+    return digits(a_words) == digits(b_words)
+
+
+class TrigramIndex:
+    """Inverted trigram index over cache keys for typo-tolerant lookup.
+
+    ``best_match`` only touches keys sharing at least one trigram with the
+    query, so cost grows with the number of candidates, not the key count.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._grams: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> None:
+        if not key:
+            return
+        with self._lock:
+            if key in self._grams:
+                return
+            grams = trigrams(key)
+            self._grams[key] = grams
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            grams = self._grams.pop(key, None)
+            for gram in grams or ():
+                keys = self._postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._postings[gram]
+
+    def matches(self, query: str, threshold: float, limit: int = 5) -> List[Tuple[str, float]]:
+        """Keys whose trigram Jaccard similarity to ``query`` is >= threshold."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared: Dict[str, int] = defaultdict(int)
+        with self._lock:
+            for gram in grams:
+                for key in self._postings.get(gram, ()):
+                    shared[key] += 1
+            scored = []
+            for key, count in shared.items():
+                union = len(grams) + len(self._grams[key]) - count
+                score = count / union
+                if score >= threshold:
+                    scored.append((key, score))
+        scored.sort(key=lambda ks: ks[1], reverse=True)
+        return scored[:limit]
+
+    def best_match(self, query: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """Closest other key that passes ``compatible``, if any."""
+        for key, score in self.matches(query, threshold):
+            if key != query and compatible(key, query):
+                return key, score
+        return None
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+
+query_index = TrigramIndex()
@@ -0,0 +1,181 @@
+"""Event-loop lag monitor and slow-callback detector.
+
+A heartbeat task sleeps ``LOOP_MONITOR_INTERVAL_MS`` at a time. It measures
+how late each wake-up is, and that delay is the loop lag. A watchdog thread
+checks the heartbeat. Once it has been overdue for ``LOOP_SLOW_CALLBACK_MS``,
+the loop is stuck in one callback, for example pdfkit, a sync DB call or a
+large ``json.loads``. The watchdog then samples the loop thread's stack and
+notes which request was running. ``LoopMonitorMiddleware`` records that
+request for each task. When the loop wakes, the stall is complete. It is
+printed as one JSON line and kept for ``GET /api/admin/runtime/loop``.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_SLOW_CALLBACK_MS = float(os.getenv("LOOP_SLOW_CALLBACK_MS", "200"))
+LOOP_MONITOR_HISTORY = int(os.getenv("LOOP_MONITOR_HISTORY", "50"))
+STACK_DEPTH = 20
+LAG_SAMPLES = 600  # one minute of heartbeats at the default interval
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    # The router adds the endpoint to the scope once it has matched; prefer it
+    # over the raw path so /api/po/1 and /api/po/2 count as one route
+    endpoint = scope.get("endpoint")
+    target = f"{endpoint.__module__}.{endpoint.__qualname__}" if endpoint else scope.get("path", "")
+    return f"{scope.get('method', '')} {target}".strip()
+
+
+class LoopMonitor:
+    """Loop lag statistics plus the most recent slow callbacks."""
+
+    def __init__(
+        self,
+        interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+        slow_ms: float = LOOP_SLOW_CALLBACK_MS,
+        history: int = LOOP_MONITOR_HISTORY,
+    ):
+        self.interval = interval_ms / 1000
+        self.slow = slow_ms / 1000
+        self.lags: Deque[float] = deque(maxlen=LAG_SAMPLES)
+        self.slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        self.max_lag = 0.0
+        self._requests: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._last_tick = time.monotonic()
+        self._stall: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def track(self, task: asyncio.Task, scope: Dict[str, Any]) -> None:
+        self._requests[task] = scope
+
+    def untrack(self, task: asyncio.Task) -> None:
+        self._requests.pop(task, None)
+
+    def _active_route(self) -> Tuple[str, Optional[str]]:
+        task = asyncio.current_task(self._loop)
+        if task is None:
+            return "loop callback", None
+        scope = self._requests.get(task)
+        if scope is None:
+            return f"task {task.get_name()}", None
+        return _route_label(scope), scope.get("path")
+
+    def check(self) -> None:
+        """Watchdog step: sample the loop thread if the heartbeat is overdue."""
+        with self._lock:
+            if self._thread_id is None or self._stall is not None:
+                return
+            overdue = time.monotonic() - self._last_tick - self.interval
+            if overdue < self.slow:
+                return
+            frame = sys._current_frames().get(self._thread_id)
+            stack = traceback.extract_stack(frame)[-STACK_DEPTH:] if frame is not None else []
+            route, path = self._active_route()
+            self._stall = {
+                "at": datetime.utcnow().isoformat(),
+                "route": route,
+                "path": path,
+                "stack": [f"{f.filename}:{f.lineno} in {f.name}" for f in stack],
+            }
+
+    def _watch(self, stop: threading.Event) -> None:
+        while not stop.wait(self.slow / 2):
+            try:
+                self.check()
+            except Exception as exc:
+                print(f"Loop monitor check failed: {exc}")
+
+    def tick(self, lag: float) -> None:
+        """Heartbeat step: record the lag and close any stall in progress."""
+        with self._lock:
+            self._last_tick = time.monotonic()
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            stall, self._stall = self._stall, None
+            if stall is None:
+                return
+            stall["lag_ms"] = round(lag * 1000, 1)
+            self.slow_callbacks.append(stall)
+            totals = self.routes.setdefault(stall["route"], {"stalls": 0, "total_lag_ms": 0.0, "max_lag_ms": 0.0})
+            totals["stalls"] += 1
+            totals["total_lag_ms"] += stall["lag_ms"]
+            totals["max_lag_ms"] = max(totals["max_lag_ms"], stall["lag_ms"])
+        print(json.dumps({"event": "slow_callback", **stall}), flush=True)
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            self._thread_id = threading.get_ident()
+            self._last_tick = time.monotonic()
+        stop = threading.Event()
+        watchdog = threading.Thread(target=self._watch, args=(stop,), name="loop-monitor", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                expected = time.monotonic() + self.interval
+                await asyncio.sleep(self.interval)
+                self.tick(max(0.0, time.monotonic() - expected))
+        finally:
+            stop.set()
+            watchdog.join(timeout=1)
+            with self._lock:
+                self._thread_id = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lags = list(self.lags)
+            return {
+                "interval_ms": self.interval * 1000,
+                "slow_callback_ms": self.slow * 1000,
+                "current_lag_ms": round(lags[-1] * 1000, 1) if lags else 0.0,
+                "p50_lag_ms": round(_percentile(lags, 0.5) * 1000, 1),
+                "p99_lag_ms": round(_percentile(lags, 0.99) * 1000, 1),
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+                "slow_callbacks": list(self.slow_callbacks),
+                "routes": {route: dict(totals) for route, totals in self.routes.items()},
+            }
+
+
+class LoopMonitorMiddleware:
+    """Remembers which request each task is serving, for stall attribution.
+
+    A plain ASGI middleware, so async endpoints run in the same task it sees.
+    """
+
+    def __init__(self, app, monitor: Optional[LoopMonitor] = None):
+        self.app = app
+        self.monitor = monitor or loop_monitor
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.monitor.track(task, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.untrack(task)
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,136 @@
+"""Group the same product listed by different vendors.
+
+Two items are linked when they share a manufacturer part number in their
+SKU, or when their title token sets are close (Jaccard) and carry the same
+model-number tokens. Candidate pairs come from MinHash signatures bucketed
+by LSH bands, so only items sharing a bucket are ever compared and cost
+stays near-linear for BOM-sized batches.
+"""
+import hashlib
+import os
+import random
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .pricing import item_amount
+from .query_canon import tokenize_query
+
+MATCH_THRESHOLD = float(os.getenv("PRODUCT_MATCH_THRESHOLD", "0.6"))
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 4 rows per band: pairs around 0.5 Jaccard usually share a bucket
+
+# Words that vary between vendor titles without changing the product
+STOPWORDS = frozenset({"for", "with", "and", "the", "of", "in", "to", "a", "new", "original", "genuine", "pcs", "pc"})
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20261019)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(MINHASH_PERMUTATIONS)]
+_SKU_RE = re.compile(r"[^A-Z0-9]")
+
+
+def title_tokens(title: str) -> FrozenSet[str]:
+    return frozenset(t for t in tokenize_query(title) if t not in STOPWORDS)
+
+
+def _model_tokens(tokens: FrozenSet[str]) -> FrozenSet[str]:
+    return frozenset(t for t in tokens if any(c.isdigit() for c in t))
+
+
+def part_number(sku: Optional[str]) -> str:
+    """Normalized SKU when it looks like a manufacturer part number, else ''.
+
+    Plain numeric SKUs are vendor-internal ids and never match across vendors.
+    """
+    normalized = _SKU_RE.sub("", (sku or "").upper())
+    if len(normalized) < 4 or normalized.isdigit() or normalized.isalpha():
+        return ""
+    return normalized
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=16384)
+def minhash(tokens: FrozenSet[str]) -> Tuple[int, ...]:
+    hashes = [_token_hash(t) for t in tokens]
+    if not hashes:
+        return ()
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        self.parent[self.find(a)] = self.find(b)
+
+
+def match_groups(items: List[Dict], threshold: float = MATCH_THRESHOLD) -> List[List[int]]:
+    """Indexes of items that are the same product, for groups of two or more."""
+    sets = _DisjointSet(len(items))
+    tokens = [title_tokens(item.get("title", "")) for item in items]
+    models = [_model_tokens(toks) for toks in tokens]
+
+    by_part: Dict[str, int] = {}
+    for i, item in enumerate(items):
+        part = part_number(item.get("sku"))
+        if part:
+            if part in by_part:
+                sets.union(i, by_part[part])
+            else:
+                by_part[part] = i
+
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    # Items can only match with identical model tokens, so those key the buckets too
+    buckets: Dict[Tuple, List[int]] = defaultdict(list)
+    for i, toks in enumerate(tokens):
+        signature = minhash(toks)
+        for band in range(LSH_BANDS if signature else 0):
+            buckets[models[i], band, signature[band * rows:(band + 1) * rows]].append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                if (i, j) in checked or sets.find(i) == sets.find(j):
+                    continue
+                checked.add((i, j))
+                if jaccard(tokens[i], tokens[j]) >= threshold:
+                    sets.union(i, j)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(items)):
+        groups[sets.find(i)].append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def group_items(items: List[Dict]) -> List[Dict]:
+    """Tag items with ``group`` and mark the cheapest of each group ``best_in_group``.
+
+    Group ids follow the order of each group's first item; ungrouped items
+    get no group.
+    """
+    for item in items:
+        item.pop("group", None)
+        item.pop("best_in_group", None)
+    for group_id, members in enumerate(sorted(match_groups(items), key=min)):
+        priced = [i for i in members if item_amount(items[i]) is not None]
+        best = min(priced, key=lambda i: item_amount(items[i])) if priced else None
+        for i in members:
+            items[i]["group"] = group_id
+            items[i]["best_in_group"] = i == best
+    return items
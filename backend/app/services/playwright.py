@@ -13,6 +13,8 @@ from playwright.async_api import (
     TimeoutError as PlaywrightTimeoutError,
 )
 
+from .pricing import with_structured_price
+
 
 def _env_bool(name: str, default: bool) -> bool:
     raw = os.getenv(name)
@@ -200,7 +202,8 @@ class PlaywrightService:
                         })
                     if cleaned:
                         fetched_at = await page.evaluate("() => new Date().toISOString()")
-                        return {"items": cleaned[:limit], "fetched_at": fetched_at, "note": "Evelta DOM extraction"}
+                        items = [with_structured_price(i) for i in cleaned[:limit]]
+                        return {"items": items, "fetched_at": fetched_at, "note": "Evelta DOM extraction"}
 
             selectors = adapter["selectors"]
             # Wait for at least one item to appear
@@ -397,6 +400,9 @@ class PlaywrightService:
                         if m:
                             price_text = m.group(0) + gst_note
 
+                    # Struck-through list price, when the card shows one
+                    mrp_text = await safe_text(item, selectors["mrp"]) if selectors.get("mrp") else ""
+
                     availability = await safe_text(item, selectors.get("availability", ""))
                     if not availability:
                         # Some buttons expose data-available flags
@@ -464,14 +470,17 @@ class PlaywrightService:
                     image_url = urljoin(adapter["base_url"], image_url)
 
                     results.append(
-                        {
-                            "title": title,
-                            "price_text": price_text,
-                            "availability": availability,
-                            "url": url,
-                            "source": source_key or adapter["name"].lower().replace(".", ""),
-                            "image_url": image_url,
-                        }
+                        with_structured_price(
+                            {
+                                "title": title,
+                                "price_text": price_text,
+                                "availability": availability,
+                                "url": url,
+                                "source": source_key or adapter["name"].lower().replace(".", ""),
+                                "image_url": image_url,
+                            },
+                            mrp_text,
+                        )
                     )
                 
                 # If we still need more items, scroll and try again
@@ -802,7 +811,7 @@ class PlaywrightService:
                 ]
 
             # Trim to limit (already deduplicated in extraction loop)
-            results = results[:limit]
+            results = [with_structured_price(item) for item in results[:limit]]
 
             fetched_at = await page.evaluate("() => new Date().toISOString()")
             return {"items": results, "fetched_at": fetched_at}
@@ -1017,7 +1026,7 @@ class PlaywrightService:
                     return result;
                 }""")
             
-            return item_data
+            return with_structured_price(item_data)
             
         finally:
             await page.close()
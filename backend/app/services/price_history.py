@@ -0,0 +1,136 @@
+"""Price history: raw change points for recent days, daily rollups before that.
+
+``record_items`` only writes an observation when a product's price or stock
+changes, so a price holds from one observation to the next. Once raw points
+are older than ``PRICE_HISTORY_RAW_DAYS`` they are folded into one
+``PriceDaily`` row per product per day and deleted.
+"""
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, delete, func, select
+
+from ..models.catalog import PriceDaily, PriceObservation
+
+PRICE_HISTORY_RAW_DAYS = int(os.getenv("PRICE_HISTORY_RAW_DAYS", "30"))
+ROLLUP_BATCH_PRODUCTS = 200
+
+
+def _merge(row: PriceDaily, price: Optional[float]) -> None:
+    if price is None:
+        return
+    row.min_price = price if row.min_price is None else min(row.min_price, price)
+    row.max_price = price if row.max_price is None else max(row.max_price, price)
+
+
+def _carried_prices(session: Session, product_ids: List[int], before: date) -> Dict[int, Optional[float]]:
+    """Last rolled-up price per product before ``before``."""
+    latest = (
+        select(PriceDaily.product_id, func.max(PriceDaily.day).label("day"))
+        .where(PriceDaily.product_id.in_(product_ids), PriceDaily.day < before)
+        .group_by(PriceDaily.product_id)
+        .subquery()
+    )
+    rows = session.exec(
+        select(PriceDaily.product_id, PriceDaily.last_price).join(
+            latest,
+            (PriceDaily.product_id == latest.c.product_id) & (PriceDaily.day == latest.c.day),
+        )
+    ).all()
+    return dict(rows)
+
+
+def rollup_price_history(
+    session: Session,
+    now: Optional[datetime] = None,
+    raw_days: int = PRICE_HISTORY_RAW_DAYS,
+) -> int:
+    """Fold raw observations older than ``raw_days`` into daily rows; returns points folded."""
+    cutoff = datetime.combine((now or datetime.utcnow()).date() - timedelta(days=raw_days), time.min)
+    folded = 0
+    while True:
+        product_ids = session.exec(
+            select(PriceObservation.product_id)
+            .where(PriceObservation.observed_at < cutoff)
+            .distinct()
+            .limit(ROLLUP_BATCH_PRODUCTS)
+        ).all()
+        if not product_ids:
+            return folded
+        observations = session.exec(
+            select(PriceObservation)
+            .where(PriceObservation.product_id.in_(product_ids), PriceObservation.observed_at < cutoff)
+            .order_by(PriceObservation.product_id, PriceObservation.observed_at)
+        ).all()
+        first_day = min(o.observed_at.date() for o in observations)
+        carried = _carried_prices(session, product_ids, first_day)
+
+        days: Dict[Tuple[int, date], PriceDaily] = {}
+        for obs in observations:
+            key = (obs.product_id, obs.observed_at.date())
+            row = days.get(key)
+            if row is None:
+                row = session.get(PriceDaily, key) or PriceDaily(product_id=key[0], day=key[1])
+                # The price carried in from the previous change held at midnight too
+                _merge(row, carried.get(obs.product_id))
+                days[key] = row
+            _merge(row, obs.price)
+            row.last_price = obs.price
+            row.last_availability = obs.availability
+            row.changes += 1
+            carried[obs.product_id] = obs.price
+
+        session.add_all(days.values())
+        session.exec(delete(PriceObservation).where(PriceObservation.id.in_([o.id for o in observations])))
+        session.commit()
+        folded += len(observations)
+
+
+@dataclass
+class PriceHistory:
+    opening_price: Optional[float] = None
+    daily: List[PriceDaily] = field(default_factory=list)
+    points: List[PriceObservation] = field(default_factory=list)
+
+
+def price_history(session: Session, product_id: int, start: datetime, end: datetime) -> PriceHistory:
+    """Daily rollups and raw change points for a product between ``start`` and ``end``.
+
+    ``opening_price`` is the price in effect at ``start``, so a chart can
+    draw the first segment before the first point in range.
+    """
+    history = PriceHistory()
+    history.daily = session.exec(
+        select(PriceDaily)
+        .where(PriceDaily.product_id == product_id, PriceDaily.day >= start.date(), PriceDaily.day <= end.date())
+        .order_by(PriceDaily.day)
+    ).all()
+    history.points = session.exec(
+        select(PriceObservation)
+        .where(
+            PriceObservation.product_id == product_id,
+            PriceObservation.observed_at >= start,
+            PriceObservation.observed_at <= end,
+        )
+        .order_by(PriceObservation.observed_at)
+    ).all()
+
+    # Raw points are always newer than rollups, so check them first
+    before = session.exec(
+        select(PriceObservation)
+        .where(PriceObservation.product_id == product_id, PriceObservation.observed_at < start)
+        .order_by(PriceObservation.observed_at.desc())
+        .limit(1)
+    ).first()
+    if before is not None:
+        history.opening_price = before.price
+    else:
+        history.opening_price = session.exec(
+            select(PriceDaily.last_price)
+            .where(PriceDaily.product_id == product_id, PriceDaily.day < start.date())
+            .order_by(PriceDaily.day.desc())
+            .limit(1)
+        ).first()
+    return history
@@ -0,0 +1,71 @@
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Optional
+
+_AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)")
+_INCL_TAX_RE = re.compile(r"(?i)\binc(?:l(?:\.|usive|uding)?|\.)?\s*(?:of\s*)?(?:gst|tax)")
+_EXCL_TAX_RE = re.compile(r"(?i)(?:\bexcl(?:\.|usive|uding)?\s*(?:of\s*)?|\+\s*)(?:gst|tax)")
+_CURRENCIES = {"₹": "INR", "rs": "INR", "inr": "INR", "$": "USD", "usd": "USD"}
+_CENTS = Decimal("0.01")
+
+
+def price_amount(price_text: Optional[str]) -> Optional[Decimal]:
+    """First number in a scraped price string ("₹ 1,299.00 (Incl. GST)" -> 1299.00)."""
+    match = _AMOUNT_RE.search((price_text or "").replace(",", ""))
+    if not match:
+        return None
+    try:
+        return Decimal(match.group(1)).quantize(_CENTS)
+    except InvalidOperation:
+        return None
+
+
+def _currency(price_text: str) -> str:
+    lowered = price_text.lower()
+    for marker, code in _CURRENCIES.items():
+        if marker in lowered:
+            return code
+    return "INR"  # every supported vendor prices in rupees
+
+
+def parse_price(price_text: Optional[str], mrp_text: Optional[str] = None) -> Optional[Dict]:
+    """Structured price for a scraped item, or None when there is no number.
+
+    Amounts are decimal strings so they survive the JSON item codec exactly.
+    ``mrp`` is the struck-through list price when the vendor shows one above
+    the sale price; ``tax_inclusive`` is None when the text doesn't say.
+    """
+    amount = price_amount(price_text)
+    if amount is None:
+        return None
+    mrp = price_amount(mrp_text)
+    tax_inclusive = None
+    if _INCL_TAX_RE.search(price_text):
+        tax_inclusive = True
+    elif _EXCL_TAX_RE.search(price_text):
+        tax_inclusive = False
+    return {
+        "amount": str(amount),
+        "currency": _currency(price_text),
+        "mrp": str(mrp) if mrp is not None and mrp > amount else None,
+        "tax_inclusive": tax_inclusive,
+    }
+
+
+def item_amount(item: Dict) -> Optional[Decimal]:
+    """Numeric price of a scraped item.
+
+    Uses the structured price recorded at scrape time; items cached before
+    that existed fall back to parsing ``price_text``.
+    """
+    price = item.get("price")
+    if price and price.get("amount") is not None:
+        return Decimal(price["amount"])
+    return price_amount(item.get("price_text"))
+
+
+def with_structured_price(item: Dict, mrp_text: Optional[str] = None) -> Dict:
+    """Attach ``price`` to a scraped item unless a scraper already set it."""
+    if "price" not in item:
+        item["price"] = parse_price(item.get("price_text"), mrp_text)
+    return item
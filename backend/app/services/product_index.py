@@ -0,0 +1,145 @@
+"""Full-text index over every product ever scraped.
+
+On SQLite this is an FTS5 table kept in sync with ``product`` by triggers,
+so it is maintained incrementally as ``record_items`` lands scrapes.
+On Postgres it is a GIN index over a ``tsvector`` of title and SKU, which
+the search query repeats verbatim so the planner can use it.
+"""
+import re
+from typing import List, Optional, Sequence, Union
+
+from sqlalchemy import bindparam, literal_column, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, and_, func, or_, select
+
+from ..models.catalog import Product
+
+_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS product_fts USING fts5(
+        title, sku, content='product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_fts(rowid, title, sku) VALUES (new.id, new.title, new.sku);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, title, sku) VALUES ('delete', old.id, old.title, old.sku);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_au AFTER UPDATE OF title, sku ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, title, sku) VALUES ('delete', old.id, old.title, old.sku);
+        INSERT INTO product_fts(rowid, title, sku) VALUES (new.id, new.title, new.sku);
+    END""",
+]
+
+# Must stay identical to the expression in the ix_product_search migration
+PG_DOCUMENT = "to_tsvector('simple', title || ' ' || sku)"
+_PG_INDEX_DDL = f"CREATE INDEX IF NOT EXISTS ix_product_search ON product USING gin (({PG_DOCUMENT}))"
+
+_WORD_RE = re.compile(r"\w+")
+_PG_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _uses_fts(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def _uses_tsvector(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def _create_index(conn: Connection) -> None:
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_fts'")
+    ).first()
+    for ddl in _FTS_DDL:
+        conn.execute(text(ddl))
+    if not exists:
+        conn.execute(text("INSERT INTO product_fts(product_fts) VALUES ('rebuild')"))
+
+
+def _create_pg_index(conn: Connection) -> None:
+    conn.execute(text(_PG_INDEX_DDL))
+
+
+def ensure_product_index(bind: Union[Engine, Connection]) -> None:
+    """Create the FTS table and triggers, backfilling when first created.
+
+    On Postgres this creates the GIN index instead.
+    """
+    if _uses_tsvector(bind):
+        create = _create_pg_index
+    elif _uses_fts(bind):
+        create = _create_index
+    else:
+        return
+    if isinstance(bind, Connection):
+        create(bind)
+        return
+    with bind.begin() as conn:
+        create(conn)
+
+
+def _fts_query(query: str) -> str:
+    # Every word must match, as a prefix; quoting keeps FTS syntax out of user input
+    return " ".join(f'"{word}"*' for word in _WORD_RE.findall(query.lower()))
+
+
+def _ts_query(query: str) -> str:
+    # Words are letters and digits only, so nothing in them is tsquery syntax
+    return " & ".join(f"{word}:*" for word in _PG_WORD_RE.findall(query.lower()))
+
+
+def _fts_search(session: Session, query: str, limit: int, sources: Optional[Sequence[str]]) -> List[int]:
+    sql = "SELECT product_fts.rowid FROM product_fts"
+    if sources:
+        sql += " JOIN product ON product.id = product_fts.rowid"
+    sql += " WHERE product_fts MATCH :q"
+    if sources:
+        sql += " AND product.source IN :sources"
+    stmt = text(sql + " ORDER BY bm25(product_fts) LIMIT :limit").bindparams(q=_fts_query(query), limit=limit)
+    if sources:
+        stmt = stmt.bindparams(bindparam("sources", value=list(sources), expanding=True))
+    return [row[0] for row in session.exec(stmt).all()]
+
+
+def tsvector_search(query: str, limit: int, sources: Optional[Sequence[str]] = None):
+    """Postgres statement matching every word as a prefix, best rank first."""
+    document = literal_column(PG_DOCUMENT)
+    ts_query = func.to_tsquery(literal_column("'simple'::regconfig"), _ts_query(query))
+    stmt = select(Product).where(document.op("@@")(ts_query))
+    if sources:
+        stmt = stmt.where(Product.source.in_(sources))
+    return stmt.order_by(func.ts_rank(document, ts_query).desc(), Product.last_seen_at.desc()).limit(limit)
+
+
+def search_local(
+    session: Session, query: str, limit: int = 20, sources: Optional[Sequence[str]] = None
+) -> List[Product]:
+    """Products matching every word of ``query``, best match first.
+
+    ``sources`` restricts the match to those marketplaces before the limit.
+    """
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return []
+    bind = session.get_bind()
+    if _uses_fts(bind):
+        ids = _fts_search(session, query, limit, sources)
+        if not ids:
+            return []
+        products = {p.id: p for p in session.exec(select(Product).where(Product.id.in_(ids))).all()}
+        return [products[i] for i in ids if i in products]
+    if _uses_tsvector(bind):
+        if not _ts_query(query):
+            return []
+        return session.exec(tsvector_search(query, limit, sources)).all()
+
+    conditions = [
+        or_(func.lower(Product.title).contains(word), func.lower(Product.sku).contains(word))
+        for word in words
+    ]
+    stmt = select(Product).where(and_(*conditions))
+    if sources:
+        stmt = stmt.where(Product.source.in_(sources))
+    stmt = stmt.order_by(Product.last_seen_at.desc()).limit(limit)
+    return session.exec(stmt).all()
@@ -0,0 +1,121 @@
+"""Query canonicalization for cache keys.
+
+Different spellings of the same search should map to one key, so
+"10K Ohm resistor", "10k ohm  resistor" and "resistor 10kohm" all become
+"10kohm resistor".
+"""
+import re
+import unicodedata
+from typing import List
+
+# SI prefixes in output order; "meg" avoids clashing with milli once lowercased
+_PREFIX_EXP = {"p": -12, "n": -9, "u": -6, "m": -3, "": 0, "k": 3, "meg": 6, "g": 9}
+_INPUT_PREFIX = {"p": "p", "n": "n", "u": "u", "\u00b5": "u", "\u03bc": "u", "m": "m", "k": "k", "K": "k", "M": "meg", "G": "g"}
+
+# Units whose values are rescaled to a canonical SI prefix
+_SI_UNITS = {
+    "ohm": "ohm", "ohms": "ohm", "\u03c9": "ohm", "r": "ohm",
+    "v": "v", "volt": "v", "volts": "v", "vdc": "v",
+    "a": "a", "amp": "a", "amps": "a",
+    "f": "f", "farad": "f", "farads": "f",
+    "w": "w", "watt": "w", "watts": "w",
+    "hz": "hz",
+}
+# Units kept as written (prefix is part of how the unit is quoted)
+_ATOMIC_UNITS = {"mah": "mah", "mm": "mm", "cm": "cm", "rpm": "rpm"}
+
+ALIASES = {
+    "resistors": "resistor",
+    "resistance": "resistor",
+    "capacitors": "capacitor",
+    "cap": "capacitor",
+    "caps": "capacitor",
+    "leds": "led",
+    "sensors": "sensor",
+    "modules": "module",
+    "motors": "motor",
+    "servos": "servo",
+    "boards": "board",
+    "batteries": "battery",
+    "batt": "battery",
+    "rpi": "raspberrypi",
+}
+# Multi-word names folded into one token before splitting
+PHRASE_ALIASES = {
+    "raspberry pi": "raspberrypi",
+    "node mcu": "nodemcu",
+    "lithium ion": "liion",
+    "li ion": "liion",
+}
+_PHRASE_RE = re.compile(r"\b(" + "|".join(re.escape(p) for p in PHRASE_ALIASES) + r")\b")
+
+# A minus only counts as a sign at the start of a word: "-5v", not "dc-5v"
+_VALUE_RE = re.compile(
+    r"(?<![\w./])((?:(?<!\S)-)?\d+(?:\.\d+|/[1-9]\d*)?)\s*"
+    r"(?:(?i:(mah|mm|cm|rpm))"
+    r"|([pnu\u00b5\u03bcmkKMG])?\s*(?i:(ohms?|\u03a9|r|volts?|vdc|v|amps?|a|farads?|f|watts?|w|hz))?)"
+    r"(?!\w)"
+)
+# "/" between two digits is a fraction ("1/4"), so it is not a joiner
+_JOINER_RE = re.compile(r"(?<=[a-z0-9])[-_](?=[a-z0-9])|(?<=[a-z0-9])/(?=[a-z])|(?<=[a-z])/(?=\d)")
+# Symbols that change what is searched for survive: "c++", "c#", "10%", "1/4", "-5"
+_PUNCT_RE = re.compile(
+    r"[^\w\s.+#%/-]+|(?<![\w+#])[+#]+|(?<!\d)%|(?<!\d)/|/(?!\d)|(?<!\d)\.|\.(?!\d)|(?<=\S)-|-(?!\d)"
+)
+# A phrase is a balanced pair: the inch mark in '1.3" oled' cannot open one
+_QUOTED_RE = re.compile(r'(?<!\S)"([^"]+)"(?!\w)')
+
+
+def _number(text: str) -> float:
+    numerator, _, denominator = text.partition("/")
+    return float(numerator) / float(denominator or 1)
+
+
+def _format_value(number: str, prefix: str, unit: str) -> str:
+    value = _number(number) * 10 ** _PREFIX_EXP[prefix]
+    if value == 0:
+        return f"0{unit}"
+    best = ""
+    for name, exp in sorted(_PREFIX_EXP.items(), key=lambda p: p[1]):
+        if abs(value) >= 10 ** exp:
+            best = name
+    mantissa = value / 10 ** _PREFIX_EXP[best]
+    return f"{round(mantissa, 6):g}{best}{unit}"
+
+
+def _normalize_value(match: "re.Match[str]") -> str:
+    number, atomic, prefix, unit = match.groups()
+    if atomic:
+        return f" {_number(number):g}{_ATOMIC_UNITS[atomic.lower()]} "
+    if not unit:
+        # No unit to anchor the prefix: "1000m" may be metres, so don't rescale
+        return match.group(0) if not prefix else f" {_number(number):g}{_INPUT_PREFIX[prefix]} "
+    unit_name = _SI_UNITS.get((unit or "").lower(), "")
+    prefix = _INPUT_PREFIX.get(prefix or "", "")
+    if unit_name == "hz" and prefix == "m":
+        prefix = "meg"  # nobody shops for millihertz; "16mhz" means 16 MHz
+    return " " + _format_value(number, prefix, unit_name) + " "
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Canonical tokens of a query, in their original order."""
+    # NFKC folds the ohm sign to Greek omega and the micro sign to Greek mu
+    text = unicodedata.normalize("NFKC", query or "")
+    text = _VALUE_RE.sub(_normalize_value, text)
+    text = text.lower()
+    text = _JOINER_RE.sub("", text)
+    text = _PUNCT_RE.sub(" ", text)
+    text = _PHRASE_RE.sub(lambda m: PHRASE_ALIASES[m.group(1)], " ".join(text.split()))
+    return [ALIASES.get(tok, tok) for tok in text.split()]
+
+
+def canonicalize_query(query: str) -> str:
+    """Canonical cache key for a search query.
+
+    The query is a bag of words and sorted, except that a quoted phrase
+    keeps its word order and sorts as one unit.
+    """
+    text = query or ""
+    units = [" ".join(tokenize_query(m.group(1))) for m in _QUOTED_RE.finditer(text)]
+    units = [unit for unit in units if unit] + tokenize_query(_QUOTED_RE.sub(" ", text))
+    return " ".join(sorted(units))
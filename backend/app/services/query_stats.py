@@ -0,0 +1,136 @@
+"""Query popularity kept up to date on write.
+
+``QueryStats.hotness`` uses forward decay: each search adds
+2^((t - EPOCH) / half-life), stored as log2 of the running sum. The
+decayed count at time ``now`` is 2^(hotness - units(now)), and because the
+subtracted term is the same for every row, ``ORDER BY hotness`` ranks by
+decayed popularity without recomputing anything.
+"""
+import math
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, delete, select
+
+from ..models.search import QueryStats, QueryStatsUser, SearchQueryLog
+from .query_canon import canonicalize_query
+
+HALF_LIFE_DAYS = float(os.getenv("QUERY_POPULARITY_HALF_LIFE_DAYS", "7"))
+EPOCH = datetime(2024, 1, 1)
+BACKFILL_BATCH = 1000
+
+
+def decay_units(at: datetime) -> float:
+    return (at - EPOCH).total_seconds() / (HALF_LIFE_DAYS * 86400)
+
+
+def _log2_add(a: float, b: float) -> float:
+    """log2(2^a + 2^b) without overflowing."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def decayed_count(stats: QueryStats, now: Optional[datetime] = None) -> float:
+    """Searches for this query, each weighted by half-lives elapsed since."""
+    if not stats.total_count:
+        return 0.0
+    return 2 ** (stats.hotness - decay_units(now or datetime.utcnow()))
+
+
+def _apply(
+    stats: QueryStats,
+    text: str,
+    result_id: Optional[int],
+    at: datetime,
+) -> None:
+    x = decay_units(at)
+    stats.hotness = x if not stats.total_count else _log2_add(stats.hotness, x)
+    stats.total_count += 1
+    if at >= stats.last_searched_at:
+        stats.display_text = text
+        stats.last_searched_at = at
+        if result_id is not None:
+            stats.latest_result_id = result_id
+    stats.updated_at = datetime.utcnow()
+
+
+def record_query(
+    session: Session,
+    user_id: int,
+    text: str,
+    result_id: Optional[int],
+    at: Optional[datetime] = None,
+) -> Optional[QueryStats]:
+    """Upsert the stats row for one search; the caller commits."""
+    text = text.strip()
+    key = canonicalize_query(text)
+    if not key:
+        return None
+    at = at or datetime.utcnow()
+    stats = session.get(QueryStats, key)
+    if stats is None:
+        stats = QueryStats(query_normalized=key, display_text=text, last_searched_at=at)
+    _apply(stats, text, result_id, at)
+    if session.get(QueryStatsUser, (key, user_id)) is None:
+        session.add(QueryStatsUser(query_normalized=key, user_id=user_id))
+        stats.distinct_users += 1
+    session.add(stats)
+    return stats
+
+
+def backfill_query_stats(session: Session) -> int:
+    """Rebuild QueryStats from the full SearchQueryLog; returns queries written."""
+    session.exec(delete(QueryStatsUser))
+    session.exec(delete(QueryStats))
+    stats: Dict[str, QueryStats] = {}
+    users: set = set()
+    last_id = 0
+    while True:
+        logs = session.exec(
+            select(SearchQueryLog)
+            .where(SearchQueryLog.id > last_id)
+            .order_by(SearchQueryLog.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not logs:
+            break
+        last_id = logs[-1].id
+        for log in logs:
+            text = log.query_text.strip()
+            key = canonicalize_query(text)
+            if not key:
+                continue
+            row = stats.get(key)
+            if row is None:
+                row = stats[key] = QueryStats(
+                    query_normalized=key, display_text=text, last_searched_at=log.searched_at
+                )
+            _apply(row, text, log.search_result_id, log.searched_at)
+            if (key, log.user_id) not in users:
+                users.add((key, log.user_id))
+                row.distinct_users += 1
+    session.add_all(stats.values())
+    session.add_all(QueryStatsUser(query_normalized=k, user_id=u) for k, u in users)
+    session.commit()
+    return len(stats)
+
+
+def popular_queries(
+    session: Session,
+    limit: int = 50,
+    prefix: Optional[str] = None,
+    order: str = "hot",
+) -> List[QueryStats]:
+    """Top queries by decayed popularity ("hot"), all-time count or recency."""
+    column = {
+        "hot": QueryStats.hotness,
+        "count": QueryStats.total_count,
+        "recent": QueryStats.last_searched_at,
+    }[order]
+    stmt = select(QueryStats)
+    if prefix:
+        key = canonicalize_query(prefix)
+        escaped = key.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_")
+        stmt = stmt.where(QueryStats.query_normalized.like(f"{escaped}%", escape="\\"))
+    return session.exec(stmt.order_by(column.desc()).limit(limit)).all()
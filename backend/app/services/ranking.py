@@ -0,0 +1,103 @@
+"""Relevance ranking for aggregated vendor results.
+
+Items are scored with BM25 over title tokens, blended with how cheap they
+are relative to the cheapest relevant item, and the top ``k`` are picked
+with a heap instead of sorting everything. Titles and queries go through
+the same tokenizer as cache keys, so "10K Ohm" in a title matches "10kohm".
+"""
+import heapq
+import math
+import os
+import threading
+from collections import Counter
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from .pricing import item_amount
+from .query_canon import tokenize_query
+
+RELEVANCE_WEIGHT = float(os.getenv("SEARCH_RANK_RELEVANCE_WEIGHT", "0.7"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class TokenStats:
+    """Document frequencies of title tokens across the product catalog."""
+
+    def __init__(self):
+        self._df: Counter = Counter()
+        self._total_length = 0
+        self.documents = 0
+        self._lock = threading.Lock()
+
+    def add(self, title: str) -> None:
+        tokens = tokenize_query(title)
+        with self._lock:
+            self._df.update(set(tokens))
+            self._total_length += len(tokens)
+            self.documents += 1
+
+    def idf(self, token: str) -> float:
+        df = self._df.get(token, 0)
+        return math.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / self.documents if self.documents else 0.0
+
+    def __len__(self) -> int:
+        return self.documents
+
+
+token_stats = TokenStats()
+
+
+def bm25(query_tokens: List[str], title_tokens: List[str], stats: TokenStats) -> float:
+    if not title_tokens:
+        return 0.0
+    counts = Counter(title_tokens)
+    norm = 1 - BM25_B + BM25_B * len(title_tokens) / (stats.average_length or len(title_tokens))
+    score = 0.0
+    for token in set(query_tokens):
+        tf = counts.get(token, 0)
+        if tf:
+            score += stats.idf(token) * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+    return score
+
+
+def top_k(
+    query: str,
+    vendor_lists: Iterable[List[Dict]],
+    limit: int,
+    stats: Optional[TokenStats] = None,
+) -> List[Dict]:
+    """Best ``limit`` items across vendor lists, most relevant and cheapest first.
+
+    Falls back to statistics over the items themselves while the catalog
+    is still empty.
+    """
+    items = [item for items in vendor_lists for item in items]
+    if not items:
+        return []
+    titles = [tokenize_query(item.get("title", "")) for item in items]
+    if stats is None or not len(stats):
+        stats = TokenStats()
+        for item in items:
+            stats.add(item.get("title", ""))
+
+    query_tokens = tokenize_query(query)
+    relevance = [bm25(query_tokens, tokens, stats) for tokens in titles]
+    best = max(relevance) or 1.0
+    prices = [item_amount(item) for item in items]
+    # Cheapness is relative to the cheapest item that matches the query at all
+    relevant_prices = [p for p, r in zip(prices, relevance) if p and r > 0] or [p for p in prices if p]
+    floor = min(relevant_prices) if relevant_prices else None
+
+    def score(i: int):
+        price = prices[i]
+        cheapness = float(floor / price) if floor and price else 0.0
+        blended = RELEVANCE_WEIGHT * relevance[i] / best + (1 - RELEVANCE_WEIGHT) * cheapness
+        # Ties go to the cheaper item, then to vendor order
+        return blended, -(price if price is not None else Decimal("Infinity")), -i
+
+    return [items[i] for i in heapq.nlargest(limit, range(len(items)), key=score)]
@@ -0,0 +1,169 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ..db.codec import load_items
+from ..models.search import SearchResult
+from ..schemas.marketplace import MarketplaceItem, MarketplaceSearchResponse
+from .cache_policy import parse_sources
+
+COMPRESS_RESPONSES = os.getenv("SEARCH_CACHE_COMPRESS", "true").lower() in {"1", "true", "yes", "on"}
+
+
+def render_cached_response(
+    items: List[Dict],
+    fetched_at: datetime,
+    note: Optional[str],
+) -> Tuple[bytes, Optional[str], str]:
+    """Serialize the response a fresh cache hit returns.
+
+    Returns ``(body, content_encoding, etag)``; the body is gzipped unless
+    ``SEARCH_CACHE_COMPRESS`` is off.
+    """
+    raw = MarketplaceSearchResponse(
+        items=items,
+        fetched_at=fetched_at.isoformat(),
+        note=note or "From cache",
+        from_cache=True,
+    ).model_dump_json().encode("utf-8")
+    etag = '"' + hashlib.sha1(raw).hexdigest() + '"'
+    if COMPRESS_RESPONSES:
+        return gzip.compress(raw, compresslevel=6), "gzip", etag
+    return raw, None, etag
+
+
+def decoded_body(body: bytes, encoding: Optional[str]) -> bytes:
+    return gzip.decompress(body) if encoding == "gzip" else body
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` header allows ``encoding``.
+
+    A coding listed with ``q=0`` is refused; ``*`` covers codings not named.
+    """
+    wildcard = None
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == encoding:
+            return q > 0
+        if coding == "*":
+            wildcard = q > 0
+    return bool(wildcard)
+
+
+def encoding_etag(etag: str, encoding: Optional[str]) -> str:
+    """The entity tag for one encoding of a body; gzip and identity must differ."""
+    if not etag or not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``If-None-Match`` against ``etag``, as RFC 9110 asks."""
+    if not etag or not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+@dataclass
+class CachedSearch:
+    """A decoded search cache row, ready to put in a response."""
+    result_id: int
+    items: List[MarketplaceItem]
+    fetched_at: datetime
+    expires_at: datetime
+    note: Optional[str]
+    missing_sources: List[str]
+    body: bytes = b""
+    body_encoding: Optional[str] = None
+    etag: str = ""
+
+    @classmethod
+    def from_row(cls, sr: SearchResult) -> "CachedSearch":
+        raw_items = load_items(sr.items_blob, sr.items_json)
+        body, encoding, etag = sr.response_body, sr.response_encoding, sr.response_etag
+        if body is None:
+            # Rows written before responses were pre-serialized
+            body, encoding, etag = render_cached_response(raw_items, sr.fetched_at, sr.note)
+        return cls(
+            result_id=sr.id,
+            items=[MarketplaceItem.model_validate(i) for i in raw_items],
+            fetched_at=sr.fetched_at,
+            expires_at=sr.expires_at,
+            note=sr.note,
+            missing_sources=parse_sources(sr.missing_sources),
+            body=body,
+            body_encoding=encoding,
+            etag=etag or "",
+        )
+
+
+class ResultCache:
+    """Size-bounded LRU of decoded search results keyed by normalized query.
+
+    Lives in process memory, so each worker has its own copy; writes to
+    ``SearchResult`` must call ``invalidate`` for the affected key. Also
+    counts background refreshes of stale hits that failed.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedSearch]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+
+    def get(self, key: str) -> Optional[CachedSearch]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedSearch) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def record_refresh_failure(self) -> None:
+        with self._lock:
+            self.refresh_failures += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+result_cache = ResultCache(max_entries=int(os.getenv("SEARCH_LRU_SIZE", "256")))
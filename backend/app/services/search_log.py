@@ -0,0 +1,185 @@
+"""Write-behind logging of user searches.
+
+Search handlers queue a ``LoggedSearch`` and return; a background task
+writes queued history, query-log and popularity rows in one transaction
+every ``SEARCH_LOG_FLUSH_SECONDS`` or as soon as a batch fills, so search
+responses never wait on a commit. When the queue is full, new entries are
+dropped and counted, so an overload never puts commits back on the event
+loop. Without a running flusher, entries are written immediately. That
+happens on a worker thread when called from the event loop, and inline
+otherwise (tests, scripts).
+"""
+import asyncio
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from ..db.session import get_engine
+from ..models.search import SearchQueryLog, UserSearchHistory
+from .query_stats import record_query
+
+FLUSH_SECONDS = float(os.getenv("SEARCH_LOG_FLUSH_SECONDS", "1"))
+BATCH_SIZE = int(os.getenv("SEARCH_LOG_BATCH_SIZE", "200"))
+MAX_PENDING = int(os.getenv("SEARCH_LOG_MAX_PENDING", "5000"))
+SHUTDOWN_SECONDS = float(os.getenv("SEARCH_LOG_SHUTDOWN_SECONDS", "5"))
+
+
+@dataclass
+class LoggedSearch:
+    user_id: int
+    query: str
+    search_result_id: int
+    searched_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def write_search_logs(session: Session, entries: List[LoggedSearch]) -> None:
+    """Insert history, query-log and popularity rows for ``entries``; the caller commits."""
+    for entry in entries:
+        session.add(UserSearchHistory(
+            user_id=entry.user_id,
+            search_result_id=entry.search_result_id,
+            query_text=entry.query.strip(),
+            searched_at=entry.searched_at,
+        ))
+        session.add(SearchQueryLog(
+            user_id=entry.user_id,
+            query_text=entry.query.strip(),
+            search_result_id=entry.search_result_id,
+            searched_at=entry.searched_at,
+        ))
+        record_query(session, entry.user_id, entry.query, entry.search_result_id, at=entry.searched_at)
+
+
+class SearchLogWriter:
+    """Queue of searches waiting to be written, flushed in batches."""
+
+    def __init__(self, batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING):
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: List[LoggedSearch] = []
+        self._pending_users: Counter = Counter()
+        self._lock = threading.Lock()
+        # One flush at a time keeps QueryStats upserts from racing each other
+        self._write_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def submit(self, entry: LoggedSearch) -> None:
+        with self._lock:
+            running = self.running
+            if running:
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    return
+                self._pending.append(entry)
+                self._pending_users[entry.user_id] += 1
+                full = len(self._pending) >= self.batch_size
+        if running:
+            if full:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write([entry])
+            return
+        # Called from the loop with no flusher (startup, shutdown): keep the commit off it
+        loop.run_in_executor(None, self._write_or_drop, [entry])
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def pending_for(self, user_id: int) -> bool:
+        """Whether any of ``user_id``'s searches are still queued."""
+        return self._pending_users[user_id] > 0
+
+    def _write(self, entries: List[LoggedSearch]) -> None:
+        with self._write_lock, Session(get_engine()) as session:
+            write_search_logs(session, entries)
+            session.commit()
+        self.written += len(entries)
+
+    def _write_or_drop(self, entries: List[LoggedSearch]) -> None:
+        try:
+            self._write(entries)
+        except Exception as exc:
+            with self._lock:
+                self.dropped += len(entries)
+            print(f"Search log write failed: {exc}")
+
+    def flush(self) -> int:
+        """Write everything queued so far in one transaction; returns rows logged.
+
+        A failed batch goes back to the front of the queue while there is room.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._pending_users.clear()
+        return self._write_batch(batch)
+
+    def flush_user(self, user_id: int) -> int:
+        """Write only ``user_id``'s queued searches, leaving everyone else's batched."""
+        with self._lock:
+            if not self._pending_users[user_id]:
+                return 0
+            batch = [entry for entry in self._pending if entry.user_id == user_id]
+            self._pending = [entry for entry in self._pending if entry.user_id != user_id]
+            del self._pending_users[user_id]
+        return self._write_batch(batch)
+
+    def _write_batch(self, batch: List[LoggedSearch]) -> int:
+        if not batch:
+            return 0
+        try:
+            self._write(batch)
+        except Exception:
+            with self._lock:
+                room = max(self.max_pending - len(self._pending), 0)
+                kept = batch[-room:] if room else []
+                self._pending[:0] = kept
+                self._pending_users.update(entry.user_id for entry in kept)
+                self.dropped += len(batch) - len(kept)
+            raise
+        return len(batch)
+
+    async def run(self, interval: float = FLUSH_SECONDS) -> None:
+        """Flush periodically off the event loop until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as exc:
+                    print(f"Search log flush failed: {exc}")
+        finally:
+            self._loop = None
+            self._wakeup = None
+
+    async def drain(self, timeout: float = SHUTDOWN_SECONDS) -> None:
+        """Write what is left on shutdown, giving up after ``timeout`` seconds."""
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self.flush), timeout)
+        except asyncio.TimeoutError:
+            print(f"Search log flush timed out; {self.pending()} searches not logged")
+        except Exception as exc:
+            print(f"Search log flush failed on shutdown: {exc}; {self.pending()} searches not logged")
+
+
+search_log = SearchLogWriter()
@@ -0,0 +1,122 @@
+"""In-memory search suggestions.
+
+Every logged query is kept once per canonical key with its popularity and
+the expiry of its newest cached result. A bigram/trigram index over the
+query texts answers substring lookups without touching the database, so
+suggestions cost the same however long the query log grows.
+"""
+import heapq
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlmodel import Session, func, select
+
+from ..models.search import QueryStats, SearchResult
+from .query_canon import canonicalize_query
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+@dataclass
+class Suggestion:
+    key: str
+    texts: Counter = field(default_factory=Counter)  # raw spellings users typed
+    count: int = 0
+    expires_at: Optional[datetime] = None
+    searchable: Set[str] = field(default_factory=set)  # lowercased key and spellings
+
+    @property
+    def text(self) -> str:
+        return self.texts.most_common(1)[0][0] if self.texts else self.key
+
+    def is_fresh(self, now: datetime) -> bool:
+        return self.expires_at is not None and self.expires_at > now
+
+
+class SuggestionIndex:
+    """Substring index over logged queries, ranked by search count."""
+
+    def __init__(self):
+        self._entries: Dict[str, Suggestion] = {}
+        # Kept apart from entries: a result can be cached before its query is logged
+        self._expiries: Dict[str, datetime] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _index(self, entry: Suggestion, text: str) -> None:
+        if text in entry.searchable:
+            return
+        entry.searchable.add(text)
+        for gram in _grams(text, 2) | _grams(text, 3):
+            self._postings[gram].add(entry.key)
+
+    def record(self, text: str, count: int = 1) -> None:
+        """Count ``count`` searches for ``text``."""
+        text = text.strip()
+        key = canonicalize_query(text)
+        if not key:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = Suggestion(key=key, expires_at=self._expiries.get(key))
+                self._index(entry, key)
+            entry.texts[text] += count
+            entry.count += count
+            self._index(entry, text.lower())
+
+    def set_expiry(self, key: str, expires_at: datetime) -> None:
+        """Track the newest cached result for a query key."""
+        with self._lock:
+            self._expiries[key] = expires_at
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = expires_at
+
+    def suggest(self, q: str, limit: int = 5) -> List[Suggestion]:
+        """Most searched queries containing ``q``, case-insensitively."""
+        q = q.strip().lower()
+        if len(q) < 2:
+            return []
+        n = 3 if len(q) >= 3 else 2
+        with self._lock:
+            postings = [self._postings.get(gram, set()) for gram in _grams(q, n)]
+            if not all(postings):
+                return []
+            candidates = set.intersection(*sorted(postings, key=len))
+            matches = [
+                self._entries[key] for key in candidates
+                if any(q in text for text in self._entries[key].searchable)
+            ]
+        return heapq.nlargest(limit, matches, key=lambda e: (e.count, e.key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._expiries.clear()
+            self._postings.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+suggestion_index = SuggestionIndex()
+
+
+def build_suggestion_index(session: Session) -> int:
+    """Load query popularity from QueryStats and cache expiries in two queries."""
+    suggestion_index.clear()
+    expiries = session.exec(
+        select(SearchResult.query_normalized, func.max(SearchResult.expires_at))
+        .group_by(SearchResult.query_normalized)
+    ).all()
+    for key, expires_at in expiries:
+        suggestion_index.set_expiry(key, expires_at)
+    for text, count in session.exec(select(QueryStats.display_text, QueryStats.total_count)).all():
+        suggestion_index.record(text, count=count)
+    return len(suggestion_index)
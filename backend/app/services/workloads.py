@@ -0,0 +1,107 @@
+"""Separate bounded executors per kind of blocking work.
+
+Sync endpoints would otherwise all share AnyIO's default threadpool, and
+CPU-heavy steps would run on the event loop. Each workload instead gets its
+own pool, so one kind cannot starve the others:
+
+- ``db_workload``: sync endpoints that mostly wait on the database
+- ``cpu_workload``: PDF rendering, result ranking, large payload decoding
+- password hashing runs on its own process pool (``auth.password_pool``)
+
+Endpoints declare their pool with ``@runs_on(...)`` under the route
+decorator. Each pool holds at most ``max_queue`` waiting jobs; past that it
+raises ``WorkloadBusy``, which the app answers with 503. The shared
+dependencies (``get_session``, ``get_current_user``) are async and do their
+blocking work on ``db_workload``, so no request touches AnyIO's threadpool.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+DB_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "16"))
+DB_MAX_QUEUE = int(os.getenv("DB_EXECUTOR_MAX_QUEUE", "200"))
+CPU_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+CPU_MAX_QUEUE = int(os.getenv("CPU_EXECUTOR_MAX_QUEUE", "50"))
+
+
+class WorkloadBusy(Exception):
+    """A workload's queue is full."""
+
+    def __init__(self, workload: str):
+        super().__init__(f"{workload} executor is busy")
+        self.workload = workload
+
+
+class Workload:
+    """A named thread pool that counts queued, running and rejected jobs."""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` on this pool; raises ``WorkloadBusy`` if the queue is full."""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise WorkloadBusy(self.name)
+            self.queued += 1
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, self._call, fn, args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "workers": self.workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "max_queue": self.max_queue,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+db_workload = Workload("db", DB_WORKERS, DB_MAX_QUEUE)
+cpu_workload = Workload("cpu", CPU_WORKERS, CPU_MAX_QUEUE)
+WORKLOADS: List[Workload] = [db_workload, cpu_workload]
+
+
+def runs_on(workload: Workload) -> Callable:
+    """Run a sync endpoint on ``workload`` instead of the shared threadpool.
+
+    The wrapper keeps the endpoint's signature, so FastAPI still resolves
+    its parameters and dependencies.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def endpoint(*args, **kwargs):
+            return await workload.run(fn, *args, **kwargs)
+        return endpoint
+    return decorator
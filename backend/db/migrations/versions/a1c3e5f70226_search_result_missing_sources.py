@@ -0,0 +1,26 @@
+"""Track missing vendors on cached search results
+
+Revision ID: a1c3e5f70226
+Revises: f84faff94d62
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70226'
+down_revision: Union[str, None] = 'f84faff94d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('searchresult', sa.Column('missing_sources', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('searchresult', 'missing_sources')
@@ -0,0 +1,34 @@
+"""Add a GIN full-text index over catalog products on Postgres
+
+Revision ID: a6c8e0f2b035
+Revises: d4f6b8c0e036
+Create Date: 2026-10-20 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c8e0f2b035'
+down_revision: Union[str, None] = 'd4f6b8c0e036'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite already has product_fts; the expression must match PG_DOCUMENT in product_index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_product_search ON product "
+        "USING gin ((to_tsvector('simple', title || ' ' || sku)))"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS ix_product_search')
@@ -0,0 +1,37 @@
+"""Add catalog crawl state table
+
+Revision ID: a6c8e0f2b036
+Revises: f3b5d7e9a035
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c8e0f2b036'
+down_revision: Union[str, None] = 'f3b5d7e9a035'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'crawlstate',
+        sa.Column('source', sa.String(), primary_key=True),
+        sa.Column('cursor', sa.String(), nullable=False, server_default=''),
+        sa.Column('high_water', sa.DateTime(), nullable=True),
+        sa.Column('run_high_water', sa.DateTime(), nullable=True),
+        sa.Column('run_started_at', sa.DateTime(), nullable=True),
+        sa.Column('last_completed_at', sa.DateTime(), nullable=True),
+        sa.Column('products_recorded', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.String(), nullable=False, server_default=''),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('crawlstate')
@@ -0,0 +1,31 @@
+"""Store pre-serialized cache-hit responses on search results
+
+Revision ID: b7d2f4a90329
+Revises: a1c3e5f70226
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4a90329'
+down_revision: Union[str, None] = 'a1c3e5f70226'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep NULL and are rendered lazily on first cache hit
+    op.add_column('searchresult', sa.Column('response_body', sa.LargeBinary(), nullable=True))
+    op.add_column('searchresult', sa.Column('response_encoding', sa.String(), nullable=True))
+    op.add_column('searchresult', sa.Column('response_etag', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('searchresult', 'response_etag')
+    op.drop_column('searchresult', 'response_encoding')
+    op.drop_column('searchresult', 'response_body')
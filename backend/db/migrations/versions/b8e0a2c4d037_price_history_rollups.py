@@ -0,0 +1,52 @@
+"""Add daily price rollups and drop unchanged price observations
+
+Revision ID: b8e0a2c4d037
+Revises: a6c8e0f2b036
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e0a2c4d037'
+down_revision: Union[str, None] = 'a6c8e0f2b036'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pricedaily',
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('product.id'), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('min_price', sa.Float(), nullable=True),
+        sa.Column('max_price', sa.Float(), nullable=True),
+        sa.Column('last_price', sa.Float(), nullable=True),
+        sa.Column('last_availability', sa.String(), nullable=False, server_default=''),
+        sa.Column('changes', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    # Observations are now delta-encoded: keep only rows where something changed
+    op.execute(
+        """
+        DELETE FROM priceobservation WHERE id IN (
+            SELECT id FROM (
+                SELECT id, price_text, availability,
+                       LAG(price_text) OVER w AS prev_text,
+                       LAG(availability) OVER w AS prev_availability,
+                       ROW_NUMBER() OVER w AS n
+                FROM priceobservation
+                WINDOW w AS (PARTITION BY product_id ORDER BY observed_at, id)
+            ) ranked
+            WHERE n > 1 AND price_text = prev_text AND availability = prev_availability
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('pricedaily')
@@ -0,0 +1,37 @@
+"""Add structured price columns to product
+
+Revision ID: c0a2c4e6f038
+Revises: b8e0a2c4d037
+Create Date: 2026-10-19 17:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0a2c4e6f038'
+down_revision: Union[str, None] = 'b8e0a2c4d037'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('product') as batch_op:
+        batch_op.add_column(sa.Column('currency', sa.String(), nullable=False, server_default='INR'))
+        batch_op.add_column(sa.Column('mrp', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('tax_inclusive', sa.Boolean(), nullable=True))
+    # Vendors mark GST-inclusive prices in the text; set the flag for existing rows
+    op.execute(
+        "UPDATE product SET tax_inclusive = TRUE "
+        "WHERE lower(latest_price_text) LIKE '%incl%gst%'"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('product') as batch_op:
+        batch_op.drop_column('tax_inclusive')
+        batch_op.drop_column('mrp')
+        batch_op.drop_column('currency')
@@ -0,0 +1,29 @@
+"""Keep the text a user typed on each history row
+
+Revision ID: c2e4a6b8d032
+Revises: a7e9b1d3e047
+Create Date: 2026-10-20 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e4a6b8d032'
+down_revision: Union[str, None] = 'a7e9b1d3e047'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL; history falls back to QueryStats.display_text
+    with op.batch_alter_table('usersearchhistory') as batch_op:
+        batch_op.add_column(sa.Column('query_text', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('usersearchhistory') as batch_op:
+        batch_op.drop_column('query_text')
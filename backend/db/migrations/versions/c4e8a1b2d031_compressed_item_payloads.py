@@ -0,0 +1,100 @@
+"""Store item payloads in the compact codec
+
+Revision ID: c4e8a1b2d031
+Revises: b7d2f4a90329
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+import json
+import time
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1b2d031'
+down_revision: Union[str, None] = 'b7d2f4a90329'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('searchresult', 'purchase_orders')
+BATCH_SIZE = 500
+
+
+# A frozen copy of the 0x01 codec, so this migration never follows app.db.codec
+FORMAT_JSON_ZLIB = 0x01
+
+
+def encode_items(items) -> bytes:
+    raw = json.dumps(items, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return bytes([FORMAT_JSON_ZLIB]) + zlib.compress(raw, 6)
+
+
+def decode_items(blob: bytes):
+    if blob[0] != FORMAT_JSON_ZLIB:
+        raise ValueError(f'Unknown item payload format: {blob[0]}')
+    return json.loads(zlib.decompress(blob[1:]))
+
+
+def _rewrite(table: str) -> None:
+    conn = op.get_bind()
+    rows_t = sa.table(table, sa.column('id'), sa.column('items_json'), sa.column('items_blob'))
+    before = after = count = 0
+    encode_s = decode_s = 0.0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(rows_t.c.id, rows_t.c.items_json)
+            .where(rows_t.c.id > last_id, rows_t.c.items_blob.is_(None))
+            .order_by(rows_t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row_id, items_json in rows:
+            items = json.loads(items_json) if items_json else []
+            t0 = time.perf_counter()
+            blob = encode_items(items)
+            t1 = time.perf_counter()
+            decode_items(blob)
+            t2 = time.perf_counter()
+            encode_s += t1 - t0
+            decode_s += t2 - t1
+            before += len((items_json or '').encode('utf-8'))
+            after += len(blob)
+            count += 1
+            conn.execute(
+                rows_t.update().where(rows_t.c.id == row_id).values(items_blob=blob, items_json='')
+            )
+            last_id = row_id
+    if count:
+        print(
+            f"{table}: {count} rows, {before} -> {after} bytes "
+            f"({after / max(before, 1):.0%}), encode {encode_s * 1000:.1f} ms, "
+            f"decode {decode_s * 1000:.1f} ms"
+        )
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('items_blob', sa.LargeBinary(), nullable=True))
+    for table in TABLES:
+        _rewrite(table)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table in TABLES:
+        rows_t = sa.table(table, sa.column('id'), sa.column('items_json'), sa.column('items_blob'))
+        for row_id, blob in conn.execute(
+            sa.select(rows_t.c.id, rows_t.c.items_blob).where(rows_t.c.items_blob.is_not(None))
+        ).all():
+            conn.execute(
+                rows_t.update()
+                .where(rows_t.c.id == row_id)
+                .values(items_json=json.dumps(decode_items(blob)))
+            )
+        op.drop_column(table, 'items_blob')
@@ -0,0 +1,55 @@
+"""Add query popularity tables and backfill them from the search log
+
+Revision ID: d1b3d5f7a042
+Revises: c0a2c4e6f038
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlmodel import Session
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1b3d5f7a042'
+down_revision: Union[str, None] = 'c0a2c4e6f038'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from app.services.query_stats import backfill_query_stats
+
+    op.create_table(
+        'querystats',
+        sa.Column('query_normalized', sa.String(), primary_key=True),
+        sa.Column('display_text', sa.String(), nullable=False),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('distinct_users', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hotness', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('last_searched_at', sa.DateTime(), nullable=False),
+        sa.Column('latest_result_id', sa.Integer(), sa.ForeignKey('searchresult.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_querystats_hotness', 'querystats', ['hotness'])
+    op.create_index('ix_querystats_total_count', 'querystats', ['total_count'])
+    op.create_index('ix_querystats_last_searched_at', 'querystats', ['last_searched_at'])
+    op.create_table(
+        'querystatsuser',
+        sa.Column('query_normalized', sa.String(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'), primary_key=True),
+    )
+
+    written = backfill_query_stats(Session(bind=op.get_bind()))
+    print(f"Backfilled popularity for {written} queries")
+
+
+def downgrade() -> None:
+    op.drop_table('querystatsuser')
+    op.drop_index('ix_querystats_last_searched_at', table_name='querystats')
+    op.drop_index('ix_querystats_total_count', table_name='querystats')
+    op.drop_index('ix_querystats_hotness', table_name='querystats')
+    op.drop_table('querystats')
@@ -0,0 +1,28 @@
+"""Remember sitemap pages a catalog crawl failed to fetch
+
+Revision ID: d4f6b8c0e036
+Revises: c2e4a6b8d032
+Create Date: 2026-10-20 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c0e036'
+down_revision: Union[str, None] = 'c2e4a6b8d032'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('crawlstate') as batch_op:
+        batch_op.add_column(sa.Column('failed_urls', sa.String(), nullable=False, server_default=''))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('crawlstate') as batch_op:
+        batch_op.drop_column('failed_urls')
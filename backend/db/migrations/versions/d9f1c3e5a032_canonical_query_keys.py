@@ -0,0 +1,40 @@
+"""Backfill canonical search cache keys
+
+Revision ID: d9f1c3e5a032
+Revises: c4e8a1b2d031
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.query_canon import canonicalize_query
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1c3e5a032'
+down_revision: Union[str, None] = 'c4e8a1b2d031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows that now share a key are merged by the cache maintenance job
+    conn = op.get_bind()
+    results = sa.table('searchresult', sa.column('query_normalized'))
+    keys = conn.execute(sa.select(results.c.query_normalized).distinct()).scalars().all()
+    for key in keys:
+        canonical = canonicalize_query(key)
+        if canonical != key:
+            conn.execute(
+                results.update()
+                .where(results.c.query_normalized == key)
+                .values(query_normalized=canonical)
+            )
+
+
+def downgrade() -> None:
+    # Original spellings are not recoverable; canonical keys still work as plain text
+    pass
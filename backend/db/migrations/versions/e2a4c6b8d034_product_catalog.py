@@ -0,0 +1,71 @@
+"""Add product catalog and price observation tables
+
+Revision ID: e2a4c6b8d034
+Revises: d9f1c3e5a032
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c6b8d034'
+down_revision: Union[str, None] = 'd9f1c3e5a032'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('canonical_url', sa.String(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('sku', sa.String(), nullable=False, server_default=''),
+        sa.Column('image_url', sa.String(), nullable=False, server_default=''),
+        sa.Column('availability', sa.String(), nullable=False, server_default=''),
+        sa.Column('latest_price_text', sa.String(), nullable=False, server_default=''),
+        sa.Column('latest_price', sa.Float(), nullable=True),
+        sa.Column('first_seen_at', sa.DateTime(), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_product_canonical_url', 'product', ['canonical_url'], unique=True)
+    op.create_index('ix_product_source', 'product', ['source'])
+    op.create_index('ix_product_sku', 'product', ['sku'])
+    op.create_index('ix_product_latest_price', 'product', ['latest_price'])
+    op.create_index('ix_product_last_seen_at', 'product', ['last_seen_at'])
+    op.create_index('ix_product_sku_latest_price', 'product', ['sku', 'latest_price'])
+
+    op.create_table(
+        'priceobservation',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('product.id'), nullable=False),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.Column('price_text', sa.String(), nullable=False, server_default=''),
+        sa.Column('availability', sa.String(), nullable=False, server_default=''),
+        sa.Column('observed_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        'ix_priceobservation_product_observed', 'priceobservation', ['product_id', 'observed_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_priceobservation_product_observed', table_name='priceobservation')
+    op.drop_table('priceobservation')
+    for name in (
+        'ix_product_sku_latest_price',
+        'ix_product_last_seen_at',
+        'ix_product_latest_price',
+        'ix_product_sku',
+        'ix_product_source',
+        'ix_product_canonical_url',
+    ):
+        op.drop_index(name, table_name='product')
+    op.drop_table('product')
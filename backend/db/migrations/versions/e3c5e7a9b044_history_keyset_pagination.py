@@ -0,0 +1,64 @@
+"""Store item counts on search results and index history per user by time
+
+Revision ID: e3c5e7a9b044
+Revises: d1b3d5f7a042
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.codec import load_items
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c5e7a9b044'
+down_revision: Union[str, None] = 'd1b3d5f7a042'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _backfill_items_count() -> None:
+    conn = op.get_bind()
+    rows_t = sa.table(
+        'searchresult',
+        sa.column('id'), sa.column('items_json'), sa.column('items_blob'), sa.column('items_count'),
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(rows_t.c.id, rows_t.c.items_blob, rows_t.c.items_json)
+            .where(rows_t.c.id > last_id)
+            .order_by(rows_t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row_id, items_blob, items_json in rows:
+            conn.execute(
+                rows_t.update()
+                .where(rows_t.c.id == row_id)
+                .values(items_count=len(load_items(items_blob, items_json)))
+            )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('searchresult') as batch_op:
+        batch_op.add_column(sa.Column('items_count', sa.Integer(), nullable=False, server_default='0'))
+    _backfill_items_count()
+    op.create_index(
+        'ix_usersearchhistory_user_searched_at', 'usersearchhistory', ['user_id', 'searched_at']
+    )
+    op.drop_index('ix_usersearchhistory_user_id', table_name='usersearchhistory')
+
+
+def downgrade() -> None:
+    op.create_index('ix_usersearchhistory_user_id', 'usersearchhistory', ['user_id'])
+    op.drop_index('ix_usersearchhistory_user_searched_at', table_name='usersearchhistory')
+    with op.batch_alter_table('searchresult') as batch_op:
+        batch_op.drop_column('items_count')
@@ -0,0 +1,33 @@
+"""Add full-text index over catalog products (SQLite FTS5)
+
+Revision ID: f3b5d7e9a035
+Revises: e2a4c6b8d034
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b5d7e9a035'
+down_revision: Union[str, None] = 'e2a4c6b8d034'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from app.services.product_index import ensure_product_index
+
+    # Other backends fall back to a plain token match and need no schema
+    ensure_product_index(op.get_bind())
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('product_fts_ai', 'product_fts_ad', 'product_fts_au'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS product_fts')
@@ -0,0 +1,85 @@
+"""Store item payloads as JSONB with GIN indexes on Postgres
+
+Revision ID: f5d7f9b1c046
+Revises: e3c5e7a9b044
+Create Date: 2026-10-19 20:00:00.000000
+"""
+
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5d7f9b1c046'
+down_revision: Union[str, None] = 'e3c5e7a9b044'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('searchresult', 'purchase_orders')
+BATCH_SIZE = 500
+
+
+# A frozen copy of the 0x01 codec, so this migration never follows app.db.codec
+FORMAT_JSON_ZLIB = 0x01
+
+
+def encode_items(items) -> bytes:
+    raw = json.dumps(items, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return bytes([FORMAT_JSON_ZLIB]) + zlib.compress(raw, 6)
+
+
+def decode_items(blob: bytes):
+    if blob[0] != FORMAT_JSON_ZLIB:
+        raise ValueError(f'Unknown item payload format: {blob[0]}')
+    return json.loads(zlib.decompress(blob[1:]))
+
+
+def _copy(table: str, source: str, target: str, target_type, convert) -> None:
+    conn = op.get_bind()
+    rows_t = sa.table(table, sa.column('id'), sa.column(source), sa.column(target, target_type))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(rows_t.c.id, rows_t.c[source])
+            .where(rows_t.c.id > last_id, rows_t.c[source].is_not(None))
+            .order_by(rows_t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row_id, value in rows:
+            conn.execute(rows_t.update().where(rows_t.c.id == row_id).values({target: convert(value)}))
+        last_id = rows[-1][0]
+
+
+def _swap(table: str, new_type, convert) -> None:
+    op.add_column(table, sa.Column('items_doc', new_type, nullable=True))
+    _copy(table, 'items_blob', 'items_doc', new_type, convert)
+    op.drop_column(table, 'items_blob')
+    op.alter_column(table, 'items_doc', new_column_name='items_blob')
+
+
+def upgrade() -> None:
+    # SQLite keeps the compressed codec blobs; nothing changes there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        _swap(table, postgresql.JSONB(), lambda blob: decode_items(bytes(blob)))
+        op.create_index(
+            f'ix_{table}_items_blob', table, ['items_blob'],
+            postgresql_using='gin', postgresql_ops={'items_blob': 'jsonb_path_ops'},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_items_blob', table_name=table)
+        # JSONB comes back as a list (or its JSON text, depending on the driver)
+        _swap(table, sa.LargeBinary(), lambda doc: encode_items(json.loads(doc) if isinstance(doc, str) else doc))
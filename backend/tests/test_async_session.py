@@ -0,0 +1,46 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import session as db_session
+from app.models import User
+
+
+def test_async_url_swaps_in_the_async_driver(monkeypatch):
+    for url, expected in [
+        ("sqlite:///./estima.db", "sqlite+aiosqlite:///./estima.db"),
+        ("postgresql://u:p@db/estima", "postgresql+asyncpg://u:p@db/estima"),
+        ("postgresql+asyncpg://u:p@db/estima", "postgresql+asyncpg://u:p@db/estima"),
+    ]:
+        monkeypatch.setattr(db_session, "get_database_url", lambda: url)
+        db_session.get_async_database_url.cache_clear()
+        assert db_session.get_async_database_url() == expected
+    db_session.get_async_database_url.cache_clear()
+
+
+def test_async_session_runs_sync_helpers(tmp_path):
+    path = tmp_path / "async.db"
+    SQLModel.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    def add_user(session, name):
+        session.add(User(username=name, email=f"{name}@x", hashed_password="x"))
+        session.commit()
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await session.run_sync(add_user, "a")
+            users = (await session.exec(select(User))).all()
+        await engine.dispose()
+        return [u.username for u in users]
+
+    assert asyncio.run(scenario()) == ["a"]
+
+
+def test_sqlite_connections_get_wal_and_busy_timeout(tmp_path):
+    engine = db_session.configure_engine(create_engine(f"sqlite:///{tmp_path / 'wal.db'}"))
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == db_session.SQLITE_BUSY_TIMEOUT_MS
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.auth import dependencies
+from app.auth.security import create_access_token
+from app.auth.user_cache import AuthCache
+from app.models import User
+
+
+def _user(version: int = 0, **fields) -> User:
+    return User(id=1, username="a", email="a@x", hashed_password="x", version=version, **fields)
+
+
+def test_entries_expire_and_the_cache_stays_bounded():
+    cache = AuthCache(ttl=30, max_entries=2)
+    cache.put_token("t1", 1, token_expires_at=time.time() - 1)  # token already expired
+    assert cache.user_id_for("t1") is None
+    for token, user_id in [("a", 1), ("b", 2), ("c", 3)]:
+        cache.put_token(token, user_id, None)
+    assert [cache.user_id_for(t) for t in "abc"] == [None, 2, 3]
+
+
+def test_invalidation_blocks_stale_copies_from_coming_back():
+    cache = AuthCache(ttl=30)
+    stale = _user(version=0)
+    cache.put_user(stale)
+    cache.invalidate_user(1, min_version=1)
+    assert cache.user(1) is None
+    cache.put_user(stale)  # a request that read the row before the update
+    assert cache.user(1) is None
+    cache.put_user(_user(version=1, is_active=False))
+    assert cache.user(1).is_active is False
+
+
+def test_hits_stay_in_memory_and_sync_picks_up_other_workers_changes(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    session.add(_user())
+    session.commit()
+    cache = AuthCache(ttl=30)
+    monkeypatch.setattr(dependencies, "auth_cache", cache)
+    monkeypatch.setattr(dependencies, "get_engine", lambda: engine)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": 1}))
+
+    assert asyncio.run(dependencies.get_current_user(credentials)).username == "a"
+    monkeypatch.setattr(dependencies, "_load_user", None)  # a hit must not reach the database
+    user = asyncio.run(dependencies.get_current_user(credentials))
+    user.username = "changed by one request"
+    assert cache.user(1).username == "a"
+
+    # Another worker deactivates the user; this one learns of it at the next sync
+    row = session.get(User, 1)
+    row.is_active, row.version = False, 1
+    session.add(row)
+    session.commit()
+    assert cache.sync(session) == 1
+    assert cache.user(1) is None
+
+
+def test_version_floors_expire_with_the_ttl():
+    cache = AuthCache(ttl=0.05, max_entries=2)
+    for user_id in (1, 2, 3):
+        cache.invalidate_user(user_id, min_version=5)
+    assert list(cache._min_version) == [2, 3]
+    time.sleep(0.06)
+    cache.invalidate_user(4, min_version=1)
+    assert list(cache._min_version) == [4]
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import SearchResult, User, UserSearchHistory
+from app.routers import marketplaces
+from app.services.cache_maintenance import (
+    _like_pattern,
+    cache_stats,
+    dedupe_search_results,
+    invalidate_results,
+    purge_expired_results,
+)
+from app.services.result_cache import CachedSearch, result_cache
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+
+def test_like_pattern():
+    assert _like_pattern("esp32*") == "esp32%"
+    assert _like_pattern("ESP") == "%esp%"
+    assert _like_pattern("10_k") == r"%10\_k%"
+
+
+def test_dedupe_repoints_history_and_purge_keeps_referenced_rows():
+    session = _session()
+    expired = datetime.utcnow() - timedelta(days=30)
+    session.add(User(username="u", email="u@x", hashed_password="x"))
+    old = SearchResult(query_normalized="esp32", items_json="[]", expires_at=expired)
+    new = SearchResult(query_normalized="esp32", items_json="[]", expires_at=expired)
+    orphan = SearchResult(query_normalized="lonely", items_json="[]", expires_at=expired)
+    session.add_all([old, new, orphan])
+    session.commit()
+    session.add(UserSearchHistory(user_id=1, search_result_id=old.id))
+    session.commit()
+
+    assert dedupe_search_results(session) == 1
+    assert session.exec(select(UserSearchHistory)).one().search_result_id == new.id
+    assert purge_expired_results(session) == 1
+    remaining = session.exec(select(SearchResult.query_normalized)).all()
+    assert remaining == ["esp32"]
+
+
+def test_dedupe_keeps_the_row_served_by_lookups_and_drops_it_from_the_lru():
+    session = _session()
+    now = datetime.utcnow()
+    complete = SearchResult(query_normalized="esp32", items_json="[]", expires_at=now + timedelta(days=7))
+    partial = SearchResult(query_normalized="esp32", items_json="[]", expires_at=now + timedelta(minutes=30))
+    session.add_all([complete, partial])
+    session.commit()
+    result_cache.put("esp32", CachedSearch(partial.id, [], now, partial.expires_at, None, []))
+
+    assert dedupe_search_results(session) == 1
+    assert session.exec(select(SearchResult.id)).all() == [complete.id]
+    assert result_cache.get("esp32") is None
+
+
+def test_invalidate_matches_patterns_against_canonical_keys():
+    session = _session()
+    soon = datetime.utcnow() + timedelta(days=1)
+    for key in ("devkit esp32", "10kohm resistor", "arduino uno"):
+        session.add(SearchResult(query_normalized=key, items_json="[]", expires_at=soon))
+    session.commit()
+
+    assert invalidate_results(session, pattern="esp*kit") == 0
+    assert invalidate_results(session, pattern="#") == 0
+    assert invalidate_results(session, pattern="esp32*") == 1
+    assert invalidate_results(session, pattern="Resistor 10K Ohm") == 1
+    assert invalidate_results(session, pattern="uno") == 1
+
+
+def test_failed_background_refresh_is_counted_in_cache_stats(monkeypatch):
+    async def vendors_down(*args):
+        raise RuntimeError("browser crashed")
+
+    monkeypatch.setattr(marketplaces, "run_vendor_searches", vendors_down)
+    session = _session()
+    before = cache_stats(session)["refresh_failures"]
+    asyncio.run(marketplaces._refresh_in_background(None, "esp32", 5, None))
+    assert cache_stats(session)["refresh_failures"] == before + 1
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from app.services.cache_policy import (
+    NEGATIVE_TTL_HOURS,
+    PARTIAL_TTL_MINUTES,
+    STALE_GRACE_HOURS,
+    compute_expiry,
+    format_sources,
+    is_stale,
+    is_vendor_failure,
+    parse_sources,
+    stale_cutoff,
+    vendor_ttl,
+)
+
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def test_partial_result_gets_short_ttl():
+    items = [{"source": "evelta", "title": "x"}]
+    expiry = compute_expiry(NOW, items, ["robu"], now=NOW)
+    assert expiry == NOW + timedelta(minutes=PARTIAL_TTL_MINUTES)
+
+
+def test_zero_hits_use_negative_ttl():
+    assert compute_expiry(NOW, [], [], now=NOW) == NOW + timedelta(hours=NEGATIVE_TTL_HOURS)
+
+
+def test_most_volatile_vendor_wins():
+    items = [{"source": "robu"}, {"source": "evelta"}]
+    expiry = compute_expiry(NOW, items, [], now=NOW)
+    assert expiry == NOW + min(vendor_ttl("robu"), vendor_ttl("evelta"))
+
+
+def test_vendor_failure_detection():
+    assert is_vendor_failure({"items": [], "note": "Timed out waiting for results; site may be slow."})
+    assert is_vendor_failure({"items": [], "note": "Robu.in failed: boom", "failed": True})
+    assert not is_vendor_failure({"items": [], "fetched_at": "now"})
+
+
+def test_sources_round_trip():
+    assert parse_sources(format_sources(["robu", "evelta", "robu"])) == ["evelta", "robu"]
+    assert format_sources([]) is None
+
+
+def test_stale_window():
+    expired = NOW - timedelta(hours=1)
+    assert is_stale(expired, now=NOW)
+    assert not is_stale(NOW + timedelta(minutes=1), now=NOW)
+    assert expired > stale_cutoff(now=NOW)
+    assert NOW - timedelta(hours=STALE_GRACE_HOURS + 1) < stale_cutoff(now=NOW)
@@ -0,0 +1,53 @@
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import PriceObservation, Product
+from app.services import catalog
+from app.services.catalog import canonical_product_url, cheapest_offers, record_items
+from app.services.ranking import TokenStats
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+
+def test_canonical_url_drops_query_and_trailing_slash():
+    assert (
+        canonical_product_url("https://Robu.in/product/esp32/?variant=1#reviews")
+        == "https://robu.in/product/esp32"
+    )
+
+
+def test_record_items_upserts_products_and_appends_observations():
+    session = _session()
+    item = {"title": "ESP32", "price_text": "₹ 450", "url": "https://robu.in/p/esp32", "source": "robu"}
+    record_items(session, [item])
+    record_items(session, [{**item, "price_text": "₹ 1,299.00", "url": item["url"] + "/?ref=x"}])
+
+    product = session.exec(select(Product)).one()
+    assert product.latest_price == 1299.0
+    assert len(session.exec(select(PriceObservation)).all()) == 2
+
+
+def test_record_items_merges_a_listing_inserted_after_its_lookup(monkeypatch):
+    session = _session()
+    item = {"title": "ESP32", "price_text": "₹ 450", "url": "https://robu.in/p/esp32", "source": "robu", "sku": "E1"}
+    record_items(session, [item])
+    # Another scrape landed the listing between this one's lookup and insert
+    monkeypatch.setattr(catalog, "_existing_products", lambda session, urls: {})
+    monkeypatch.setattr(catalog, "token_stats", stats := TokenStats())
+    assert record_items(session, [{**item, "price_text": "₹ 400", "sku": ""}]) == 1
+
+    product = session.exec(select(Product)).one()
+    assert (product.latest_price, product.sku) == (400.0, "E1")
+    assert len(stats) == 0  # not a new title
+
+
+def test_cheapest_offers_orders_by_price():
+    session = _session()
+    record_items(session, [
+        {"title": "A", "price_text": "₹ 500", "url": "https://a.com/p/x", "source": "robu", "sku": "X1"},
+        {"title": "B", "price_text": "₹ 300", "url": "https://b.com/p/x", "source": "evelta", "sku": "X1"},
+    ])
+    assert [p.source for p in cheapest_offers(session, "X1")] == ["evelta", "robu"]
@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import CrawlState, Product
+from app.services import catalog_crawler
+from app.services.catalog_crawler import CatalogCrawler, parse_sitemap, product_page_item, shopify_item
+
+
+def test_parse_sitemap_separates_children_and_entries():
+    xml = b"""<?xml version="1.0"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <url><loc>https://robu.in/product/esp32/</loc><lastmod>2026-01-02T10:00:00+05:30</lastmod></url>
+      <url><loc>https://robu.in/product/uno/</loc></url>
+    </urlset>"""
+    children, entries = parse_sitemap(xml)
+    assert children == []
+    assert entries[0][1].isoformat() == "2026-01-02T04:30:00"
+    assert entries[1] == ("https://robu.in/product/uno/", None)
+
+
+def test_product_page_item_reads_json_ld():
+    html = """<script type="application/ld+json">{"@graph": [{"@type": "Product", "name": "ESP32",
+        "sku": "E32", "offers": {"price": "449", "availability": "https://schema.org/OutOfStock"}}]}</script>"""
+    item = product_page_item(html, "https://robu.in/product/esp32", "robu")
+    assert item["price_text"] == "₹449.00"
+    assert item["availability"] == "Out of stock"
+    assert item["sku"] == "E32"
+
+
+def _shopify_product(handle, updated_at, price="100"):
+    return {"handle": handle, "title": handle.upper(), "updated_at": updated_at,
+            "variants": [{"price": price, "available": True, "sku": handle}], "images": []}
+
+
+def test_shopify_item_uses_cheapest_variant():
+    product = _shopify_product("servo", "2026-01-01T00:00:00Z")
+    product["variants"].append({"price": "80.5", "available": False})
+    assert shopify_item(product, "https://robocraze.com", "robocraze")["price_text"] == "₹80.50"
+
+
+def test_shopify_crawl_is_incremental(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crawl.db'}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(catalog_crawler, "get_engine", lambda: engine)
+    catalog = [_shopify_product("a", "2026-01-01T00:00:00Z"), _shopify_product("b", "2026-01-02T00:00:00Z")]
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={"products": catalog if page == 1 else []})
+
+    async def crawl():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await CatalogCrawler(client, delay=0).crawl("robocraze")
+
+    assert asyncio.run(crawl()) == 2
+    catalog[0] = _shopify_product("a", "2026-01-03T00:00:00Z", price="90")
+    assert asyncio.run(crawl()) == 1
+
+    with Session(engine) as session:
+        state = session.get(CrawlState, "robocraze")
+        assert state.cursor == "" and state.high_water.isoformat() == "2026-01-03T00:00:00"
+        assert len(session.exec(select(Product)).all()) == 2
+
+
+def test_sitemap_index_only_follows_product_sitemaps():
+    index = b"""<?xml version="1.0"?>
+    <sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <sitemap><loc>https://evelta.com/xmlsitemap.php?type=products&amp;page=1</loc></sitemap>
+      <sitemap><loc>https://evelta.com/xmlsitemap.php?type=categories&amp;page=1</loc></sitemap>
+      <sitemap><loc>https://evelta.com/xmlsitemap.php?type=brands&amp;page=1</loc></sitemap>
+    </sitemapindex>"""
+    products = b"""<?xml version="1.0"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <url><loc>https://evelta.com/esp32/</loc></url>
+    </urlset>"""
+    fetched = []
+
+    def handler(request):
+        fetched.append(request.url.params.get("type"))
+        return httpx.Response(200, content=products if request.url.params.get("type") else index)
+
+    async def entries():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await CatalogCrawler(client, delay=0)._sitemap_entries(
+                "https://evelta.com/xmlsitemap.php", "type=products"
+            )
+
+    assert asyncio.run(entries()) == [("https://evelta.com/esp32/", None)]
+    assert fetched == [None, "products"]
+
+
+def test_failed_sitemap_pages_are_retried_by_the_next_incremental_run(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crawl.db'}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(catalog_crawler, "get_engine", lambda: engine)
+    sitemap = b"""<?xml version="1.0"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <url><loc>https://robu.in/p/a</loc><lastmod>2026-01-02</lastmod></url>
+      <url><loc>https://robu.in/p/b</loc><lastmod>2026-01-01</lastmod></url>
+    </urlset>"""
+    down = {"/p/b"}
+
+    def handler(request):
+        if request.url.path == "/product-sitemap.xml":
+            return httpx.Response(200, content=sitemap)
+        if request.url.path in down:
+            return httpx.Response(503)
+        name = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, text=f"""<script type="application/ld+json">
+            {{"@type": "Product", "name": "{name}", "offers": {{"price": "10"}}}}</script>""")
+
+    async def crawl():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await CatalogCrawler(client, delay=0).crawl("robu")
+
+    assert asyncio.run(crawl()) == 1
+    with Session(engine) as session:
+        assert session.get(CrawlState, "robu").failed_urls == "https://robu.in/p/b"
+    down.clear()
+    assert asyncio.run(crawl()) == 1  # b is older than the high-water mark but retried
+    with Session(engine) as session:
+        assert session.get(CrawlState, "robu").failed_urls == ""
+        assert len(session.exec(select(Product)).all()) == 2
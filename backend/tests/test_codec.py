@@ -0,0 +1,46 @@
+import json
+import zlib
+
+import pytest
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.codec import FORMAT_JSON_ZLIB, ItemsPayload, decode_items, encode_items, load_items
+
+
+ITEMS = [
+    {"title": "ESP32 DevKit V1", "price_text": "₹ 450.00", "source": "robu",
+     "url": "https://robu.in/product/esp32-devkit-v1/"},
+] * 20
+
+
+def test_round_trip_and_smaller_than_json():
+    blob = encode_items(ITEMS)
+    assert blob[0] == FORMAT_JSON_ZLIB
+    assert decode_items(blob) == ITEMS
+    assert len(blob) < len(json.dumps(ITEMS))
+
+
+def test_legacy_json_text_still_loads():
+    assert load_items(None, json.dumps(ITEMS)) == ITEMS
+    assert load_items(None, "") == []
+
+
+def test_json_format_is_always_readable():
+    raw = json.dumps(ITEMS).encode("utf-8")
+    blob = bytes([FORMAT_JSON_ZLIB]) + zlib.compress(raw)
+    assert decode_items(blob) == ITEMS
+
+
+def test_unknown_version_rejected():
+    with pytest.raises(ValueError):
+        decode_items(b"\x7f" + zlib.compress(b"[]"))
+
+
+def test_items_payload_is_jsonb_on_postgres_and_a_blob_elsewhere():
+    blob = encode_items(ITEMS)
+    column = ItemsPayload()
+    assert column.process_bind_param(blob, sqlite.dialect()) == blob
+    stored = column.process_bind_param(blob, postgresql.dialect())
+    assert stored == ITEMS
+    assert load_items(stored, None) == load_items(blob, None) == ITEMS
@@ -0,0 +1,31 @@
+from app.services.fuzzy_index import TrigramIndex, compatible
+
+
+def _index(*keys: str) -> TrigramIndex:
+    index = TrigramIndex()
+    for key in keys:
+        index.add(key)
+    return index
+
+
+def test_typo_finds_cached_key():
+    index = _index("arduino uno", "arduino nano", "esp32")
+    assert index.best_match("arduino unoo", 0.7)[0] == "arduino uno"
+
+
+def test_broader_or_different_part_numbers_do_not_match():
+    index = _index("arduino uno", "esp8266")
+    assert index.best_match("arduino", 0.5) is None
+    assert index.best_match("esp8226", 0.1) is None
+
+
+def test_discard_removes_key():
+    index = _index("servo sg90")
+    index.discard("servo sg90")
+    assert index.best_match("servo sg9o", 0.1) is None
+    assert len(index) == 0
+
+
+def test_compatible():
+    assert compatible("10kohm resistor", "10kohm resistr")
+    assert not compatible("10kohm resistor", "1kohm resistor")
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import QueryStats, SearchResult, User, UserSearchHistory
+from app.routers import history
+
+# The route runs on the db executor; call the plain function underneath
+get_history = history.get_history.__wrapped__
+
+
+def test_history_pages_follow_the_cursor_without_gaps_or_repeats():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    user, other = User(username="a", email="a@x", hashed_password="x"), User(username="b", email="b@x", hashed_password="x")
+    sr = SearchResult(query_normalized="esp32", items_count=3, expires_at=datetime(2026, 1, 1))
+    session.add_all([user, other, sr])
+    session.commit()
+    start = datetime(2026, 10, 1)
+    # Pairs of searches share a timestamp so the id tiebreak is exercised
+    session.add_all(
+        UserSearchHistory(user_id=user.id, search_result_id=sr.id, searched_at=start + timedelta(minutes=i // 2))
+        for i in range(7)
+    )
+    session.add(UserSearchHistory(user_id=other.id, search_result_id=sr.id, searched_at=start))
+    session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = get_history(cursor=cursor, limit=3, user=user, session=session)
+        seen += [item.id for item in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+    assert page.items[-1].items_count == 3
+
+    with pytest.raises(HTTPException):
+        get_history(cursor="not-a-cursor", limit=3, user=user, session=session)
+
+
+def test_history_page_shape_and_equal_timestamp_order(monkeypatch):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    user = User(username="a", email="a@x", hashed_password="x")
+    sr = SearchResult(query_normalized="relay", items_count=2, note="From cache", expires_at=datetime(2026, 1, 1))
+    session.add_all([user, sr])
+    session.commit()
+    at = datetime(2026, 10, 1, 12, 30)
+    session.add_all(
+        UserSearchHistory(user_id=user.id, search_result_id=sr.id, query_text="relay", searched_at=at)
+        for _ in range(2)
+    )
+    session.commit()
+
+    def broken_flush(user_id):
+        raise RuntimeError("database is locked")
+
+    # A failed write of queued searches still serves what is committed
+    monkeypatch.setattr(history.search_log, "flush_user", broken_flush)
+    first = get_history(cursor=None, limit=1, user=user, session=session).model_dump()
+    assert first == {
+        "items": [{"id": 2, "query": "relay", "items_count": 2, "searched_at": at.isoformat(), "note": "From cache"}],
+        "next_cursor": history.encode_cursor(at, 2),
+    }
+    second = get_history(cursor=first["next_cursor"], limit=1, user=user, session=session)
+    assert [item.id for item in second.items] == [1] and second.next_cursor is None
+
+
+def test_history_shows_the_query_as_typed():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    user = User(username="a", email="a@x", hashed_password="x")
+    sr = SearchResult(query_normalized="devkit esp32", expires_at=datetime(2026, 1, 1))
+    session.add_all([user, sr, QueryStats(query_normalized="devkit esp32", display_text="esp32 devkit")])
+    session.commit()
+    session.add_all([
+        UserSearchHistory(user_id=user.id, search_result_id=sr.id, query_text="ESP32 DevKit"),
+        UserSearchHistory(user_id=user.id, search_result_id=sr.id),  # logged before query_text
+    ])
+    session.commit()
+
+    page = get_history(cursor=None, limit=10, user=user, session=session)
+    assert sorted(item.query for item in page.items) == ["ESP32 DevKit", "esp32 devkit"]
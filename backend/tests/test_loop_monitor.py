@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+from app.services.loop_monitor import LoopMonitor, LoopMonitorMiddleware
+
+
+def blocking_render():
+    time.sleep(0.3)
+
+
+def test_stall_is_attributed_to_the_route_with_its_stack():
+    monitor = LoopMonitor(interval_ms=20, slow_ms=100)
+
+    async def endpoint(scope, receive, send):
+        scope["endpoint"] = blocking_render  # as the router would add it
+        blocking_render()
+
+    async def main():
+        runner = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        app = LoopMonitorMiddleware(endpoint, monitor)
+        await app({"type": "http", "method": "GET", "path": "/api/po/1/pdf"}, None, None)
+        await asyncio.sleep(0.05)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    asyncio.run(main())
+    stats = monitor.metrics()
+    [stall] = stats["slow_callbacks"]
+    assert stall["route"] == f"GET {__name__}.blocking_render"
+    assert stall["path"] == "/api/po/1/pdf"
+    assert stall["lag_ms"] >= 200
+    assert "blocking_render" in stall["stack"][-1]
+    assert stats["routes"][stall["route"]]["stalls"] == 1
+    assert stats["max_lag_ms"] >= 200
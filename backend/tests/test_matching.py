@@ -0,0 +1,29 @@
+from app.services.matching import group_items, match_groups, part_number
+
+
+def _item(title, price, source, sku=""):
+    return {"title": title, "price_text": f"₹ {price}", "source": source, "sku": sku}
+
+
+def test_same_module_from_different_vendors_is_grouped():
+    items = [
+        _item("ESP32 DevKit V1 Development Board", 450, "robu"),
+        _item("ESP32 Development Board DevKit V1", 399, "robocraze"),
+        _item("ESP32 DevKit V4 Development Board", 520, "evelta"),
+        _item("Jumper wires for ESP32", 40, "robu"),
+    ]
+    group_items(items)
+    assert items[0]["group"] == items[1]["group"] == 0
+    assert items[1]["best_in_group"] and not items[0]["best_in_group"]
+    assert "group" not in items[2] and "group" not in items[3]
+
+
+def test_part_numbers_link_differently_titled_items():
+    items = [
+        _item("Voltage regulator 5V 1A", 20, "robu", sku="LM7805-CT"),
+        _item("Linear regulator TO-220", 18, "evelta", sku="lm7805ct"),
+        _item("Robu item", 10, "robu", sku="123456"),
+        _item("Other item", 10, "evelta", sku="123456"),
+    ]
+    assert match_groups(items) == [[0, 1]]
+    assert part_number("123456") == ""
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+import pytest
+
+from app.auth import security
+from app.auth.password_pool import LoginLimiter, PasswordHasher, PasswordPoolBusy
+
+
+def test_hashes_verify_in_the_process_pool():
+    hasher = PasswordHasher(workers=1)
+    try:
+        async def check():
+            hashed = await hasher.hash("s3cret")
+            return await hasher.verify("s3cret", hashed), await hasher.verify("wrong", hashed)
+
+        assert asyncio.run(check()) == (True, False)
+    finally:
+        hasher.shutdown()
+
+
+def test_pending_hashes_are_bounded(monkeypatch):
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    release = threading.Event()
+    executor = ThreadPoolExecutor(1)
+    monkeypatch.setattr(hasher, "_get_executor", lambda: executor)
+    monkeypatch.setattr("app.auth.password_pool.verify_password", lambda p, h: release.wait(5))
+
+    async def burst():
+        first = asyncio.ensure_future(hasher.verify("a", "h"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PasswordPoolBusy):
+            await hasher.verify("b", "h")
+        release.set()
+        return await first
+
+    assert asyncio.run(burst()) is True
+    assert hasher.pending == 0
+    executor.shutdown()
+
+
+def test_rehash_when_cost_factor_changes(monkeypatch):
+    old = bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=4)).decode()
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    assert not security.needs_rehash(old)
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+    assert security.needs_rehash(old)
+
+
+def test_login_limits_per_account_and_ip():
+    limiter = LoginLimiter(per_account=1, per_ip=2)
+    with limiter.attempt("Bob", "1.1.1.1") as first:
+        with limiter.attempt("bob ", "2.2.2.2") as same_account:
+            pass
+        with limiter.attempt("eve", "1.1.1.1") as second_on_ip:
+            with limiter.attempt("mal", "1.1.1.1") as third_on_ip:
+                pass
+    assert (first, same_account, second_on_ip, third_on_ip) == (True, False, True, False)
+    with limiter.attempt("bob", "1.1.1.1") as again:
+        assert again
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import PriceDaily, PriceObservation
+from app.services.catalog import lowest_observed_price, record_items
+from app.services.price_history import price_history, rollup_price_history
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+
+def _record(session, price_text, at):
+    record_items(session, [{"title": "ESP32", "price_text": price_text, "url": "https://robu.in/p/esp32",
+                            "source": "robu"}], observed_at=at)
+
+
+def test_only_price_changes_are_stored():
+    session = _session()
+    start = datetime(2026, 1, 1, 9)
+    for hours, price in enumerate(["₹ 450", "₹ 450", "₹ 399", "₹ 399"]):
+        _record(session, price, start + timedelta(hours=hours))
+    assert [o.price for o in session.exec(select(PriceObservation)).all()] == [450.0, 399.0]
+
+
+def test_rollup_folds_old_changes_into_daily_rows():
+    session = _session()
+    day1, day2 = datetime(2026, 1, 1, 9), datetime(2026, 1, 2, 9)
+    _record(session, "₹ 500", day1)
+    _record(session, "₹ 450", day1 + timedelta(hours=2))
+    _record(session, "₹ 480", day2)
+    _record(session, "₹ 470", datetime(2026, 3, 1))
+
+    assert rollup_price_history(session, now=datetime(2026, 3, 2), raw_days=30) == 3
+    daily = session.exec(select(PriceDaily).order_by(PriceDaily.day)).all()
+    assert [(d.min_price, d.max_price, d.last_price) for d in daily] == [(450, 500, 450), (450, 480, 480)]
+    assert lowest_observed_price(session, 1) == 450
+
+    history = price_history(session, 1, datetime(2026, 1, 2), datetime(2026, 3, 2))
+    assert history.opening_price == 450
+    assert [d.day.day for d in history.daily] == [2]
+    assert [p.price for p in history.points] == [470]
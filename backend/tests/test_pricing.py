@@ -0,0 +1,25 @@
+from decimal import Decimal
+
+from app.services.pricing import item_amount, parse_price
+
+
+def test_parse_price_structures_scraped_text():
+    assert parse_price("₹ 1,299.00 (Incl. GST)", "₹1,499") == {
+        "amount": "1299.00",
+        "currency": "INR",
+        "mrp": "1499.00",
+        "tax_inclusive": True,
+    }
+    assert parse_price("Rs. 99 + GST")["tax_inclusive"] is False
+    assert parse_price("₹ 99")["tax_inclusive"] is None
+    assert parse_price("Sold out") is None
+
+
+def test_mrp_not_above_sale_price_is_dropped():
+    assert parse_price("₹ 500", "₹ 500")["mrp"] is None
+
+
+def test_item_amount_prefers_structured_price():
+    assert item_amount({"price_text": "₹ 10", "price": {"amount": "9.50"}}) == Decimal("9.50")
+    assert item_amount({"price_text": "₹ 1,000 (Incl. GST)"}) == Decimal("1000.00")
+    assert item_amount({"price_text": ""}) is None
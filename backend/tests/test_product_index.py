@@ -0,0 +1,45 @@
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.services.catalog import record_items
+from app.services.product_index import PG_DOCUMENT, ensure_product_index, search_local, tsvector_search
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    ensure_product_index(engine)
+    return Session(engine)
+
+
+def test_search_local_matches_word_prefixes():
+    session = _session()
+    record_items(session, [
+        {"title": "ESP32 Dev Board", "url": "https://robu.in/p/esp32", "source": "robu"},
+        {"title": "Arduino Uno R3", "url": "https://robu.in/p/uno", "source": "robu"},
+    ])
+    assert [p.title for p in search_local(session, "esp dev")] == ["ESP32 Dev Board"]
+    assert search_local(session, "esp uno") == []
+
+
+def test_search_local_ignores_fts_syntax_in_query():
+    session = _session()
+    record_items(session, [{"title": "Servo SG90", "url": "https://robu.in/p/sg90", "source": "robu"}])
+    assert [p.title for p in search_local(session, 'sg90* "(-')] == ["Servo SG90"]
+
+
+def test_search_local_filters_sources_before_the_limit():
+    session = _session()
+    record_items(session, [
+        {"title": f"ESP32 Board {i}", "url": f"https://robu.in/p/esp32-{i}", "source": "robu"} for i in range(5)
+    ] + [{"title": "ESP32 Board", "url": "https://evelta.com/p/esp32", "source": "evelta"}])
+    found = search_local(session, "esp32", limit=2, sources=["evelta"])
+    assert [p.source for p in found] == ["evelta"]
+
+
+def test_postgres_search_uses_the_indexed_tsvector():
+    sql = str(tsvector_search("esp32 dev_kit", 5, ["robu"]).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert f"{PG_DOCUMENT} @@ to_tsquery('simple'::regconfig, 'esp32:* & dev:* & kit:*')" in sql
+    assert "product.source IN ('robu')" in sql
@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.query_canon import canonicalize_query
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["10K Ohm resistor", "10k ohm  resistor", "resistor 10kohm", "10 kΩ Resistors"],
+)
+def test_resistor_spellings_share_a_key(query):
+    assert canonicalize_query(query) == "10kohm resistor"
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("0.1uF capacitor", "100nF caps"),
+        ("4700 ohm", "4.7K ohm"),
+        ("2200MAH Li-Po", "lipo 2200mAh"),
+        ("5 volt relay", "5V Relay"),
+        ("Raspberry Pi 4", "rpi 4"),
+        ("HC-SR04", "hcsr04"),
+        ("16mhz crystal", "16MHz crystal"),
+        ("1/4 w resistor", "0.25W resistor"),
+    ],
+)
+def test_equivalent_queries(a, b):
+    assert canonicalize_query(a) == canonicalize_query(b)
+
+
+def test_mega_and_milli_stay_distinct():
+    assert canonicalize_query("1M ohm") != canonicalize_query("1m ohm")
+
+
+def test_quoted_queries_keep_word_order():
+    assert canonicalize_query('"uno arduino"') == "uno arduino"
+
+
+def test_model_numbers_untouched():
+    assert canonicalize_query("ESP32 DevKit V1") == "devkit esp32 v1"
+    assert canonicalize_query("16x2 LCD") == "16x2 lcd"
+
+
+@pytest.mark.parametrize("a, b", [("C++", "C"), ("C#", "C"), ("10%", "10"), ("1/4 w", "1 4w")])
+def test_meaningful_symbols_keep_queries_apart(a, b):
+    assert canonicalize_query(a) != canonicalize_query(b)
+
+
+def test_symbols_alone_leave_an_empty_key():
+    assert canonicalize_query("#") == ""
+
+
+def test_inch_marks_do_not_make_a_phrase():
+    assert canonicalize_query('1.3" oled') == canonicalize_query('oled 1.3"') == "1.3 oled"
+
+
+def test_quoted_phrase_sorts_as_one_unit():
+    assert canonicalize_query('"esp32 dev" board') == canonicalize_query('board "esp32 dev"')
+    assert canonicalize_query('"esp32 dev" board') != canonicalize_query("esp32 dev board")
+
+
+def test_bare_prefix_is_not_rescaled():
+    assert canonicalize_query("1000m cable") == "1000m cable"
+    assert canonicalize_query("1M") != canonicalize_query("1m")
+
+
+def test_leading_minus_is_kept():
+    assert canonicalize_query("-5v") == "-5v"
+    assert canonicalize_query("-5v") != canonicalize_query("5v")
+    assert canonicalize_query("dc-5v") == "5v dc"
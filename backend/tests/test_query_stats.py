@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import QueryStats, SearchQueryLog, User
+from app.services.query_stats import backfill_query_stats, decayed_count, popular_queries, record_query
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([User(username=n, email=f"{n}@x", hashed_password="x") for n in "ab"])
+    session.commit()
+    return session
+
+
+def test_record_query_upserts_counts_and_distinct_users():
+    session = _session()
+    now = datetime(2026, 10, 1)
+    for user_id, text in [(1, "ESP32 board"), (1, "board  esp32"), (2, "esp32 Board")]:
+        record_query(session, user_id, text, None, at=now)
+    session.commit()
+
+    stats = session.get(QueryStats, "board esp32")
+    assert (stats.total_count, stats.distinct_users, stats.display_text) == (3, 2, "esp32 Board")
+    assert abs(decayed_count(stats, now) - 3) < 1e-6
+
+
+def test_hot_order_prefers_recent_searches_and_backfill_matches():
+    session = _session()
+    now = datetime(2026, 10, 1)
+    old, recent = now - timedelta(days=60), now - timedelta(days=1)
+    logs = [("servo", old)] * 5 + [("relay", recent)] * 2
+    session.add_all(SearchQueryLog(user_id=1, query_text=t, searched_at=at) for t, at in logs)
+    session.commit()
+
+    assert backfill_query_stats(session) == 2
+    assert [s.query_normalized for s in popular_queries(session, order="hot")] == ["relay", "servo"]
+    assert [s.query_normalized for s in popular_queries(session, order="count")] == ["servo", "relay"]
+    assert [s.query_normalized for s in popular_queries(session, prefix="Ser")] == ["servo"]
@@ -0,0 +1,28 @@
+from app.services.ranking import TokenStats, bm25, top_k
+
+
+def _item(title, price):
+    return {"title": title, "price_text": f"₹ {price}", "source": "robu"}
+
+
+def test_relevant_items_beat_cheap_accessories():
+    items = [
+        _item("Jumper wire set for ESP32", 20),
+        _item("ESP32 Development Board", 450),
+        _item("ESP32 WROOM Development Board", 399),
+        _item("Breadboard 400 points", 60),
+    ]
+    ranked = top_k("esp32 development board", [items[:2], items[2:]], 2)
+    assert sorted(i["price_text"] for i in ranked) == ["₹ 399", "₹ 450"]
+
+
+def test_top_k_breaks_ties_on_price_and_limits():
+    items = [_item("Servo SG90", 150), _item("Servo SG90", 120), _item("Servo SG90", 130)]
+    assert [i["price_text"] for i in top_k("sg90 servo", [items], 2)] == ["₹ 120", "₹ 130"]
+
+
+def test_bm25_uses_catalog_idf():
+    stats = TokenStats()
+    for title in ["Arduino Uno", "Arduino Nano", "Arduino Mega", "Uno R3 clone"]:
+        stats.add(title)
+    assert bm25(["uno"], ["uno"], stats) > bm25(["arduino"], ["arduino"], stats)
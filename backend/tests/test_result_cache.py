@@ -0,0 +1,81 @@
+import gzip
+import json
+from datetime import datetime
+
+from starlette.requests import Request
+
+from app.routers.marketplaces import cached_search_response
+from app.services.result_cache import (
+    CachedSearch,
+    ResultCache,
+    accepts_encoding,
+    decoded_body,
+    render_cached_response,
+)
+
+
+def _entry(result_id: int) -> CachedSearch:
+    now = datetime.utcnow()
+    return CachedSearch(result_id, [], now, now, None, [])
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", _entry(1))
+    cache.put("b", _entry(2))
+    assert cache.get("a").result_id == 1
+    cache.put("c", _entry(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_invalidate_drops_entry():
+    cache = ResultCache()
+    cache.put("a", _entry(1))
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_rendered_response_round_trips():
+    items = [{"title": "ESP32", "price_text": "₹ 450", "availability": "In stock",
+              "url": "https://robu.in/p/esp32", "source": "robu"}]
+    body, encoding, etag = render_cached_response(items, datetime(2026, 1, 1), None)
+    payload = json.loads(decoded_body(body, encoding))
+    assert payload["from_cache"] is True
+    assert payload["items"][0]["title"] == "ESP32"
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_accept_encoding_honours_q_values():
+    assert accepts_encoding("gzip, deflate, br", "gzip")
+    assert accepts_encoding("GZIP;q=0.5", "gzip")
+    assert not accepts_encoding("gzip;q=0", "gzip")
+    assert not accepts_encoding("x-gzip", "gzip")
+    assert not accepts_encoding("", "gzip")
+    assert accepts_encoding("br, *", "gzip")
+    assert not accepts_encoding("*, gzip;q=0", "gzip")
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_cached_response_etag_differs_per_encoding():
+    now = datetime.utcnow()
+    raw = b'{"items": []}'
+    entry = CachedSearch(1, [], now, now, None, [], gzip.compress(raw), "gzip", '"abc"')
+
+    zipped = cached_search_response(_request(accept_encoding="gzip"), entry)
+    plain = cached_search_response(_request(accept_encoding="gzip;q=0, identity"), entry)
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers and plain.body == raw
+    assert zipped.headers["etag"] != plain.headers["etag"]
+
+    revalidated = cached_search_response(
+        _request(accept_encoding="gzip", if_none_match=f'W/{zipped.headers["etag"]}'), entry
+    )
+    assert revalidated.status_code == 304
+    mismatched = cached_search_response(_request(if_none_match=zipped.headers["etag"]), entry)
+    assert mismatched.status_code == 200 and mismatched.body == raw
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.models import QueryStats, SearchQueryLog, User, UserSearchHistory
+from app.services import search_log as search_log_module
+from app.services.search_log import LoggedSearch, SearchLogWriter
+
+
+def _engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'log.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(username="a", email="a@x", hashed_password="x"))
+        session.commit()
+    monkeypatch.setattr(search_log_module, "get_engine", lambda: engine)
+    return engine
+
+
+def _count(engine, model) -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count()).select_from(model)).one()
+
+
+def test_searches_are_batched_until_flushed_and_drained(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch)
+    writer = SearchLogWriter(batch_size=100)
+
+    async def scenario():
+        flusher = asyncio.create_task(writer.run(interval=60))
+        await asyncio.sleep(0)
+        for query in ["esp32", "ESP32", "relay"]:
+            writer.submit(LoggedSearch(user_id=1, query=query, search_result_id=1))
+        assert writer.pending() == 3
+        assert _count(engine, UserSearchHistory) == 0
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+        await writer.drain(timeout=5)
+
+    asyncio.run(scenario())
+    assert writer.pending() == 0
+    assert _count(engine, UserSearchHistory) == _count(engine, SearchQueryLog) == 3
+    with Session(engine) as session:
+        assert session.get(QueryStats, "esp32").total_count == 2
+
+
+def test_full_batch_wakes_the_flusher_and_no_flusher_writes_directly(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch)
+    writer = SearchLogWriter(batch_size=2)
+
+    async def scenario():
+        flusher = asyncio.create_task(writer.run(interval=60))
+        await asyncio.sleep(0)
+        writer.submit(LoggedSearch(user_id=1, query="servo", search_result_id=1))
+        writer.submit(LoggedSearch(user_id=1, query="servo", search_result_id=1))
+        for _ in range(100):
+            if not writer.pending():
+                break
+            await asyncio.sleep(0.01)
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert _count(engine, SearchQueryLog) == 2
+    writer.submit(LoggedSearch(user_id=1, query="servo", search_result_id=1))
+    assert _count(engine, SearchQueryLog) == 3
+
+
+def test_overload_never_writes_on_the_event_loop(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch)
+    writer = SearchLogWriter(batch_size=100, max_pending=2)
+    write_threads = []
+    write = writer._write
+    monkeypatch.setattr(writer, "_write", lambda entries: (write_threads.append(threading.get_ident()), write(entries)))
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        flusher = asyncio.create_task(writer.run(interval=60))
+        await asyncio.sleep(0)
+        for user_id in (1, 1, 1):
+            writer.submit(LoggedSearch(user_id=user_id, query="relay", search_result_id=1))
+        assert (writer.pending(), writer.dropped) == (2, 1)
+        assert writer.pending_for(1) and not writer.pending_for(2)
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+        await writer.drain(timeout=5)
+        # No flusher any more: the write goes to a thread, not the loop
+        writer.submit(LoggedSearch(user_id=1, query="relay", search_result_id=1))
+        for _ in range(100):
+            if len(write_threads) == 2:
+                break
+            await asyncio.sleep(0.01)
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+    assert not writer.pending_for(1)
+    assert loop_thread not in write_threads
+    assert _count(engine, SearchQueryLog) == 3
+
+
+def test_flush_user_writes_only_that_users_searches(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch)
+    with Session(engine) as session:
+        session.add(User(username="b", email="b@x", hashed_password="x"))
+        session.commit()
+    writer = SearchLogWriter(batch_size=100)
+
+    async def scenario():
+        flusher = asyncio.create_task(writer.run(interval=60))
+        await asyncio.sleep(0)
+        for user_id in (1, 2, 1):
+            writer.submit(LoggedSearch(user_id=user_id, query="relay", search_result_id=1))
+        assert writer.flush_user(1) == 2
+        assert writer.flush_user(1) == 0
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert writer.pending() == 1 and writer.pending_for(2) and not writer.pending_for(1)
+    assert _count(engine, SearchQueryLog) == 2
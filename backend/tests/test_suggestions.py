@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+
+from app.services.suggestions import SuggestionIndex
+
+
+def test_suggest_matches_substrings_by_popularity():
+    index = SuggestionIndex()
+    index.record("ESP32 board", count=3)
+    index.record("esp32  Board")
+    index.record("esp8266")
+    index.record("arduino uno", count=10)
+
+    top = index.suggest("SP")
+    assert [e.key for e in top] == ["board esp32", "esp8266"]
+    assert top[0].count == 4 and top[0].text == "ESP32 board"
+    assert index.suggest("no") == index.suggest("ino")[:1]
+    assert index.suggest("x") == [] and index.suggest("zzz") == []
+
+
+def test_freshness_follows_cached_results():
+    index = SuggestionIndex()
+    now = datetime.utcnow()
+    index.set_expiry("esp32", now + timedelta(hours=1))
+    index.record("esp32")
+    assert index.suggest("esp")[0].is_fresh(now)
+    index.set_expiry("esp32", now - timedelta(hours=1))
+    assert not index.suggest("esp")[0].is_fresh(now)
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.workloads import Workload, WorkloadBusy, runs_on
+
+
+def test_jobs_run_on_the_pool_and_overflow_is_rejected():
+    workload = Workload("test", workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.ensure_future(workload.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.ensure_future(workload.run(threading.current_thread))
+        await asyncio.sleep(0)
+        assert workload.metrics()["queued"] == 1 and workload.metrics()["active"] == 1
+        with pytest.raises(WorkloadBusy):
+            await workload.run(lambda: None)
+        release.set()
+        return await blocker, await waiting
+
+    done, thread = asyncio.run(scenario())
+    assert done and thread.name.startswith("test-worker")
+    assert workload.metrics() == {
+        "name": "test", "workers": 1, "queued": 0, "active": 0,
+        "completed": 2, "rejected": 1, "max_queue": 1,
+    }
+    workload.shutdown()
+
+
+def test_routed_endpoints_keep_their_parameters_and_dependencies():
+    workload = Workload("route", workers=1, max_queue=4)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    @runs_on(workload)
+    def read_item(item_id: int, q: str = "", token: str = Depends(lambda: "t")):
+        return {"item_id": item_id, "q": q, "token": token, "thread": threading.current_thread().name}
+
+    body = TestClient(app).get("/items/3?q=x").json()
+    assert body["item_id"] == 3 and body["q"] == "x" and body["token"] == "t"
+    assert body["thread"].startswith("route-worker")
+    workload.shutdown()
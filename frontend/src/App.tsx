@@ -29,6 +29,9 @@ function MainApp() {
   const [lightbox, setLightbox] = useState<{ src: string; title: string } | null>(null);
   const [history, setHistory] = useState<SearchHistoryItem[]>([]);
   const [isFromCache, setIsFromCache] = useState(false);
+  const [isStale, setIsStale] = useState(false);
+  const [matchedQuery, setMatchedQuery] = useState<string | null>(null);
+  const [isLocal, setIsLocal] = useState(false);
   const [showAdminDashboard, setShowAdminDashboard] = useState(false);
   const [selectedMarketplaces, setSelectedMarketplaces] = useState<MarketplaceName[]>(ALL_MARKETPLACES);
   const [sourceFilter, setSourceFilter] = useState<MarketplaceName | null>(null);
@@ -78,7 +81,7 @@ function MainApp() {
       });
       if (resp.ok) {
         const data = await resp.json();
-        setHistory(data.map((h: any) => ({
+        setHistory(data.items.map((h: any) => ({
           id: h.id,
           query: h.query,
           items: [],
@@ -98,33 +101,52 @@ function MainApp() {
     setError(null);
     setNote(null);
     setSourceFilter(null);
+    setIsLocal(false);
+    const request = {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Authorization: `Bearer ${token}`,
+      },
+      body: JSON.stringify({
+        query: searchQuery,
+        limit: 6,
+        marketplaces: marketplaces.length === ALL_MARKETPLACES.length ? null : marketplaces,
+      }),
+    };
+    // Show saved catalog matches right away; the live search replaces them when it lands
+    let liveDone = false;
+    fetch(`${API_BASE}/api/marketplaces/search_local`, request)
+      .then((resp) => (resp.ok ? resp.json() : null))
+      .then((data: SearchResponse | null) => {
+        if (!liveDone && data && data.items.length > 0) {
+          setResults(data.items);
+          setIsLocal(true);
+        }
+      })
+      .catch(() => {});
     try {
-      const resp = await fetch(`${API_BASE}/api/marketplaces/search_all`, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-          Authorization: `Bearer ${token}`,
-        },
-        body: JSON.stringify({
-          query: searchQuery,
-          limit: 6,
-          marketplaces: marketplaces.length === ALL_MARKETPLACES.length ? null : marketplaces,
-        }),
-      });
+      const resp = await fetch(`${API_BASE}/api/marketplaces/search_all`, request);
+      liveDone = true;
       if (!resp.ok) {
         throw new Error(`Request failed (${resp.status})`);
       }
       const data: SearchResponse = await resp.json();
       setResults(data.items);
+      setIsLocal(!!data.local);
       setNote(data.note || null);
       setIsFromCache(data.from_cache);
+      setIsStale(!!data.stale);
+      setMatchedQuery(data.matched_query || null);
 
       // Refresh history after search
       fetchHistory();
 
     } catch (err: any) {
+      liveDone = true;
       setError(err.message || "Search failed");
       setResults([]);
+      setIsLocal(false);
     } finally {
       setLoading(false);
     }
@@ -144,6 +166,8 @@ function MainApp() {
         setError(null);
         setHasSearched(true);
         setIsFromCache(true);
+        setIsStale(false);
+        setMatchedQuery(null);
         setSourceFilter(null);
       }
     } catch (e) {
@@ -158,6 +182,8 @@ function MainApp() {
     setError(null);
     setSourceFilter(null);
     setIsFromCache(false);
+    setIsStale(false);
+    setMatchedQuery(null);
     window.scrollTo({ top: 0, behavior: "smooth" });
   };
 
@@ -287,6 +313,23 @@ function MainApp() {
                 ⚡ Previous search results loaded. Use Refresh (🔄️) buttons to confirm current prices & availability.
               </p>
             )}
+            {isFromCache && isStale && (
+              <p style={{ textAlign: "center", color: "var(--color-accent)", fontSize: "0.9rem" }}>
+                These results are older than usual and are being updated in the background.
+              </p>
+            )}
+            {isLocal && (
+              <p style={{ textAlign: "center", color: "var(--color-accent)", fontSize: "0.9rem" }}>
+                {loading
+                  ? "Showing saved catalog results while live prices load."
+                  : "Marketplaces are unreachable; showing saved catalog results."}
+              </p>
+            )}
+            {matchedQuery && (
+              <p style={{ textAlign: "center", color: "var(--color-accent)", fontSize: "0.9rem" }}>
+                Showing saved results for "{matchedQuery}". Results for your exact search are being fetched.
+              </p>
+            )}
           </div>
         )}
 
@@ -102,9 +102,10 @@ info@abhyudyayatech.com`,
                 newSkus[item.url] = item.sku || "";
             }
             if (customPrices[item.url] === undefined) {
-                // Default price logic: Scraped Price / 1.18 (Base Price)
-                const scrapedPrice = parsePrice(item.price_text);
-                newPrices[item.url] = parseFloat((scrapedPrice / 1.18).toFixed(2));
+                // Default price logic: Scraped Price / 1.18 (Base Price), unless listed ex-GST
+                const scrapedPrice = item.price ? Number(item.price.amount) : parsePrice(item.price_text);
+                const base = item.price?.tax_inclusive === false ? scrapedPrice : scrapedPrice / 1.18;
+                newPrices[item.url] = parseFloat(base.toFixed(2));
             }
         });
 
@@ -38,7 +38,8 @@ export function ResultsTable({
   onSourceFilterChange,
   allResults = [],
 }: Props) {
-  const [sortAsc, setSortAsc] = useState(true);
+  // null keeps the server's relevance order
+  const [sortAsc, setSortAsc] = useState<boolean | null>(null);
   const [refreshingUrls, setRefreshingUrls] = useState<Set<string>>(new Set());
   const [localItems, setLocalItems] = useState<MarketplaceItem[]>(items);
   const [showSourceDropdown, setShowSourceDropdown] = useState(false);
@@ -50,18 +51,26 @@ export function ResultsTable({
 
   const emptyMessage = note || (hasSearched ? "No results found." : "No results yet.");
 
-  // Helper to extract numeric price
-  const getPriceVal = (p: string) => {
+  // Helper to extract numeric price (structured price from the scraper, text for older results)
+  const getPriceVal = (item: MarketplaceItem) => {
+    if (item.price) return Number(item.price.amount);
+    const p = item.price_text;
     if (!p) return Infinity;
     const clean = p.replace(/[^0-9.]/g, '');
     const val = parseFloat(clean);
     return isNaN(val) ? Infinity : val;
   };
 
+  // Items per cross-vendor group, for the "best of N" hint
+  const groupSizes: Record<number, number> = {};
+  localItems.forEach((item) => {
+    if (item.group != null) groupSizes[item.group] = (groupSizes[item.group] || 0) + 1;
+  });
+
   // Sort logic
-  const sortedItems = [...localItems].sort((a, b) => {
-    const pa = getPriceVal(a.price_text);
-    const pb = getPriceVal(b.price_text);
+  const sortedItems = sortAsc === null ? localItems : [...localItems].sort((a, b) => {
+    const pa = getPriceVal(a);
+    const pb = getPriceVal(b);
     return sortAsc ? pa - pb : pb - pa;
   });
 
@@ -133,8 +142,8 @@ export function ResultsTable({
               <tr>
                 <th>Image</th>
                 <th>Title</th>
-                <th onClick={() => setSortAsc(!sortAsc)} className="sortable-header">
-                  Price {sortAsc ? "↑" : "↓"}
+                <th onClick={() => setSortAsc(sortAsc === null ? true : sortAsc ? false : null)} className="sortable-header">
+                  Price {sortAsc === null ? "↕" : sortAsc ? "↑" : "↓"}
                 </th>
                 <th>Availability</th>
                 <th style={{ position: "relative" }}>
@@ -210,6 +219,13 @@ export function ResultsTable({
                     </td>
                     <td className="price-col">
                       {formatPriceDisplay(item.price_text)}
+                      {item.group != null && (
+                        <div className="muted" style={{ fontSize: "0.75rem" }}>
+                          {item.best_in_group
+                            ? `Best of ${groupSizes[item.group]} vendors`
+                            : "Also listed by other vendors"}
+                        </div>
+                      )}
                     </td>
                     <td>
                       <span
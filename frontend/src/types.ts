@@ -1,8 +1,18 @@
 export type MarketplaceName = "robu" | "robocraze" | "thinkrobotics" | "evelta" | "Draft";
 
+export interface ItemPrice {
+  amount: string; // decimal string, e.g. "1299.00"
+  currency: string;
+  mrp?: string | null;
+  tax_inclusive?: boolean | null;
+}
+
 export interface MarketplaceItem {
   title: string;
   price_text: string;
+  price?: ItemPrice | null;
+  group?: number | null; // same product as other items with this group id
+  best_in_group?: boolean;
   availability: string;
   url: string;
   source: MarketplaceName;
@@ -33,4 +43,7 @@ export interface SearchResponse {
   fetched_at: string;
   note: string | null;
   from_cache: boolean;
+  stale?: boolean;
+  matched_query?: string | null;
+  local?: boolean;
 }